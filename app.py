@@ -10,7 +10,7 @@ Author: David Rogers
 Date Created: 26/03/2025
 Python Version: 3.13.2
 Dependencies:   Flask, SQLAlchemy, Flask Login, Flask Migrate, Flask Mail, DateTime,
-                OS, UUID, CSV, IO, Werkzueg, Flask WTF, ReportLab, PANDAS
+                OS, UUID, CSV, IO, Werkzueg, Flask WTF, ReportLab, OpenPyXL, Tabulate
 Usage: 
         - Development: Run with `flask run` or `python app.py`
         - Production: Deploy with a WSGI server like Gunicorn
@@ -22,22 +22,54 @@ Usage:
 ================================================================================
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, abort, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, abort, send_file, stream_with_context
+from flask import g, session as flask_session, has_request_context
+from flask.signals import before_render_template, template_rendered
+from flask.cli import AppGroup
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_migrate import Migrate
 from flask_mail import Mail, Message
 from datetime import datetime, timedelta
 import os
 import uuid
+import secrets
+import click
+import json
+import time
+import base64
+import re
+import hashlib
 import csv
+import shutil
+import io
+import threading
+import queue
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; password hashing is then limited per process only
+    fcntl = None
+from functools import wraps
+from collections import namedtuple, defaultdict
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
 from itsdangerous import URLSafeTimedSerializer
 from flask_wtf import FlaskForm
-from wtforms import FloatField, StringField, DateField, SelectField, SubmitField
+from wtforms import DecimalField, StringField, DateField, SelectField, SubmitField
 from wtforms.validators import DataRequired, NumberRange, Length
-from sqlalchemy.sql import func
+from sqlalchemy import and_, or_, select, insert, update, delete, case, text, literal_column, inspect, event
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import validates, make_transient_to_detached
+from sqlalchemy.sql import func, Select, CompoundSelect
+from tabulate import tabulate
 
 
 app = Flask(__name__)
@@ -48,9 +80,22 @@ app.config['SECRET_KEY'] = os.getenv('BT_SECRET_KEY')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('BT_DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Database connection pool configuration (size and overflow are per process; recycle
+# should be below the server's wait_timeout; pre-ping replaces connections the server closed)
+app.config['DB_POOL_SIZE'] = int(os.getenv('BT_DB_POOL_SIZE', '5'))
+app.config['DB_MAX_OVERFLOW'] = int(os.getenv('BT_DB_MAX_OVERFLOW', '10'))
+app.config['DB_POOL_TIMEOUT'] = float(os.getenv('BT_DB_POOL_TIMEOUT', '30'))
+app.config['DB_POOL_RECYCLE'] = int(os.getenv('BT_DB_POOL_RECYCLE', '1800'))
+app.config['DB_POOL_PRE_PING'] = os.getenv('BT_DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+# Read replica configuration (optional). Report and dashboard reads go to the replica,
+# except for READ_PIN_SECONDS after the user writes, so they always see their own changes.
+app.config['DATABASE_READ_URL'] = os.getenv('BT_DATABASE_READ_URL')
+app.config['READ_PIN_SECONDS'] = int(os.getenv('BT_READ_PIN_SECONDS', '5'))
+
 # Email configuration
-app.config['MAIL_SERVER'] = 'mx3594.syd1.mymailhosting.com'
-app.config['MAIL_PORT'] = 587
+app.config['MAIL_SERVER'] = os.getenv('BT_MAIL_SERVER', 'mx3594.syd1.mymailhosting.com')
+app.config['MAIL_PORT'] = int(os.getenv('BT_MAIL_PORT', '587'))
 app.config['MAIL_USE_TLS'] = False
 app.config['MAIL_USE_SSL'] = False
 app.config['MAIL_USERNAME'] = os.getenv('BT_EMAIL_USER')
@@ -60,6 +105,84 @@ app.config['MAIL_ASCII_ATTACHMENTS'] = False
 app.config['MAIL_DEFAULT_SENDER'] = ('Budget Tracker', app.config['MAIL_USERNAME'])
 app.config['MAIL_DEBUG'] = False
 
+# Mail outbox configuration (emails are queued in mail_outbox and sent by a background sender)
+app.config['MAIL_BATCH_SIZE'] = int(os.getenv('BT_MAIL_BATCH_SIZE', '50'))
+app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('BT_MAIL_MAX_ATTEMPTS', '6'))
+app.config['MAIL_RETRY_SECONDS'] = int(os.getenv('BT_MAIL_RETRY_SECONDS', '30'))
+app.config['MAIL_SEND_TIMEOUT_SECONDS'] = int(os.getenv('BT_MAIL_SEND_TIMEOUT_SECONDS', '300'))
+app.config['MAIL_RETENTION_DAYS'] = int(os.getenv('BT_MAIL_RETENTION_DAYS', '7'))
+
+# Statement PDF cache configuration
+app.config['STATEMENT_CACHE_DIR'] = os.getenv('BT_STATEMENT_CACHE_DIR', os.path.join(app.instance_path, 'statement_cache'))
+app.config['STATEMENT_CACHE_SECONDS'] = int(os.getenv('BT_STATEMENT_CACHE_SECONDS', '86400'))
+
+# Background export job configuration
+app.config['EXPORT_DIR'] = os.getenv('BT_EXPORT_DIR', os.path.join(app.instance_path, 'exports'))
+app.config['EXPORT_WORKERS'] = int(os.getenv('BT_EXPORT_WORKERS', '2'))
+app.config['EXPORT_TTL_SECONDS'] = int(os.getenv('BT_EXPORT_TTL_SECONDS', '3600'))
+app.config['EXPORT_JOB_TIMEOUT_SECONDS'] = int(os.getenv('BT_EXPORT_JOB_TIMEOUT_SECONDS', '900'))
+
+# Pagination configuration
+app.config['SHOW_PAGE_COUNTS'] = os.getenv('BT_SHOW_PAGE_COUNTS', 'true').lower() == 'true'
+app.config['PAGE_COUNT_CACHE_SECONDS'] = int(os.getenv('BT_PAGE_COUNT_CACHE_SECONDS', '60'))
+
+# Search configuration ('auto' picks FULLTEXT on MySQL and FTS5 on SQLite, 'like' disables both)
+app.config['SEARCH_BACKEND'] = os.getenv('BT_SEARCH_BACKEND', 'auto')
+app.config['FULLTEXT_MIN_TOKEN_SIZE'] = int(os.getenv('BT_FULLTEXT_MIN_TOKEN_SIZE', '3'))
+
+# Category cache configuration (how long a worker trusts its cached categories before
+# checking the shared version row)
+app.config['CATEGORY_CACHE_SECONDS'] = int(os.getenv('BT_CATEGORY_CACHE_SECONDS', '5'))
+
+# User cache configuration (how long a worker reuses a signed-in user's row; 0 disables it)
+app.config['USER_CACHE_SECONDS'] = int(os.getenv('BT_USER_CACHE_SECONDS', '30'))
+
+# Password hashing configuration. Hashes run on a small pool per process; when every
+# worker is busy and HASH_QUEUE_LIMIT hashes are waiting, further logins are turned away.
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('BT_PASSWORD_HASH_METHOD', 'scrypt')
+app.config['HASH_WORKERS'] = int(os.getenv('BT_HASH_WORKERS', '2'))
+app.config['HASH_QUEUE_LIMIT'] = int(os.getenv('BT_HASH_QUEUE_LIMIT', '8'))
+app.config['HASH_TIMEOUT_SECONDS'] = float(os.getenv('BT_HASH_TIMEOUT_SECONDS', '10'))
+# Host-wide limit shared by every worker process through lock files in HASH_SLOT_DIR, so
+# sync workers cannot all be tied up hashing at once (0 disables it)
+app.config['HASH_SLOTS'] = int(os.getenv('BT_HASH_SLOTS', '4'))
+app.config['HASH_SLOT_DIR'] = os.getenv('BT_HASH_SLOT_DIR', os.path.join(app.instance_path, 'hash_slots'))
+
+# Login throttling configuration (attempts counted per process over a sliding window)
+app.config['LOGIN_THROTTLE_SECONDS'] = int(os.getenv('BT_LOGIN_THROTTLE_SECONDS', '300'))
+app.config['LOGIN_MAX_ATTEMPTS_PER_IP'] = int(os.getenv('BT_LOGIN_MAX_ATTEMPTS_PER_IP', '20'))
+app.config['LOGIN_MAX_FAILURES_PER_USER'] = int(os.getenv('BT_LOGIN_MAX_FAILURES_PER_USER', '5'))
+
+# Request metrics configuration (per-endpoint latency, SQL and template timings served at
+# /metrics; requests slower than SLOW_REQUEST_MS are logged with their statements)
+app.config['METRICS_ENABLED'] = os.getenv('BT_METRICS_ENABLED', 'true').lower() == 'true'
+app.config['SLOW_REQUEST_MS'] = int(os.getenv('BT_SLOW_REQUEST_MS', '1000'))
+
+# Slow query profiler configuration (off by default). SELECTs slower than SLOW_QUERY_MS are
+# explained and recorded in slow_queries; see `flask perf slow-queries`.
+app.config['SLOW_QUERY_MS'] = int(os.getenv('BT_SLOW_QUERY_MS', '0'))
+
+# Reverse proxy configuration: the number of proxies in front of the app whose
+# X-Forwarded-For and X-Forwarded-Proto headers are trusted for the client's address
+app.config['PROXY_COUNT'] = int(os.getenv('BT_PROXY_COUNT', '0'))
+if app.config['PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_COUNT'], x_proto=app.config['PROXY_COUNT'])
+
+# Internal stats endpoints are served to requests bearing this token. Requests from
+# localhost are also trusted only if INTERNAL_ALLOW_LOCALHOST is set and no proxy is
+# configured; behind a same-host proxy every request would appear to come from localhost.
+app.config['INTERNAL_TOKEN'] = os.getenv('BT_INTERNAL_TOKEN')
+app.config['INTERNAL_ALLOW_LOCALHOST'] = os.getenv('BT_INTERNAL_ALLOW_LOCALHOST', 'false').lower() == 'true'
+
+# Transaction import configuration (rows inserted and committed per batch)
+app.config['IMPORT_BATCH_SIZE'] = int(os.getenv('BT_IMPORT_BATCH_SIZE', '5000'))
+
+# Most operations accepted by one /api/v1/transactions:batch request
+app.config['API_BATCH_MAX_OPERATIONS'] = int(os.getenv('BT_API_BATCH_MAX_OPERATIONS', '1000'))
+
+# Report trend configuration (the most points sent to a trend chart)
+app.config['TREND_MAX_POINTS'] = int(os.getenv('BT_TREND_MAX_POINTS', '180'))
+
 # Get server URL from environment variable
 SERVER_URL = os.getenv('BT_SERVER_URL', '/')
 
@@ -67,8 +190,512 @@ SERVER_URL = os.getenv('BT_SERVER_URL', '/')
 def inject_server_url():
     return dict(server_url=SERVER_URL)
 
+# Database Connection Pool
+class PoolMonitor:
+    """
+    PoolMonitor - Collects one engine's connection pool statistics in this process from
+    SQLAlchemy pool events and from InstrumentedQueuePool's timing of each checkout.
+
+    Attributes:
+        latency_buckets (tuple): Upper bounds, in milliseconds, of the checkout latency histogram.
+        connects (int): New database connections opened.
+        checkouts (int): Connections handed out by the pool.
+        checkins (int): Connections returned to the pool.
+        invalidations (int): Connections discarded as broken or stale.
+        timeouts (int): Checkouts that gave up after DB_POOL_TIMEOUT.
+        peak_in_use (int): Most connections checked out at once.
+        peak_overflow (int): Most overflow connections open at once.
+    """
+    latency_buckets = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency_counts = [0] * (len(self.latency_buckets) + 1)
+        self.latency_sum = 0.0
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, pool, seconds):
+        """
+        Function Name:  record_checkout
+        Description:    Records how long a checkout waited and the pool's usage after it
+        Args:           pool (QueuePool): The pool the connection came from
+                        seconds (float): Time taken to check the connection out
+        Returns:        None
+        Raises:         None
+        """
+        milliseconds = seconds * 1000
+        bucket = next((i for i, bound in enumerate(self.latency_buckets) if milliseconds <= bound),
+                      len(self.latency_buckets))
+        with self._lock:
+            self.latency_counts[bucket] += 1
+            self.latency_sum += milliseconds
+            self.peak_in_use = max(self.peak_in_use, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def count(self, counter):
+        """
+        Function Name:  count
+        Description:    Increments one of the event counters
+        Args:           counter (str): Name of the counter attribute
+        Returns:        None
+        Raises:         None
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self, pool):
+        """
+        Function Name:  stats
+        Description:    Reports the pool's current state, the event counters and the
+                        cumulative checkout latency histogram
+        Args:           pool (sqlalchemy.pool.Pool): The engine's pool
+        Returns:        dict: The pool statistics
+        Raises:         None
+        """
+        with self._lock:
+            cumulative, histogram = 0, []
+            for bound, count in zip(self.latency_buckets + (None,), self.latency_counts):
+                cumulative += count
+                histogram.append({'leMs': bound, 'count': cumulative})
+            queue_pool = isinstance(pool, QueuePool)
+            return {
+                'pool': type(pool).__name__,
+                'size': pool.size() if queue_pool else None,
+                'inUse': pool.checkedout() if queue_pool else None,
+                'idle': pool.checkedin() if queue_pool else None,
+                'overflow': max(pool.overflow(), 0) if queue_pool else None,
+                'peakInUse': self.peak_in_use,
+                'peakOverflow': self.peak_overflow,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'checkoutLatencyMs': {
+                    'count': cumulative,
+                    'sum': round(self.latency_sum, 3),
+                    'buckets': histogram
+                }
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    InstrumentedQueuePool - A QueuePool that times each checkout, including any wait for a
+    free connection and the pre-ping, for the checkout latency histogram. Each engine's
+    pool has its own PoolMonitor, so the primary and the replica are reported apart.
+
+    Attributes:
+        monitor (PoolMonitor): The statistics of this pool, kept when the pool is recreated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.monitor = PoolMonitor()
+        # A recreated pool inherits its predecessor's listeners (and monitor, in recreate)
+        if kwargs.get('_dispatch') is None:
+            watch_pool(self, self.monitor)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.monitor.count('timeouts')
+            raise
+        self.monitor.record_checkout(self, time.perf_counter() - started)
+        return connection
+
+
+def watch_pool(pool, monitor):
+    """
+    Function Name:  watch_pool
+    Description:    Counts a pool's connects, checkouts, checkins and invalidations in its monitor
+    Args:           pool (sqlalchemy.pool.Pool): The pool to watch
+                    monitor (PoolMonitor): Where the pool's events are counted
+    Returns:        None
+    Raises:         None
+    """
+    for event_name, counter in (('connect', 'connects'), ('checkout', 'checkouts'),
+                                ('checkin', 'checkins'), ('invalidate', 'invalidations')):
+        event.listen(pool, event_name, lambda *args, counter=counter: monitor.count(counter))
+
+
+def database_engine_options(uri):
+    """
+    Function Name:  database_engine_options
+    Description:    Builds the engine options for the configured database: pre-ping and
+                    recycle for every server database, plus the instrumented, sized
+                    connection pool (in-memory SQLite keeps its single shared connection)
+    Args:           uri (str): The database URL
+    Returns:        dict: Options for SQLALCHEMY_ENGINE_OPTIONS
+    Raises:         None
+    """
+    options = {
+        'pool_pre_ping': app.config['DB_POOL_PRE_PING'],
+        'pool_recycle': app.config['DB_POOL_RECYCLE'],
+    }
+    url = make_url(uri) if uri else None
+    if url is not None and url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=app.config['DB_POOL_SIZE'],
+        max_overflow=app.config['DB_MAX_OVERFLOW'],
+        pool_timeout=app.config['DB_POOL_TIMEOUT'],
+    )
+    return options
+
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+if app.config['DATABASE_READ_URL']:
+    app.config['SQLALCHEMY_BINDS'] = {'replica': {
+        'url': app.config['DATABASE_READ_URL'],
+        **database_engine_options(app.config['DATABASE_READ_URL'])
+    }}
+
+
+# Read Replica Routing
+class RoutingSession(FlaskSQLAlchemySession):
+    """
+    RoutingSession - The app's session. SELECTs run on the read replica while
+    reads_from_replica() allows it; flushes, locking reads and every other statement,
+    including text() statements, always run on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and is_replica_read(clause) and reads_from_replica():
+            return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def is_replica_read(clause):
+    """
+    Function Name:  is_replica_read
+    Description:    Checks that a statement is a plain read the replica can serve: an ORM
+                    or Core SELECT without FOR UPDATE. Anything else, such as a text()
+                    statement that may write, goes to the primary.
+    Args:           clause (sqlalchemy.sql.ClauseElement): The statement, or None
+    Returns:        bool: True if the statement may run on the replica
+    Raises:         None
+    """
+    return isinstance(clause, (Select, CompoundSelect)) and clause._for_update_arg is None
+
+
+def reads_from_replica():
+    """
+    Function Name:  reads_from_replica
+    Description:    Decides whether the current statement may read from the replica: a
+                    replica must be configured, the view must be marked with read_replica,
+                    and the user must not have written within READ_PIN_SECONDS
+    Args:           None
+    Returns:        bool: True to read from the replica
+    Raises:         None
+    """
+    return (
+        'replica' in app.config.get('SQLALCHEMY_BINDS', {})
+        and has_request_context()
+        and g.get('read_replica', False)
+        and flask_session.get('primaryUntil', 0) < time.time()
+    )
+
+
+def read_replica(view):
+    """
+    Function Name:  read_replica
+    Description:    Marks a read-only view whose queries may be served by the read replica
+    Args:           view (callable): The view function
+    Returns:        callable: The wrapped view
+    Raises:         None
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        g.read_replica = True
+        return view(*args, **kwargs)
+    return wrapped
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _note_flush(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _note_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_to_primary(session):
+    # The user's next reads stay on the primary until the replica has caught up
+    if session.info.pop('wrote', False) and has_request_context() and 'replica' in app.config.get('SQLALCHEMY_BINDS', {}):
+        flask_session['primaryUntil'] = time.time() + app.config['READ_PIN_SECONDS']
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_writes(session):
+    session.info.pop('wrote', None)
+
+
+# Request Metrics
+class RequestTrace:
+    """
+    RequestTrace - The timings gathered for one request by the request and SQLAlchemy
+    cursor hooks, kept on flask.g until the request is torn down.
+
+    Attributes:
+        started (float): perf_counter() when the request began.
+        statement_count (int): SQL statements executed.
+        sql_seconds (float): Time spent executing them.
+        statements (list): (seconds, statement) of the first MAX_STATEMENTS statements,
+                           for the slow request log.
+        render_seconds (float): Time spent rendering templates.
+        render_started (float): perf_counter() when the current template began rendering.
+        status (int): The response status code, once known.
+    """
+    __slots__ = ('started', 'statement_count', 'sql_seconds', 'statements',
+                 'render_seconds', 'render_started', 'status')
+
+    # Statements kept per request for the slow request log; later ones are only counted
+    MAX_STATEMENTS = 200
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statement_count = 0
+        self.sql_seconds = 0.0
+        self.statements = []
+        self.render_seconds = 0.0
+        self.render_started = None
+        self.status = 500
+
+
+class RequestMetrics:
+    """
+    RequestMetrics - Aggregates this process's request traces per endpoint and renders
+    them in the Prometheus text exposition format.
+
+    Attributes:
+        latency_buckets (tuple): Upper bounds, in seconds, of the request latency histogram.
+        statement_buckets (tuple): Upper bounds of the SQL statements per request histogram.
+        methods (frozenset): HTTP methods labelled as themselves; any other is labelled 'other'.
+    """
+    methods = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+    latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    statement_buckets = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._responses = defaultdict(int)
+
+    def record(self, endpoint, method, trace, seconds):
+        """
+        Function Name:  record
+        Description:    Adds a finished request to its endpoint's histograms and counters
+        Args:           endpoint (str): The Flask endpoint that handled the request
+                        method (str): The HTTP method, as sent by the client
+                        trace (RequestTrace): The request's timings
+                        seconds (float): Total time taken by the request
+        Returns:        None
+        Raises:         None
+        """
+        if method not in self.methods:
+            method = 'other'  # client-chosen methods must not grow the label set
+        latency_bucket = next((i for i, bound in enumerate(self.latency_buckets) if seconds <= bound),
+                              len(self.latency_buckets))
+        statement_bucket = next((i for i, bound in enumerate(self.statement_buckets)
+                                 if trace.statement_count <= bound), len(self.statement_buckets))
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'latencyCounts': [0] * (len(self.latency_buckets) + 1),
+                    'latencySum': 0.0,
+                    'statementCounts': [0] * (len(self.statement_buckets) + 1),
+                    'statementSum': 0,
+                    'sqlSeconds': 0.0,
+                    'renderSeconds': 0.0
+                }
+            stats['latencyCounts'][latency_bucket] += 1
+            stats['latencySum'] += seconds
+            stats['statementCounts'][statement_bucket] += 1
+            stats['statementSum'] += trace.statement_count
+            stats['sqlSeconds'] += trace.sql_seconds
+            stats['renderSeconds'] += trace.render_seconds
+            self._responses[(endpoint, method, trace.status)] += 1
+
+    def prometheus(self):
+        """
+        Function Name:  prometheus
+        Description:    Renders the collected metrics in the Prometheus text format
+        Args:           None
+        Returns:        str: The exposition text
+        Raises:         None
+        """
+        with self._lock:
+            endpoints = {name: {key: list(value) if isinstance(value, list) else value
+                                for key, value in stats.items()}
+                         for name, stats in self._endpoints.items()}
+            responses = dict(self._responses)
+
+        lines = [
+            '# HELP budgettracker_requests_total Requests handled, by endpoint, method and status.',
+            '# TYPE budgettracker_requests_total counter',
+        ]
+        for (endpoint, method, status), count in sorted(responses.items()):
+            lines.append(f'budgettracker_requests_total{{endpoint="{prometheus_label(endpoint)}",'
+                         f'method="{method}",status="{status}"}} {count}')
+
+        lines += self._histogram(
+            'budgettracker_request_duration_seconds', 'Request latency by endpoint.',
+            endpoints, self.latency_buckets, 'latencyCounts', 'latencySum'
+        )
+        lines += self._histogram(
+            'budgettracker_request_sql_statements', 'SQL statements executed per request by endpoint.',
+            endpoints, self.statement_buckets, 'statementCounts', 'statementSum'
+        )
+
+        for name, key, description in (
+            ('budgettracker_request_sql_seconds_total', 'sqlSeconds', 'Time spent executing SQL by endpoint.'),
+            ('budgettracker_request_render_seconds_total', 'renderSeconds', 'Time spent rendering templates by endpoint.'),
+        ):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, stats in sorted(endpoints.items()):
+                lines.append(f'{name}{{endpoint="{prometheus_label(endpoint)}"}} {stats[key]:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(name, description, endpoints, buckets, counts_key, sum_key):
+        lines = [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+        for endpoint, stats in sorted(endpoints.items()):
+            label = f'endpoint="{prometheus_label(endpoint)}"'
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), stats[counts_key]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}}} {stats[sum_key]}')
+            lines.append(f'{name}_count{{{label}}} {cumulative}')
+        return lines
+
+
+def prometheus_label(value):
+    """
+    Function Name:  prometheus_label
+    Description:    Escapes a Prometheus label value
+    Args:           value (str): The raw value
+    Returns:        str: The value with backslashes, quotes and newlines escaped
+    Raises:         None
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+request_metrics = RequestMetrics()
+
+
+def current_trace():
+    """
+    Function Name:  current_trace
+    Description:    Returns the trace of the request being handled, if metrics are on
+    Args:           None
+    Returns:        RequestTrace: The request's trace, or None outside a traced request
+    Raises:         None
+    """
+    if not has_request_context():
+        return None
+    return g.get('request_trace')
+
+
+@app.before_request
+def _start_request_trace():
+    if app.config['METRICS_ENABLED']:
+        g.request_trace = RequestTrace()
+
+
+@app.after_request
+def _note_response_status(response):
+    trace = current_trace()
+    if trace is not None:
+        trace.status = response.status_code
+    return response
+
+
+@app.teardown_request
+def _finish_request_trace(exception):
+    trace = current_trace()
+    if trace is None:
+        return
+    g.request_trace = None
+    seconds = time.perf_counter() - trace.started
+    endpoint = request.endpoint or 'unmatched'
+    request_metrics.record(endpoint, request.method, trace, seconds)
+
+    if seconds * 1000 >= app.config['SLOW_REQUEST_MS']:
+        statements = '\n'.join(f'  {elapsed * 1000:8.1f} ms  {" ".join(statement.split())}'
+                               for elapsed, statement in trace.statements)
+        if trace.statement_count > len(trace.statements):
+            statements += f'\n  ... {trace.statement_count - len(trace.statements)} more statements'
+        app.logger.warning(
+            f'Slow request: {request.method} {request.path} ({endpoint}) took {seconds * 1000:.0f} ms, '
+            f'{trace.statement_count} statements in {trace.sql_seconds * 1000:.0f} ms, '
+            f'templates {trace.render_seconds * 1000:.0f} ms\n{statements}'
+        )
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _time_statement(conn, cursor, statement, parameters, context, executemany):
+    if app.config['SLOW_QUERY_MS'] or current_trace() is not None:
+        # Kept on the execution context, not conn.info: a statement that raises never reaches
+        # after_cursor_execute, and conn.info outlives it on the pooled connection.
+        context._bt_statement_started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_bt_statement_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    trace = current_trace()
+    if trace is not None:
+        trace.statement_count += 1
+        trace.sql_seconds += elapsed
+        if len(trace.statements) < RequestTrace.MAX_STATEMENTS:
+            trace.statements.append((elapsed, statement))
+    if app.config['SLOW_QUERY_MS'] and elapsed * 1000 >= app.config['SLOW_QUERY_MS'] and not executemany:
+        profile_slow_query(conn, statement, parameters, elapsed)
+
+
+@before_render_template.connect_via(app)
+def _time_template(sender, template, context, **extra):
+    trace = current_trace()
+    if trace is not None and trace.render_started is None:
+        trace.render_started = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def _record_template(sender, template, context, **extra):
+    trace = current_trace()
+    if trace is not None and trace.render_started is not None:
+        trace.render_seconds += time.perf_counter() - trace.render_started
+        trace.render_started = None
+
+
 # Initialize extensions
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 migrate = Migrate(app, db)
 mail = Mail(app)
 login_manager = LoginManager()
@@ -105,6 +732,49 @@ def verify_reset_token(token, expiration=3600):
         return None
 
 
+# Money
+CENT = Decimal('0.01')
+
+
+def to_money(value):
+    """
+    Function Name:  to_money
+    Description:    Converts an amount entered in a form, file or API request to an exact
+                    amount of money, rounded half up to the cent
+    Args:           value (str, int, float or Decimal): The amount, e.g. '12.5' or 12.5
+    Returns:        Decimal: The amount with two decimal places
+    Raises:         ValueError: If the value is not a finite number
+    """
+    try:
+        amount = Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"'{value}' is not an amount of money.")
+    if not amount.is_finite():
+        raise ValueError(f"'{value}' is not an amount of money.")
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class Money(db.TypeDecorator):
+    """
+    Money - A column type that stores an amount of money as a whole number of cents and
+    returns it as a Decimal. SUM() over the column is an exact integer sum in the database,
+    and its result converts back through the same type.
+    """
+    impl = db.BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(to_money(value) * 100)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # AVG() over the column can return fractional cents
+        return (Decimal(str(value)) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
 # Models
 class User(UserMixin, db.Model):
     """
@@ -115,27 +785,27 @@ class User(UserMixin, db.Model):
         userPwd (str): Hashed and Salted user app password
         fname (str): First name of the user.
         lname (str): Last name of the user
-        userBudget (float): Current user budget amount.
+        userBudget (Decimal): Current user budget amount.
         email (str): Email address of the user.
-        monthlyIncome (float): Current user monthly income. 
+        monthlyIncome (Decimal): Current user monthly income. 
     """
     __tablename__ = 'users'
     userID = db.Column(db.String(20), primary_key=True)
     userPwd = db.Column(db.String(256), nullable=False)  # Increased length for hash
     fName = db.Column(db.String(15), nullable=False)
     lName = db.Column(db.String(15), nullable=False)
-    userBudget = db.Column(db.Float, nullable=False)
+    userBudget = db.Column(Money, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)  # Add email field
-    monthlyIncome = db.Column(db.Float, nullable=False, default=0.0)  # Add monthly income field
+    monthlyIncome = db.Column(Money, nullable=False, default=0)  # Add monthly income field
 
     def get_id(self):
         return str(self.userID)
 
     def set_password(self, password):
-        self.userPwd = generate_password_hash(password)
+        self.userPwd = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.userPwd, password)
+        return password_hasher.verify(self.userPwd, password)
 
 
 class Category(db.Model):
@@ -159,26 +829,91 @@ class Transaction(db.Model):
     
     Attributes:
         tranID (str): Unique identifier for the transaction.
+        userID (str): Foreign key to the user who owns this transaction.
         tranDate (date): Date when the transaction occurred.
-        tranTime (str): Time when the transaction occurred.
+        tranTime (str): Time when the transaction occurred (HH:MM).
+        tranMinute (int): tranTime as minutes since midnight (0-1439), kept in step by a validator.
         catID (str): Foreign key to the category this transaction belongs to.
         tranDescription (str): Description of the transaction.
-        tranAmount (float): Amount of the transaction.
+        tranAmount (Decimal): Amount of the transaction.
         isExpense (bool): Flag indicating whether this is an expense (True) or income (False).
     """
     __tablename__ = 'transactions'
     tranID = db.Column(db.String(20), primary_key=True)
+    userID = db.Column(db.String(20), db.ForeignKey('users.userID'), nullable=False)
     tranDate = db.Column(db.Date, nullable=False)
     tranTime = db.Column(db.String(5), nullable=False)
+    tranMinute = db.Column(db.SmallInteger, nullable=False)
     catID = db.Column(db.String(20), db.ForeignKey('categories.catID'), nullable=False)
     tranDescription = db.Column(db.String(50), nullable=False)
-    tranAmount = db.Column(db.Float, nullable=False)
+    tranAmount = db.Column(Money, nullable=False)
     isExpense = db.Column(db.Boolean, nullable=False, default=True)  # Add flag to distinguish between expense and revenue
 
+    __table_args__ = (
+        db.Index('ix_transactions_userID_tranDate', 'userID', 'tranDate', 'tranTime'),
+        db.Index('ix_transactions_tranDate_tranTime', 'tranDate', 'tranTime'),
+        db.Index('ix_transactions_catID_tranDate', 'catID', 'tranDate'),
+        db.Index('ix_transactions_userID_catID_tranDate', 'userID', 'catID', 'tranDate'),
+        db.Index('ix_transactions_userID_tranMinute_tranDate', 'userID', 'tranMinute', 'tranDate'),
+        db.CheckConstraint('tranMinute BETWEEN 0 AND 1439', name='ck_transactions_tranMinute'),
+    )
+
+    @validates('tranTime')
+    def validate_tran_time(self, key, value):
+        """
+        Function Name:  validate_tran_time
+        Description:    Validates a transaction time, zero-pads it and sets tranMinute to match it
+        Args:           key (str): The attribute being set
+                        value (str): The time in HH:MM format
+        Returns:        str: The validated time
+        Raises:         ValueError: If the time is not a valid HH:MM time
+        """
+        value = normalize_time(value)
+        self.tranMinute = minute_of_day(value)
+        return value
+
+    @validates('tranAmount')
+    def validate_tran_amount(self, key, value):
+        """
+        Function Name:  validate_tran_amount
+        Description:    Converts a transaction amount to exact money
+        Args:           key (str): The attribute being set
+                        value (str, int, float or Decimal): The amount
+        Returns:        Decimal: The amount rounded to the cent
+        Raises:         ValueError: If the amount is not a number
+        """
+        return to_money(value)
+
+
+def minute_of_day(value):
+    """
+    Function Name:  minute_of_day
+    Description:    Converts an HH:MM time to minutes since midnight
+    Args:           value (str): The time in HH:MM format
+    Returns:        int: Minutes since midnight (0-1439)
+    Raises:         ValueError: If the time is not a valid HH:MM time
+    """
+    parsed = datetime.strptime(value or '', '%H:%M')
+    return parsed.hour * 60 + parsed.minute
+
+
+def normalize_time(value):
+    """
+    Function Name:  normalize_time
+    Description:    Zero-pads an HH:MM time (e.g. '9:5' to '09:05'), so stored times sort
+                    correctly as strings in the list ordering and keyset pagination
+    Args:           value (str): The time in H:M or HH:MM format
+    Returns:        str: The time in HH:MM format
+    Raises:         ValueError: If the time is not a valid HH:MM time
+    """
+    return datetime.strptime(value or '', '%H:%M').strftime('%H:%M')
+
 
 class UserTransaction(db.Model):
     """
     UserTransaction - A model representing the association between users and transactions.
+    Ownership is stored on Transaction.userID; this table is kept for sharing
+    transactions with other users and is not used on the read paths.
     
     Attributes:
         userID (str): Foreign key to the user who owns this transaction.
@@ -196,7 +931,7 @@ class Revenue(db.Model):
     Attributes:
         revID (str): Unique identifier for the revenue entry.
         userID (str): Foreign key to the user who owns this revenue.
-        revAmount (float): Amount of the revenue.
+        revAmount (Decimal): Amount of the revenue.
         revDescription (str): Description of the revenue source.
         revDate (date): Date when the revenue was received.
         revType (enum): Type of revenue (Salary, Freelance, Investments, etc.).
@@ -205,1036 +940,3983 @@ class Revenue(db.Model):
     __tablename__ = 'revenues'
     revID = db.Column(db.String(20), primary_key=True)
     userID = db.Column(db.String(20), db.ForeignKey('users.userID'), nullable=False)
-    revAmount = db.Column(db.Float, nullable=False)
+    revAmount = db.Column(Money, nullable=False)
     revDescription = db.Column(db.String(50), nullable=False)
     revDate = db.Column(db.Date, nullable=False)
     revType = db.Column(db.Enum('Salary', 'Freelance', 'Investments', 'Rent', 'Other', 'Bank Interest'), nullable=False)
     user = db.relationship('User', backref=db.backref('revenues', lazy=True))
 
+    __table_args__ = (
+        db.Index('ix_revenues_userID_revDate', 'userID', 'revDate'),
+    )
 
-@login_manager.user_loader
-def load_user(user_id):
+    @validates('revAmount')
+    def validate_rev_amount(self, key, value):
+        """
+        Function Name:  validate_rev_amount
+        Description:    Converts a revenue amount to exact money
+        Args:           key (str): The attribute being set
+                        value (str, int, float or Decimal): The amount
+        Returns:        Decimal: The amount rounded to the cent
+        Raises:         ValueError: If the amount is not a number
+        """
+        return to_money(value)
+
+
+class UserMonthlyTotal(db.Model):
     """
-    Function Name:  load_user
-    Description:    Loads a user from the database based on user ID for Flask-Login
-    Args:           user_id (str): The current user's unique identifier
-    Returns:        User: The User object if found, None otherwise
-    Raises:         None
+    UserMonthlyTotal - A rollup of a user's expense and revenue totals for one calendar month.
+
+    Attributes:
+        userID (str): Foreign key to the user the totals belong to.
+        monthStart (date): First day of the month the totals cover.
+        expenseTotal (Decimal): Sum of the user's transaction amounts in the month.
+        expenseCount (int): Number of the user's transactions in the month.
+        revenueTotal (Decimal): Sum of the user's revenue amounts in the month.
+        revenueCount (int): Number of the user's revenue entries in the month.
+        revision (int): Bumped on every change to the month, used to version cached exports.
     """
-    return db.session.get(User, user_id)
+    __tablename__ = 'user_monthly_totals'
+    userID = db.Column(db.String(20), db.ForeignKey('users.userID'), primary_key=True)
+    monthStart = db.Column(db.Date, primary_key=True)
+    expenseTotal = db.Column(Money, nullable=False, default=0)
+    expenseCount = db.Column(db.Integer, nullable=False, default=0)
+    revenueTotal = db.Column(Money, nullable=False, default=0)
+    revenueCount = db.Column(db.Integer, nullable=False, default=0)
+    revision = db.Column(db.Integer, nullable=False, default=0)
 
 
-# Routes
-@app.route('/')
-def index():
+class UserMonthlyCategoryTotal(db.Model):
     """
-    Function Name:  index
-    Description:    Renders the home page or redirects authenticated users to dashboard
-    Args:           None
-    Returns:        flask.Response: Rendered template or redirect response
-    Raises:         None
+    UserMonthlyCategoryTotal - A rollup of a user's totals per category for one calendar month.
+
+    Attributes:
+        userID (str): Foreign key to the user the totals belong to.
+        monthStart (date): First day of the month the totals cover.
+        entryType (str): 'expense' for transactions or 'revenue' for revenue entries.
+        categoryKey (str): Category ID for expenses, revenue type for revenues.
+        total (Decimal): Sum of the amounts in the category for the month.
+        entryCount (int): Number of entries in the category for the month.
     """
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    return render_template('index.html')
+    __tablename__ = 'user_monthly_category_totals'
+    userID = db.Column(db.String(20), db.ForeignKey('users.userID'), primary_key=True)
+    monthStart = db.Column(db.Date, primary_key=True)
+    entryType = db.Column(db.String(10), primary_key=True)
+    categoryKey = db.Column(db.String(20), primary_key=True)
+    total = db.Column(Money, nullable=False, default=0)
+    entryCount = db.Column(db.Integer, nullable=False, default=0)
 
 
-@app.route('/login', methods=['GET', 'POST'])
-def login():
+class CategoryStat(db.Model):
     """
-    Function Name:  login
-    Description:    Handles user authentication and login
-    Args:           None (data received via request form)
-    Returns:        flask.Response: Rendered login template or redirect to dashboard
-    Raises:         None
+    CategoryStat - One user's usage counters for one expense category, kept up to date on
+    every transaction write so usage never needs a scan of transactions. Each user has
+    their own row, so writes only lock that user's counters.
+
+    Attributes:
+        userID (str): Foreign key to the user the counters belong to.
+        catID (str): Foreign key to the category the counters belong to.
+        tranCount (int): Number of the user's transactions in the category.
+        tranTotal (Decimal): Sum of those transactions' amounts.
+        lastUsed (date): Date of the user's most recent transaction in the category, None when unused.
     """
-    if request.method == 'POST':
-        user_id = request.form.get('user_id')
-        password = request.form.get('password')
-        user = db.session.get(User, user_id)
-        
-        if user and user.check_password(password):
-            login_user(user)
-            return redirect(url_for('dashboard'))
-        flash('Invalid user ID or password')
-    return render_template('login.html')
+    __tablename__ = 'category_stats'
+    userID = db.Column(db.String(20), db.ForeignKey('users.userID'), primary_key=True)
+    catID = db.Column(db.String(20), db.ForeignKey('categories.catID'), primary_key=True)
+    tranCount = db.Column(db.Integer, nullable=False, default=0)
+    tranTotal = db.Column(Money, nullable=False, default=0)
+    lastUsed = db.Column(db.Date)
+    category = db.relationship('Category', backref=db.backref('stats', cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.Index('ix_category_stats_catID_tranCount', 'catID', 'tranCount'),
+    )
 
 
-@app.route('/reset_password', methods=['GET', 'POST'])
-def reset_request():
+class ExportJob(db.Model):
     """
-    Function Name:  reset_request
-    Description:    Handles password reset requests and sends reset emails
-    Args:           None (data received via request form)
-    Returns:        flask.Response: Rendered template or redirect response
-    Raises:         None
+    ExportJob - A report export queued for the background export workers. The table is
+    the job queue: workers claim queued jobs with a conditional update, so no broker is needed.
+
+    Attributes:
+        jobID (str): Unique identifier for the job.
+        userID (str): Foreign key to the user who requested the export.
+        format (str): Export format ('csv', 'excel' or 'pdf').
+        params (str): JSON encoded export filters (date_from, date_to, category).
+        status (str): 'queued', 'running', 'done' or 'failed'.
+        progress (int): Percentage of the rows written so far.
+        fileName (str): Name of the finished file in the export directory.
+        error (str): Failure message if the job failed.
+        createdAt (datetime): When the job was queued.
+        startedAt (datetime): When a worker claimed the job.
+        finishedAt (datetime): When the job finished or failed.
+        expiresAt (datetime): When the job and its file are cleaned up.
     """
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    
-    if request.method == 'POST':
-        email = request.form.get('email')
-        user = User.query.filter_by(email=email).first()
-        
-        if user:
-            token = get_reset_token(user.userID)
-            reset_url = url_for('reset_token', token=token, _external=True)
-            
-            # Ensure we have valid email configuration
-            if not app.config['MAIL_USERNAME'] or not app.config['MAIL_PASSWORD']:
-                app.logger.error("Email configuration is missing")
-                flash('Email service is not properly configured. Please contact support.', 'error')
-                return redirect(url_for('login'))
-            
-            msg = Message('Password Reset Request',
-                        sender=("Budget Tracker App", app.config['MAIL_USERNAME']),  # Use email as both name and address
-                        recipients=[user.email])
-            msg.body = f'''To reset your password, visit the following link:
-{reset_url}
+    __tablename__ = 'export_jobs'
+    jobID = db.Column(db.String(32), primary_key=True)
+    userID = db.Column(db.String(20), db.ForeignKey('users.userID'), nullable=False)
+    format = db.Column(db.String(10), nullable=False)
+    params = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    fileName = db.Column(db.String(64))
+    error = db.Column(db.String(255))
+    createdAt = db.Column(db.DateTime, nullable=False)
+    startedAt = db.Column(db.DateTime)
+    finishedAt = db.Column(db.DateTime)
+    expiresAt = db.Column(db.DateTime)
 
-If you did not make this request, please ignore this email.
-'''
-            try:
-                mail.send(msg)
-                flash('An email has been sent with instructions to reset your password.', 'info')
-                return redirect(url_for('login'))
-            except Exception as e:
-                app.logger.error(f"Failed to send email: {str(e)}")
-                flash('Error sending email. Please try again later.', 'error')
-        else:
-            flash('No account found with that email address.', 'error')
-    
-    return render_template('reset_request.html')
+    __table_args__ = (
+        db.Index('ix_export_jobs_status_createdAt', 'status', 'createdAt'),
+        db.Index('ix_export_jobs_userID', 'userID'),
+        db.Index('ix_export_jobs_expiresAt', 'expiresAt'),
+    )
 
 
-@app.route('/reset_password/<token>', methods=['GET', 'POST'])
-def reset_token(token):
+class OutboxEmail(db.Model):
     """
-    Function Name:  reset_token
-    Description:    Handles password reset using a valid token
-    Args:           token (str): The password reset token
-    Returns:        flask.Response: Rendered template or redirect response
-    Raises:         None
+    OutboxEmail - An email waiting in the outbox for the background mail sender, which
+    claims queued emails with a conditional update like the export workers.
+
+    Attributes:
+        mailID (str): Unique identifier for the email.
+        recipients (str): JSON encoded list of recipient addresses.
+        subject (str): Subject line.
+        body (str): Plain text body.
+        status (str): 'queued', 'sending', 'sent' or 'failed'.
+        attempts (int): Number of send attempts made.
+        lastError (str): Error from the latest failed attempt.
+        createdAt (datetime): When the email was queued.
+        nextAttemptAt (datetime): Earliest time the next attempt may be made.
+        sentAt (datetime): When the email was sent.
     """
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    
-    user_id = verify_reset_token(token)
-    if user_id is None:
-        flash('Invalid or expired reset token', 'error')
-        return redirect(url_for('reset_request'))
-    
-    if request.method == 'POST':
-        password = request.form.get('password')
-        confirm_password = request.form.get('confirm_password')
-        
-        if password != confirm_password:
-            flash('Passwords do not match.', 'error')
-            return render_template('reset_token.html')
-        
-        user = User.query.get(user_id)
-        user.set_password(password)
-        
-        try:
-            db.session.commit()
-            flash('Your password has been updated! You can now log in.', 'success')
-            return redirect(url_for('login'))
-        except Exception as e:
-            db.session.rollback()
-            flash('Error updating password. Please try again.', 'error')
-    
-    return render_template('reset_token.html')
+    __tablename__ = 'mail_outbox'
+    mailID = db.Column(db.String(32), primary_key=True)
+    recipients = db.Column(db.Text, nullable=False)
+    subject = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    lastError = db.Column(db.String(255))
+    createdAt = db.Column(db.DateTime, nullable=False)
+    nextAttemptAt = db.Column(db.DateTime, nullable=False)
+    sentAt = db.Column(db.DateTime)
 
+    __table_args__ = (
+        db.Index('ix_mail_outbox_status_nextAttemptAt', 'status', 'nextAttemptAt'),
+    )
 
-@app.route('/register', methods=['GET', 'POST'])
-def register():
+
+class CacheVersion(db.Model):
     """
-    Function Name:  register
-    Description:    Handles new user registration
-    Args:           None (user data received via request form)
-    Returns:        flask.Response: Rendered registration form or redirect after registration
-    Raises:         None
+    CacheVersion - A version counter shared by all app processes for one cached data set.
+    Writes to the data bump the counter so every process can tell its cached copy is stale.
+
+    Attributes:
+        name (str): Name of the cached data set (e.g. 'categories').
+        version (int): Incremented on every change to the data set.
     """
-    if request.method == 'POST':
-        # Get form data
-        user_id = request.form.get('user_id')
-        password = request.form.get('password')
-        first_name = request.form.get('first_name')
-        last_name = request.form.get('last_name')
-        email = request.form.get('email')
-        budget = float(request.form.get('budget'))
+    __tablename__ = 'cache_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
 
-        # Check if user already exists
-        if db.session.get(User, user_id):
-            flash('User ID already exists')
-            return redirect(url_for('register'))
-        
-        # Check if email already exists
-        if User.query.filter_by(email=email).first():
-            flash('Email address already registered')
-            return redirect(url_for('register'))
 
-        # Create new user
-        new_user = User(
-            userID=user_id,
-            fName=first_name,
-            lName=last_name,
-            email=email,
-            userBudget=budget
-        )
-        new_user.set_password(password)  # Hash the password before saving
-        
-        try:
-            db.session.add(new_user)
-            db.session.commit()
-            flash('Registration successful! Please login.')
-            return redirect(url_for('login'))
-        except Exception as e:
-            db.session.rollback()
-            flash('Error during registration. Please try again.')
-            return redirect(url_for('register'))
-    
-    return render_template('register.html')
+class SlowQuery(db.Model):
+    """
+    SlowQuery - A SELECT that took longer than SLOW_QUERY_MS, recorded by the slow query
+    profiler. Executions that differ only in their values share a row, keyed by the
+    fingerprint of the normalized statement.
+
+    Attributes:
+        fingerprint (str): SHA-1 of the normalized statement.
+        statement (str): The statement with its values replaced by '?'.
+        queryPlan (str): JSON encoded EXPLAIN output ('columns' and 'rows', or 'error').
+        dialect (str): Database dialect the plan was captured on.
+        callCount (int): Slow executions recorded.
+        totalMs (float): Combined time of those executions in milliseconds.
+        maxMs (float): Slowest execution in milliseconds.
+        lastEndpoint (str): Endpoint of the latest slow execution, if it ran in a request.
+        firstSeenAt (datetime): When the statement was first recorded.
+        lastSeenAt (datetime): When the statement was last recorded.
+        planCapturedAt (datetime): When the stored plan was captured.
+    """
+    __tablename__ = 'slow_queries'
+    fingerprint = db.Column(db.String(40), primary_key=True)
+    statement = db.Column(db.Text, nullable=False)
+    queryPlan = db.Column(db.Text)
+    dialect = db.Column(db.String(20))
+    callCount = db.Column(db.Integer, nullable=False, default=0)
+    totalMs = db.Column(db.Float, nullable=False, default=0)
+    maxMs = db.Column(db.Float, nullable=False, default=0)
+    lastEndpoint = db.Column(db.String(100))
+    firstSeenAt = db.Column(db.DateTime, nullable=False)
+    lastSeenAt = db.Column(db.DateTime, nullable=False)
+    planCapturedAt = db.Column(db.DateTime)
 
 
-@app.route('/dashboard')
-@login_required
-def dashboard():
+# Record IDs
+RECORD_ID_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'  # Crockford base32, in ASCII order
+RECORD_ID_RANDOM_BITS = 50
+_record_id_lock = threading.Lock()
+_record_id_millis = 0
+_record_id_random = 0
+
+
+def _reset_record_ids():
     """
-    Function Name:  dashboard
-    Description:    Renders the user dashboard with financial summary and visualizations
+    Function Name:  _reset_record_ids
+    Description:    Forgets the last generated ID, so a forked worker process draws its
+                    own random sequence instead of continuing its parent's
     Args:           None
-    Returns:        flask.Response: Rendered dashboard template with financial data
+    Returns:        None
     Raises:         None
     """
-    # Get current month's start and end dates
-    today = datetime.now()
-    month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-    
-    # Get monthly expenses using the join table
-    monthly_expenses = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate >= month_start,
-        Transaction.tranDate <= month_end
-    ).all()
-    
-    # Get monthly revenue
-    monthly_revenue = Revenue.query.filter(
-        Revenue.userID == current_user.userID,
-        Revenue.revDate >= month_start,
-        Revenue.revDate <= month_end
-    ).all()
-    
-    # Calculate totals
-    total_expenses = sum(expense.tranAmount for expense in monthly_expenses)
-    total_revenue = sum(revenue.revAmount for revenue in monthly_revenue)
-    
-    # Get recent transactions using the join table
-    recent_transactions = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID
-    ).order_by(Transaction.tranDate.desc()).limit(5).all()
-    
-    # Get recent revenues
-    recent_revenues = Revenue.query.filter_by(userID=current_user.userID)\
-        .order_by(Revenue.revDate.desc())\
-        .limit(5)\
-        .all()
-    
-    # Get category breakdown using the join table
-    category_expenses = db.session.query(
-        Transaction.catID,
-        func.sum(Transaction.tranAmount).label('total')
-    ).join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate >= month_start,
-        Transaction.tranDate <= month_end
-    ).group_by(Transaction.catID).all()
-    
-    # Get revenue breakdown
-    category_revenues = db.session.query(
-        Revenue.revType,
-        func.sum(Revenue.revAmount).label('total')
-    ).filter(
-        Revenue.userID == current_user.userID,
-        Revenue.revDate >= month_start,
-        Revenue.revDate <= month_end
-    ).group_by(Revenue.revType).all()
-    
-    # Prepare data for charts
-    expense_categories = [cat[0] for cat in category_expenses]
-    expense_amounts = [float(cat[1]) for cat in category_expenses]
-    revenue_categories = [cat[0] for cat in category_revenues]
-    revenue_amounts = [float(cat[1]) for cat in category_revenues]
-    
-    return render_template('dashboard.html',
-                         monthly_expenses=total_expenses,
-                         monthly_revenue=total_revenue,
-                         recent_transactions=recent_transactions,
-                         recent_revenues=recent_revenues,
-                         expense_categories=expense_categories,
-                         expense_amounts=expense_amounts,
-                         revenue_categories=revenue_categories,
-                         revenue_amounts=revenue_amounts)
+    global _record_id_millis, _record_id_random
+    _record_id_millis = 0
+    _record_id_random = 0
 
 
-@app.route('/logout')
-@login_required
-def logout():
+os.register_at_fork(after_in_child=_reset_record_ids)
+
+
+def new_record_id():
     """
-    Function Name:  logout
-    Description:    Logs out the current user and redirects to the home page
+    Function Name:  new_record_id
+    Description:    Generates the primary key of a new transaction or revenue entry: 10
+                    base32 characters of the millisecond timestamp followed by 10 of
+                    random bits. IDs sort in creation order, so inserts append to the end
+                    of the primary key index. Within a process they are strictly
+                    increasing: IDs generated in the same millisecond (or after the clock
+                    steps back) increment the random part of the previous ID.
     Args:           None
-    Returns:        flask.Response: Redirect to home page
+    Returns:        str: A 20 character ID
     Raises:         None
     """
-    logout_user()
-    return redirect(url_for('index'))
+    global _record_id_millis, _record_id_random
+    with _record_id_lock:
+        millis = int(time.time() * 1000)
+        if millis <= _record_id_millis:
+            millis = _record_id_millis
+            random_part = _record_id_random + 1
+            if random_part >> RECORD_ID_RANDOM_BITS:
+                millis += 1
+                random_part = secrets.randbits(RECORD_ID_RANDOM_BITS - 1)
+        else:
+            # The top random bit starts clear so increments have room before overflowing
+            random_part = secrets.randbits(RECORD_ID_RANDOM_BITS - 1)
+        _record_id_millis, _record_id_random = millis, random_part
 
+    value = (millis << RECORD_ID_RANDOM_BITS) | random_part
+    return ''.join(RECORD_ID_ALPHABET[(value >> shift) & 31] for shift in range(95, -1, -5))
 
-# Transaction Management Routes
-@app.route('/transactions/add', methods=['GET', 'POST'])
-@login_required
-def add_transaction():
+
+# Rollup Helpers
+def _lock_rollup_row(model, key, **defaults):
     """
-    Function Name:  add_transaction
-    Description:    Handles creation of a new transaction
-    Args:           None (transaction data received via request form)
-    Returns:        flask.Response: Rendered form template or redirect after creation
+    Function Name:  _lock_rollup_row
+    Description:    Locks a rollup row for update, creating it first if it does not exist.
+                    The row is created with an insert that ignores duplicate keys before it
+                    is locked, because on MySQL a SELECT ... FOR UPDATE of a missing key takes
+                    a gap lock, and two first writers to the same key would then deadlock.
+    Args:           model (db.Model): The rollup model
+                    key (tuple): The row's primary key
+                    **defaults: Column values of a new row
+    Returns:        db.Model: The locked row
     Raises:         None
     """
-    if request.method == 'POST':
-        # Get form data
-        date = datetime.strptime(request.form.get('date'), '%Y-%m-%d').date()
-        time = request.form.get('time')
-        category_id = request.form.get('category')
-        description = request.form.get('description')
-        amount = float(request.form.get('amount'))
+    if db.session.get_bind().dialect.name == 'mysql':
+        statement = mysql.insert(model).values(**defaults)
+        pk_column = inspect(model).primary_key[0].key
+        statement = statement.on_duplicate_key_update({pk_column: statement.inserted[pk_column]})
+    else:
+        statement = sqlite.insert(model).values(**defaults).on_conflict_do_nothing()
+    db.session.execute(statement)
 
-        # Create new transaction
-        transaction = Transaction(
-            tranID=str(uuid.uuid4())[:8],
-            tranDate=date,
-            tranTime=time,
-            catID=category_id,
-            tranDescription=description,
-            tranAmount=amount
-        )
-        db.session.add(transaction)
-        
-        # Create user-transaction association
-        user_transaction = UserTransaction(
-            userID=current_user.userID,
-            tranID=transaction.tranID
-        )
-        db.session.add(user_transaction)
-        
-        try:
-            db.session.commit()
-            flash('Transaction added successfully!', 'success')
-            return redirect(url_for('view_transactions'))
-        except Exception as e:
-            db.session.rollback()
-            flash('Error adding transaction. Please try again.', 'error')
-    
-    # Get all categories for the form
-    categories = Category.query.all()
-    
-    # Get current date and time for default values
-    today = datetime.now().strftime('%Y-%m-%d')
-    now = datetime.now().strftime('%H:%M')
-    
-    return render_template('add_transaction.html', 
-                         categories=categories,
-                         today=today,
-                         now=now)
+    return db.session.get(model, key, with_for_update=True, populate_existing=True)
 
 
-@app.route('/transactions')
-@login_required
-def view_transactions():
+def _apply_rollup(user_id, entry_date, entry_type, category_key, amount, count):
     """
-    Function Name:  view_transactions
-    Description:    Displays a paginated list of user transactions with filtering options
-    Args:           None (filter parameters received via request args)
-    Returns:        flask.Response: Rendered template with transaction data
+    Function Name:  _apply_rollup
+    Description:    Adds entries to (positive count) or removes them from (negative count)
+                    the monthly rollup tables. Changes are made in the current session so
+                    they commit or roll back together with the entries themselves.
+    Args:           user_id (str): The owner of the entries
+                    entry_date (date): A date in the month of the entries
+                    entry_type (str): 'expense' or 'revenue'
+                    category_key (str): Category ID or revenue type of the entries
+                    amount (float): Change in the month's total, negative for removals
+                    count (int): Change in the month's number of entries
+    Returns:        None
     Raises:         None
     """
-    # Get filter parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = 10
-    category = request.args.get('category')
-    date_from = request.args.get('date_from')
-    date_to = request.args.get('date_to')
-    search_term = request.args.get('search', '')
+    month_start = entry_date.replace(day=1)
 
-    # Set default dates to current year if not provided
-    current_year = datetime.now().year
-    if not date_from:
-        date_from = f"{current_year}-01-01"
-    if not date_to:
-        date_to = f"{current_year}-12-31"
+    totals = _lock_rollup_row(
+        UserMonthlyTotal,
+        (user_id, month_start),
+        userID=user_id,
+        monthStart=month_start,
+        expenseTotal=0,
+        expenseCount=0,
+        revenueTotal=0,
+        revenueCount=0,
+        revision=0
+    )
 
-    # Build query
-    query = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID
+    totals.revision += 1
+    if entry_type == 'expense':
+        totals.expenseTotal += amount
+        totals.expenseCount += count
+    else:
+        totals.revenueTotal += amount
+        totals.revenueCount += count
+
+    category_totals = _lock_rollup_row(
+        UserMonthlyCategoryTotal,
+        (user_id, month_start, entry_type, category_key),
+        userID=user_id,
+        monthStart=month_start,
+        entryType=entry_type,
+        categoryKey=category_key,
+        total=0,
+        entryCount=0
     )
 
-    # Apply filters
-    if category:
-        query = query.filter(Transaction.catID == category)
-    if date_from:
-        query = query.filter(Transaction.tranDate >= datetime.strptime(date_from, '%Y-%m-%d').date())
-    if date_to:
-        query = query.filter(Transaction.tranDate <= datetime.strptime(date_to, '%Y-%m-%d').date())
-    if search_term:
-        query = query.filter(Transaction.tranDescription.ilike(f'%{search_term}%'))
+    category_totals.total += amount
+    category_totals.entryCount += count
+
+
+def apply_transaction_rollup(transaction, sign=1):
+    """
+    Function Name:  apply_transaction_rollup
+    Description:    Adds or removes a transaction from its owner's monthly rollups
+    Args:           transaction (Transaction): The transaction being added or removed
+                    sign (int): 1 when the transaction is added, -1 when it is removed
+    Returns:        None
+    Raises:         None
+    """
+    _apply_rollup(transaction.userID, transaction.tranDate, 'expense', transaction.catID,
+                  sign * transaction.tranAmount, sign)
 
-    # Order by date and time
-    query = query.order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc())
+    last_used = transaction.tranDate
+    if sign < 0:
+        # The category's latest date comes from the user's other transactions (an index seek)
+        last_used = db.session.query(func.max(Transaction.tranDate)).filter(
+            Transaction.userID == transaction.userID,
+            Transaction.catID == transaction.catID,
+            Transaction.tranID != transaction.tranID
+        ).scalar()
+    apply_category_stats(transaction.userID, transaction.catID, sign, sign * transaction.tranAmount,
+                         last_used, replace_last_used=sign < 0)
 
-    # Paginate results
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    transactions = pagination.items
 
-    # Get all categories for the filter
-    categories = Category.query.all()
+def apply_category_stats(user_id, cat_id, count, amount, last_used, replace_last_used=False):
+    """
+    Function Name:  apply_category_stats
+    Description:    Adjusts a user's usage counters for a category in the current session,
+                    so they commit or roll back together with the transactions being written
+    Args:           user_id (str): The user whose counters change
+                    cat_id (str): The category whose counters change
+                    count (int): Change in the number of transactions
+                    amount (float): Change in the total amount
+                    last_used (date): Date of the transactions added, or after a removal the
+                    user's remaining latest date in the category
+                    replace_last_used (bool): True to set lastUsed to last_used rather than
+                    keeping the later of the two
+    Returns:        None
+    Raises:         None
+    """
+    stats = _lock_rollup_row(
+        CategoryStat,
+        (user_id, cat_id),
+        userID=user_id,
+        catID=cat_id,
+        tranCount=0,
+        tranTotal=0,
+        lastUsed=None
+    )
 
-    return render_template('view_transactions.html',
-                         transactions=transactions,
-                         categories=categories,
-                         selected_category=category,
-                         date_from=date_from,
-                         date_to=date_to,
-                         current_page=page,
-                         total_pages=pagination.pages,
-                         search_term=search_term)
+    stats.tranCount += count
+    stats.tranTotal += amount
+    if replace_last_used or stats.lastUsed is None or (last_used and last_used > stats.lastUsed):
+        stats.lastUsed = last_used
 
 
-@app.route('/transactions/<tran_id>/edit', methods=['GET', 'POST'])
-@login_required
-def edit_transaction(tran_id):
+def apply_revenue_rollup(revenue, sign=1):
     """
-    Function Name:  edit_transaction
-    Description:    Handles editing of an existing transaction
-    Args:           tran_id (str): Unique identifier of the transaction to edit
-    Returns:        flask.Response: Rendered edit form or redirect after update
-    Raises:         werkzeug.exceptions.NotFound: If transaction not found or not owned by user
+    Function Name:  apply_revenue_rollup
+    Description:    Adds or removes a revenue entry from its owner's monthly rollups
+    Args:           revenue (Revenue): The revenue entry being added or removed
+                    sign (int): 1 when the entry is added, -1 when it is removed
+    Returns:        None
+    Raises:         None
     """
-    # Get transaction and verify ownership
-    transaction = Transaction.query.join(UserTransaction).filter(
-        Transaction.tranID == tran_id,
-        UserTransaction.userID == current_user.userID
-    ).first_or_404()
+    _apply_rollup(revenue.userID, revenue.revDate, 'revenue', revenue.revType,
+                  sign * revenue.revAmount, sign)
 
-    if request.method == 'POST':
-        # Update transaction
-        transaction.tranDate = datetime.strptime(request.form.get('date'), '%Y-%m-%d').date()
-        transaction.tranTime = request.form.get('time')
-        transaction.catID = request.form.get('category')
-        transaction.tranDescription = request.form.get('description')
-        transaction.tranAmount = float(request.form.get('amount'))
 
-        try:
-            db.session.commit()
-            flash('Transaction updated successfully!', 'success')
-            return redirect(url_for('view_transactions'))
-        except Exception as e:
-            db.session.rollback()
-            flash('Error updating transaction. Please try again.', 'error')
+# Pagination Helpers
+_page_count_cache = {}
 
-    # Get all categories for the form
-    categories = Category.query.all()
-    return render_template('edit_transaction.html', transaction=transaction, categories=categories)
+
+def encode_cursor(values, direction):
+    """
+    Function Name:  encode_cursor
+    Description:    Encodes a page boundary key into an opaque URL-safe cursor
+    Args:           values (list): The sort key values of the boundary row
+                    direction (str): 'next' or 'prev'
+    Returns:        str: The encoded cursor
+    Raises:         None
+    """
+    payload = json.dumps({'k': values, 'd': direction}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
 
 
-@app.route('/transactions/<tran_id>/delete', methods=['POST'])
-@login_required
-def delete_transaction(tran_id):
+def decode_cursor(cursor, columns):
     """
-    Function Name:  delete_transaction
-    Description:    Handles deletion of an existing transaction
+    Function Name:  decode_cursor
+    Description:    Decodes a cursor created by encode_cursor back into typed key values
+    Args:           cursor (str): The cursor from the request
+                    columns (list): The model columns the key values belong to
+    Returns:        tuple: (key values or None, direction); (None, 'next') if the cursor is invalid
+    Raises:         None
+    """
+    if not cursor:
+        return None, 'next'
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values = []
+        for column, value in zip(columns, payload['k'], strict=True):
+            if isinstance(column.type, db.Date):
+                value = datetime.strptime(value, '%Y-%m-%d').date()
+            values.append(value)
+        direction = 'prev' if payload['d'] == 'prev' else 'next'
+        return values, direction
+    except (ValueError, KeyError, TypeError):
+        return None, 'next'
+
+
+def keyset_paginate(query, columns, cursor, per_page):
+    """
+    Function Name:  keyset_paginate
+    Description:    Fetches one page of a query ordered newest first by the given columns,
+                    seeking past the cursor's key instead of using OFFSET, so every page
+                    costs the same regardless of how deep it is
+    Args:           query (flask_sqlalchemy.query.Query): The filtered query to page through
+                    columns (list): Model columns forming a unique sort key, most significant first
+                    cursor (str): Cursor from a previous page, or None for the first page
+                    per_page (int): Number of rows per page
+    Returns:        tuple: (rows, next_cursor, prev_cursor); cursors are None when there is no such page
+    Raises:         None
+    """
+    values, direction = decode_cursor(cursor, columns)
+    backwards = direction == 'prev'
+
+    if values is not None:
+        seek = []
+        for idx, column in enumerate(columns):
+            equal = [col == value for col, value in zip(columns[:idx], values[:idx])]
+            beyond = column > values[idx] if backwards else column < values[idx]
+            seek.append(and_(*equal, beyond))
+        query = query.filter(or_(*seek))
+
+    query = query.order_by(*[column.asc() if backwards else column.desc() for column in columns])
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def key_of(row):
+        return [getattr(row, column.key) for column in columns]
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(key_of(rows[-1]), 'next')
+        if (has_more and backwards) or (values is not None and not backwards):
+            prev_cursor = encode_cursor(key_of(rows[0]), 'prev')
+    return rows, next_cursor, prev_cursor
+
+
+def cached_count(cache_key, query):
+    """
+    Function Name:  cached_count
+    Description:    Returns the row count of a query, reusing a recent count for the same
+                    key so paging does not run COUNT(*) on every page
+    Args:           cache_key (tuple): Identifies the user and filters the count belongs to
+                    query (flask_sqlalchemy.query.Query): The filtered query to count
+    Returns:        int: The (possibly slightly stale) number of rows
+    Raises:         None
+    """
+    now = time.monotonic()
+    cached = _page_count_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    count = query.order_by(None).count()
+    if len(_page_count_cache) > 10000:
+        _page_count_cache.clear()
+    _page_count_cache[cache_key] = (now + app.config['PAGE_COUNT_CACHE_SECONDS'], count)
+    return count
+
+
+# Search Backends
+def search_tokens(term):
+    """
+    Function Name:  search_tokens
+    Description:    Splits a search term into lower-case word tokens
+    Args:           term (str): The search term entered by the user
+    Returns:        list: The word tokens of the term
+    Raises:         None
+    """
+    return re.findall(r'\w+', (term or '').lower())
+
+
+class LikeSearchBackend:
+    """
+    LikeSearchBackend - Description search using a substring LIKE match. Works on every
+    database but scans all of the user's rows, so it is only the fallback.
+
+    Attributes:
+        name (str): Name reported for the backend.
+        targets (dict): Model, key, description and owner columns per searchable table.
+    """
+    name = 'like'
+
+    def __init__(self):
+        self.targets = {
+            'transactions': (Transaction, Transaction.tranID, Transaction.tranDescription, Transaction.userID),
+            'revenues': (Revenue, Revenue.revID, Revenue.revDescription, Revenue.userID),
+        }
+
+    def filter_query(self, query, target, user_id, term):
+        """
+        Function Name:  filter_query
+        Description:    Restricts a query to rows whose description matches the term
+        Args:           query (flask_sqlalchemy.query.Query): The query to filter
+                        target (str): 'transactions' or 'revenues'
+                        user_id (str): The owner of the rows being searched
+                        term (str): The search term
+        Returns:        flask_sqlalchemy.query.Query: The filtered query
+        Raises:         None
+        """
+        description = self.targets[target][2]
+        return query.filter(description.ilike(f'%{term}%'))
+
+    def ranked(self, target, user_id, term, limit=20):
+        """
+        Function Name:  ranked
+        Description:    Returns the user's best matching rows for the term, best first
+        Args:           target (str): 'transactions' or 'revenues'
+                        user_id (str): The owner of the rows being searched
+                        term (str): The search term
+                        limit (int): Maximum number of rows to return
+        Returns:        list: Model instances ordered by relevance
+        Raises:         None
+        """
+        model, key, description, owner = self.targets[target]
+        date_column = Transaction.tranDate if model is Transaction else Revenue.revDate
+        query = self.filter_query(model.query.filter(owner == user_id), target, user_id, term)
+        return query.order_by(date_column.desc()).limit(limit).all()
+
+
+class MySQLFulltextSearchBackend(LikeSearchBackend):
+    """
+    MySQLFulltextSearchBackend - Description search using the MySQL FULLTEXT indexes in
+    boolean mode, with every word treated as a prefix. MySQL keeps the indexes in sync.
+    Terms with words shorter than the server's minimum token size fall back to LIKE.
+    """
+    name = 'mysql-fulltext'
+
+    def _against(self, term):
+        tokens = search_tokens(term)
+        if not tokens or min(len(token) for token in tokens) < app.config['FULLTEXT_MIN_TOKEN_SIZE']:
+            return None
+        return ' '.join(f'+{token}*' for token in tokens)
+
+    def filter_query(self, query, target, user_id, term):
+        against = self._against(term)
+        if against is None:
+            return super().filter_query(query, target, user_id, term)
+        description = self.targets[target][2]
+        return query.filter(mysql.match(description, against=against).in_boolean_mode())
+
+    def ranked(self, target, user_id, term, limit=20):
+        against = self._against(term)
+        if against is None:
+            return super().ranked(target, user_id, term, limit)
+        model, key, description, owner = self.targets[target]
+        score = mysql.match(description, against=against).in_boolean_mode()
+        return model.query.filter(owner == user_id, score)\
+            .order_by(score.desc())\
+            .limit(limit)\
+            .all()
+
+
+class SQLiteFTS5SearchBackend(LikeSearchBackend):
+    """
+    SQLiteFTS5SearchBackend - Description search using SQLite FTS5 tables, for development
+    and testing. Each table has a <table>_fts shadow table kept in sync by triggers; the
+    owner is indexed as a token so a search only reads the user's own postings.
+    """
+    name = 'sqlite-fts5'
+
+    fts_tables = {
+        'transactions': ('transactions_fts', 'tranID', 'tranDescription'),
+        'revenues': ('revenues_fts', 'revID', 'revDescription'),
+    }
+
+    @staticmethod
+    def owner_token(user_id):
+        return 'u' + user_id.encode('utf-8').hex().upper()
+
+    @classmethod
+    def install(cls, connection, rebuild=False):
+        """
+        Function Name:  install
+        Description:    Creates the FTS5 tables and sync triggers if they are missing, and
+                        repopulates a table whenever its triggers had to be (re)created,
+                        e.g. after a migration rebuilt the base table
+        Args:           connection (sqlalchemy.engine.Connection): Connection to run the DDL on
+                        rebuild (bool): Repopulate every FTS table even if it looks current
+        Returns:        None
+        Raises:         None
+        """
+        existing = {row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )}
+        for table, (fts, key, description) in cls.fts_tables.items():
+            owner = "'u' || hex(new.userID)"
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+                f"USING fts5(description, owner, {key} UNINDEXED)"
+            )
+            triggers = {
+                f'{fts}_ai': f"AFTER INSERT ON {table} BEGIN "
+                             f"INSERT INTO {fts} (description, owner, {key}) "
+                             f"VALUES (new.{description}, {owner}, new.{key}); END",
+                f'{fts}_ad': f"AFTER DELETE ON {table} BEGIN "
+                             f"DELETE FROM {fts} WHERE {key} = old.{key}; END",
+                f'{fts}_au': f"AFTER UPDATE OF {description}, userID ON {table} BEGIN "
+                             f"UPDATE {fts} SET description = new.{description}, owner = {owner} "
+                             f"WHERE {key} = old.{key}; END",
+            }
+            missing = [name for name in triggers if name not in existing]
+            for name in missing:
+                connection.exec_driver_sql(f"CREATE TRIGGER {name} {triggers[name]}")
+            if rebuild or missing:
+                connection.exec_driver_sql(f"DELETE FROM {fts}")
+                connection.exec_driver_sql(
+                    f"INSERT INTO {fts} (description, owner, {key}) "
+                    f"SELECT {description}, 'u' || hex(userID), {key} FROM {table}"
+                )
+
+    def _match(self, target, user_id, term):
+        tokens = search_tokens(term)
+        if not tokens:
+            return None
+        fts = self.fts_tables[target][0]
+        phrases = ' AND '.join(f'description : "{token}"*' for token in tokens)
+        expression = f'owner : {self.owner_token(user_id)} AND {phrases}'
+        return fts, literal_column(fts).op('MATCH')(expression)
+
+    def filter_query(self, query, target, user_id, term):
+        match = self._match(target, user_id, term)
+        if match is None:
+            return super().filter_query(query, target, user_id, term)
+        fts, condition = match
+        key = self.targets[target][1]
+        return query.filter(key.in_(
+            select(literal_column(f'{fts}.{key.key}')).select_from(text(fts)).where(condition)
+        ))
+
+    def ranked(self, target, user_id, term, limit=20):
+        match = self._match(target, user_id, term)
+        if match is None:
+            return super().ranked(target, user_id, term, limit)
+        fts, condition = match
+        model, key, description, owner = self.targets[target]
+        hits = db.session.execute(
+            select(literal_column(f'{fts}.{key.key}'))
+            .select_from(text(fts))
+            .where(condition)
+            .order_by(literal_column(f'{fts}.rank'))
+            .limit(limit)
+        ).scalars().all()
+        rows = {getattr(row, key.key): row for row in model.query.filter(key.in_(hits), owner == user_id)}
+        return [rows[hit] for hit in hits if hit in rows]
+
+
+_search_backend = None
+
+
+def get_search_backend():
+    """
+    Function Name:  get_search_backend
+    Description:    Returns the search backend for the configured database, setting it up
+                    on first use. Falls back to LIKE matching if no index is available.
+    Args:           None
+    Returns:        LikeSearchBackend: The backend to use for description searches
+    Raises:         None
+    """
+    global _search_backend
+    if _search_backend is not None:
+        return _search_backend
+
+    backend = LikeSearchBackend()
+    dialect = db.engine.dialect.name
+    if app.config['SEARCH_BACKEND'] == 'auto':
+        if dialect == 'mysql':
+            indexes = {index['name'] for index in inspect(db.engine).get_indexes('transactions')}
+            if 'ft_transactions_tranDescription' in indexes:
+                backend = MySQLFulltextSearchBackend()
+            else:
+                app.logger.warning('FULLTEXT indexes missing, falling back to LIKE search')
+        elif dialect == 'sqlite':
+            try:
+                with db.engine.begin() as connection:
+                    SQLiteFTS5SearchBackend.install(connection)
+                backend = SQLiteFTS5SearchBackend()
+            except Exception as e:
+                app.logger.warning(f'FTS5 unavailable, falling back to LIKE search: {str(e)}')
+
+    _search_backend = backend
+    return backend
+
+
+# Report Helpers
+TREND_BUCKETS = ('day', 'week', 'month', 'year')
+
+
+def trend_point_count(start_date, end_date, bucket):
+    """
+    Function Name:  trend_point_count
+    Description:    Counts the points a trend over a date range has at a bucket size
+    Args:           start_date (date): First day of the range
+                    end_date (date): Last day of the range
+                    bucket (str): One of TREND_BUCKETS
+    Returns:        int: Number of buckets covering the range
+    Raises:         None
+    """
+    if end_date < start_date:
+        return 0
+    if bucket == 'day':
+        return (end_date - start_date).days + 1
+    if bucket == 'week':
+        return (end_date - start_date).days // 7 + 1
+    if bucket == 'month':
+        return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    return end_date.year - start_date.year + 1
+
+
+def choose_trend_bucket(start_date, end_date, requested=None):
+    """
+    Function Name:  choose_trend_bucket
+    Description:    Picks the finest bucket size that keeps a trend within TREND_MAX_POINTS.
+                    A requested bucket is used if it fits, otherwise the next coarser one.
+    Args:           start_date (date): First day of the range
+                    end_date (date): Last day of the range
+                    requested (str): Bucket asked for by the user, or None to choose from the span
+    Returns:        str: One of TREND_BUCKETS
+    Raises:         None
+    """
+    candidates = TREND_BUCKETS[TREND_BUCKETS.index(requested):] if requested in TREND_BUCKETS else TREND_BUCKETS
+    for bucket in candidates:
+        if trend_point_count(start_date, end_date, bucket) <= app.config['TREND_MAX_POINTS']:
+            return bucket
+    return TREND_BUCKETS[-1]
+
+
+def trend_labels(start_date, end_date, bucket):
+    """
+    Function Name:  trend_labels
+    Description:    Builds the chart labels for each bucket of a trend
+    Args:           start_date (date): First day of the range
+                    end_date (date): Last day of the range
+                    bucket (str): One of TREND_BUCKETS
+    Returns:        list: YYYY-MM-DD for day and week buckets (the week's first day),
+                    'Mon YYYY' for month buckets and YYYY for year buckets
+    Raises:         None
+    """
+    count = trend_point_count(start_date, end_date, bucket)
+    if bucket in ('day', 'week'):
+        step = 1 if bucket == 'day' else 7
+        return [(start_date + timedelta(days=i * step)).strftime('%Y-%m-%d') for i in range(count)]
+    if bucket == 'month':
+        first = start_date.year * 12 + start_date.month - 1
+        return [datetime((first + i) // 12, (first + i) % 12 + 1, 1).strftime('%b %Y') for i in range(count)]
+    return [str(start_date.year + i) for i in range(count)]
+
+
+def trend_bucket_index(column, start_date, bucket):
+    """
+    Function Name:  trend_bucket_index
+    Description:    Builds the SQL expression numbering the bucket a date falls into,
+                    counting from 0 for the bucket holding start_date. Day differences need
+                    dialect-specific functions; months and years use EXTRACT everywhere.
+    Args:           column (sqlalchemy.Column): The date column to bucket
+                    start_date (date): First day of the range
+                    bucket (str): One of TREND_BUCKETS
+    Returns:        sqlalchemy.sql.ColumnElement: Integer bucket number
+    Raises:         None
+    """
+    if bucket == 'month':
+        return func.extract('year', column) * 12 + func.extract('month', column) - (start_date.year * 12 + start_date.month)
+    if bucket == 'year':
+        return func.extract('year', column) - start_date.year
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        days = db.cast(func.julianday(column) - func.julianday(start_date), db.Integer)
+    elif dialect == 'postgresql':
+        days = column - start_date
+    else:
+        days = func.datediff(column, start_date)
+    return days if bucket == 'day' else days // 7
+
+
+def trend_series(date_column, amount_column, criteria, start_date, end_date, bucket):
+    """
+    Function Name:  trend_series
+    Description:    Sums amounts per bucket with one GROUP BY query and fills the buckets
+                    with no entries with zero, so the cost depends on the number of
+                    buckets rather than the number of days in the range
+    Args:           date_column (sqlalchemy.Column): The date column to bucket
+                    amount_column (sqlalchemy.Column): The amount column to sum
+                    criteria (list): Filter conditions, including the date range
+                    start_date (date): First day of the range
+                    end_date (date): Last day of the range
+                    bucket (str): One of TREND_BUCKETS
+    Returns:        list: One float total per bucket
+    Raises:         None
+    """
+    bucket_index = trend_bucket_index(date_column, start_date, bucket).label('bucket')
+    rows = db.session.query(bucket_index, func.sum(amount_column)).filter(*criteria).group_by(bucket_index).all()
+
+    series = [0.0] * trend_point_count(start_date, end_date, bucket)
+    for index, amount in rows:
+        if 0 <= int(index) < len(series):
+            series[int(index)] = float(amount)
+    return series
+
+
+def expense_summary(criteria):
+    """
+    Function Name:  expense_summary
+    Description:    Aggregates the transactions matching a filter in a single query
+    Args:           criteria (list): Filter conditions on Transaction
+    Returns:        Row: total, count, first_date and last_date of the matching transactions
+                    (total is 0 and the dates are None when nothing matches)
+    Raises:         None
+    """
+    return db.session.query(
+        func.coalesce(func.sum(Transaction.tranAmount), 0).label('total'),
+        func.count(Transaction.tranID).label('count'),
+        func.min(Transaction.tranDate).label('first_date'),
+        func.max(Transaction.tranDate).label('last_date')
+    ).filter(*criteria).one()
+
+
+def minute_range_criteria(minute_from, minute_to):
+    """
+    Function Name:  minute_range_criteria
+    Description:    Builds the filter for a time-of-day range on tranMinute. A range whose
+                    end is before its start wraps past midnight (e.g. 22:00 to 02:00).
+    Args:           minute_from (int): Start of the range in minutes since midnight
+                    minute_to (int): End of the range in minutes since midnight
+    Returns:        sqlalchemy.sql.ColumnElement: Filter condition on Transaction.tranMinute
+    Raises:         None
+    """
+    if minute_from <= minute_to:
+        return Transaction.tranMinute.between(minute_from, minute_to)
+    return or_(Transaction.tranMinute >= minute_from, Transaction.tranMinute <= minute_to)
+
+
+def hourly_series(criteria, minute_from=0, minute_to=1439):
+    """
+    Function Name:  hourly_series
+    Description:    Sums the transactions matching a filter per hour of the day with one
+                    GROUP BY query on tranMinute, filling hours with no transactions with zero
+    Args:           criteria (list): Filter conditions on Transaction
+                    minute_from (int): Start of the time range, in minutes since midnight
+                    minute_to (int): End of the time range; before minute_from if it wraps
+    Returns:        tuple: (labels as HH:00 in time order from minute_from, one float total per hour)
+    Raises:         None
+    """
+    hour = (Transaction.tranMinute // 60).label('hour')
+    rows = db.session.query(hour, func.sum(Transaction.tranAmount)).filter(*criteria).group_by(hour).all()
+
+    first_hour = minute_from // 60
+    hour_count = (minute_to // 60 - first_hour) % 24 + 1
+    if minute_from > minute_to and hour_count == 1:
+        hour_count = 24
+    hours = [(first_hour + i) % 24 for i in range(hour_count)]
+    series = [0.0] * len(hours)
+    positions = {h: i for i, h in enumerate(hours)}
+    for row_hour, amount in rows:
+        if int(row_hour) in positions:
+            series[positions[int(row_hour)]] = float(amount)
+    return [f'{h:02d}:00' for h in hours], series
+
+
+def weekday_series(criteria):
+    """
+    Function Name:  weekday_series
+    Description:    Sums the transactions matching a filter per day of the week with one
+                    GROUP BY query, using the dialect's day-of-week function
+    Args:           criteria (list): Filter conditions on Transaction
+    Returns:        tuple: (day names from Monday, one float total per day)
+    Raises:         None
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        # strftime('%w') counts from Sunday = 0
+        weekday = (db.cast(func.strftime('%w', Transaction.tranDate), db.Integer) + 6) % 7
+    elif dialect == 'postgresql':
+        weekday = func.extract('isodow', Transaction.tranDate) - 1
+    else:
+        # MySQL WEEKDAY() counts from Monday = 0
+        weekday = func.weekday(Transaction.tranDate)
+    weekday = weekday.label('weekday')
+    rows = db.session.query(weekday, func.sum(Transaction.tranAmount)).filter(*criteria).group_by(weekday).all()
+
+    series = [0.0] * 7
+    for row_weekday, amount in rows:
+        series[int(row_weekday)] = float(amount)
+    return ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], series
+
+
+def report_listing(criteria, cursor, per_page=25):
+    """
+    Function Name:  report_listing
+    Description:    Fetches one page of the transactions behind a report, newest first,
+                    so a report never renders the user's entire history at once
+    Args:           criteria (list): Filter conditions on Transaction
+                    cursor (str): Cursor from a previous page, or None for the first page
+                    per_page (int): Number of rows per page
+    Returns:        tuple: (transactions, next_cursor, prev_cursor)
+    Raises:         None
+    """
+    return keyset_paginate(
+        Transaction.query.options(db.joinedload(Transaction.category)).filter(*criteria),
+        [Transaction.tranDate, Transaction.tranTime, Transaction.tranID],
+        cursor,
+        per_page
+    )
+
+
+# Category Cache
+CachedCategory = namedtuple('CachedCategory', ['catID', 'catName'])
+
+
+def cache_version(name):
+    """
+    Function Name:  cache_version
+    Description:    Reads the shared version counter of a cached data set
+    Args:           name (str): Name of the cached data set
+    Returns:        int: The current version, 0 if the data set has never changed
+    Raises:         None
+    """
+    return db.session.query(CacheVersion.version).filter(CacheVersion.name == name).scalar() or 0
+
+
+def bump_cache_version(name):
+    """
+    Function Name:  bump_cache_version
+    Description:    Increments the shared version counter of a cached data set in the
+                    current transaction, so it becomes visible when the change is committed
+    Args:           name (str): Name of the cached data set
+    Returns:        None
+    Raises:         None
+    """
+    updated = CacheVersion.query.filter(CacheVersion.name == name).update(
+        {'version': CacheVersion.version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.session.add(CacheVersion(name=name, version=1))
+
+
+class CategoryCache:
+    """
+    CategoryCache - A process-wide cache of the category list. The cached list is trusted for
+    CATEGORY_CACHE_SECONDS, then revalidated against the shared 'categories' version row
+    (one primary key lookup) and reloaded only if another request or worker has changed it.
+
+    Attributes:
+        name (str): Name of the version row the cache is keyed by.
+        hits (int): Reads served from the cache.
+        misses (int): Reads that loaded the categories from the database.
+        version_checks (int): Times the version row was read to revalidate the cache.
+    """
+    name = 'categories'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = None
+        self._version = None
+        self._checked_at = 0
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+
+    def all(self):
+        """
+        Function Name:  all
+        Description:    Returns every category, from the cache while it is current
+        Args:           None
+        Returns:        list: CachedCategory tuples ordered by category ID
+        Raises:         None
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._categories is not None and now - self._checked_at < app.config['CATEGORY_CACHE_SECONDS']:
+                self.hits += 1
+                return self._categories
+
+        version = cache_version(self.name)
+        with self._lock:
+            self.version_checks += 1
+            if self._categories is not None and version == self._version:
+                self._checked_at = now
+                self.hits += 1
+                return self._categories
+
+        categories = [
+            CachedCategory(cat_id, cat_name)
+            for cat_id, cat_name in db.session.query(Category.catID, Category.catName).order_by(Category.catID)
+        ]
+        with self._lock:
+            self.misses += 1
+            self._categories = categories
+            self._version = version
+            self._checked_at = now
+        return categories
+
+    def invalidate(self):
+        """
+        Function Name:  invalidate
+        Description:    Drops this process's cached categories after a change has been committed
+        Args:           None
+        Returns:        None
+        Raises:         None
+        """
+        with self._lock:
+            self._categories = None
+
+    def stats(self):
+        """
+        Function Name:  stats
+        Description:    Reports the cache's counters
+        Args:           None
+        Returns:        dict: hits, misses, version checks, hit ratio and the cached version
+        Raises:         None
+        """
+        with self._lock:
+            reads = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'versionChecks': self.version_checks,
+                'hitRatio': round(self.hits / reads, 4) if reads else None,
+                'version': self._version,
+                'size': len(self._categories) if self._categories is not None else 0
+            }
+
+
+category_cache = CategoryCache()
+
+
+def categories_by_usage(user_id):
+    """
+    Function Name:  categories_by_usage
+    Description:    Orders the cached categories by the user's own usage, most used first,
+                    for the category dropdowns, reading the counts from category_stats
+                    rather than transactions
+    Args:           user_id (str): The user whose usage orders the categories
+    Returns:        list: CachedCategory tuples, most transactions first, then by category ID
+    Raises:         None
+    """
+    counts = dict(db.session.query(CategoryStat.catID, CategoryStat.tranCount).filter(CategoryStat.userID == user_id))
+    return sorted(category_cache.all(), key=lambda category: (-counts.get(category.catID, 0), category.catID))
+
+
+# Password Hashing
+class PasswordHashingBusy(Exception):
+    """
+    PasswordHashingBusy - Raised when the password hashing pool or the host's hash slots are
+    full, or a hash did not finish within HASH_TIMEOUT_SECONDS, so the request should be
+    turned away.
+    """
+
+
+def acquire_hash_slot():
+    """
+    Function Name:  acquire_hash_slot
+    Description:    Takes one of the host's HASH_SLOTS password hashing slots without
+                    waiting. Each slot is an exclusive flock on a file in HASH_SLOT_DIR, so
+                    the limit holds across every worker process on the host, and a slot is
+                    released by the operating system if its process dies.
+    Args:           None
+    Returns:        file: The locked slot file to pass to release_hash_slot, or None when the
+                    host-wide limit is disabled or unsupported
+    Raises:         PasswordHashingBusy: If every slot is taken
+    """
+    if fcntl is None or app.config['HASH_SLOTS'] <= 0:
+        return None
+    os.makedirs(app.config['HASH_SLOT_DIR'], exist_ok=True)
+    for slot in range(app.config['HASH_SLOTS']):
+        handle = open(os.path.join(app.config['HASH_SLOT_DIR'], f'slot-{slot}.lock'), 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle
+        except BlockingIOError:
+            handle.close()
+    raise PasswordHashingBusy()
+
+
+def release_hash_slot(handle):
+    """
+    Function Name:  release_hash_slot
+    Description:    Releases a slot taken by acquire_hash_slot
+    Args:           handle (file): The locked slot file, or None
+    Returns:        None
+    Raises:         None
+    """
+    if handle is not None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+class PasswordHasher:
+    """
+    PasswordHasher - Runs password hashing on a bounded thread pool, so hashing can occupy at
+    most HASH_WORKERS threads of a process and the rest stay free for other requests. At most
+    HASH_QUEUE_LIMIT hashes may be running or waiting in a process, and HASH_SLOTS across all
+    processes on the host; beyond either, requests are rejected straight away instead of
+    queueing behind the hashes. The requesting thread still waits for its own hash, so under
+    sync workers the host-wide slots are what keep most workers free during a login burst.
+
+    Attributes:
+        hashes (int): Passwords hashed.
+        verifications (int): Passwords checked against a stored hash.
+        rejected (int): Hashes refused because the pool was full or too slow.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._method_prefixes = {}
+        self.hashes = 0
+        self.verifications = 0
+        self.rejected = 0
+
+    def _run(self, function, *args):
+        """
+        Function Name:  _run
+        Description:    Runs a hashing function on the pool and waits for its result
+        Args:           function (callable): generate_password_hash or check_password_hash
+                        *args: The function's arguments
+        Returns:        The function's result
+        Raises:         PasswordHashingBusy: If the pool is full or the hash times out
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=app.config['HASH_WORKERS'],
+                    thread_name_prefix='password-hash'
+                )
+                self._slots = threading.BoundedSemaphore(app.config['HASH_QUEUE_LIMIT'])
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+        try:
+            host_slot = acquire_hash_slot()
+        except PasswordHashingBusy:
+            self._slots.release()
+            with self._lock:
+                self.rejected += 1
+            raise
+
+        def task():
+            # The slots are held until the hash finishes, even if this request stops
+            # waiting, and are released before the result is handed back
+            try:
+                return function(*args)
+            finally:
+                release_hash_slot(host_slot)
+                self._slots.release()
+
+        future = self._executor.submit(task)
+        try:
+            return future.result(timeout=app.config['HASH_TIMEOUT_SECONDS'])
+        except FutureTimeoutError:
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+
+    def hash(self, password):
+        """
+        Function Name:  hash
+        Description:    Hashes a password with the configured PASSWORD_HASH_METHOD
+        Args:           password (str): The plain text password
+        Returns:        str: The salted hash
+        Raises:         PasswordHashingBusy: If the pool is full or the hash times out
+        """
+        pwhash = self._run(generate_password_hash, password, app.config['PASSWORD_HASH_METHOD'])
+        with self._lock:
+            self.hashes += 1
+        return pwhash
+
+    def verify(self, pwhash, password):
+        """
+        Function Name:  verify
+        Description:    Checks a password against a stored hash
+        Args:           pwhash (str): The stored hash
+                        password (str): The plain text password
+        Returns:        bool: True if the password matches
+        Raises:         PasswordHashingBusy: If the pool is full or the hash times out
+        """
+        matches = self._run(check_password_hash, pwhash, password)
+        with self._lock:
+            self.verifications += 1
+        return matches
+
+    def needs_rehash(self, pwhash):
+        """
+        Function Name:  needs_rehash
+        Description:    Checks whether a stored hash was made with a different method or cost
+                        than the configured PASSWORD_HASH_METHOD
+        Args:           pwhash (str): The stored hash
+        Returns:        bool: True if the password should be hashed again
+        Raises:         PasswordHashingBusy: If the configured method's parameters have not
+                        been worked out yet and the pool is full
+        """
+        method = app.config['PASSWORD_HASH_METHOD']
+        if method not in self._method_prefixes:
+            # Werkzeug fills in the default cost of a bare method name such as 'scrypt'
+            self._method_prefixes[method] = self._run(generate_password_hash, '', method).split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._method_prefixes[method]
+
+    def stats(self):
+        """
+        Function Name:  stats
+        Description:    Reports the hasher's counters
+        Args:           None
+        Returns:        dict: hashes, verifications and rejected requests
+        Raises:         None
+        """
+        with self._lock:
+            return {'hashes': self.hashes, 'verifications': self.verifications, 'rejected': self.rejected}
+
+
+password_hasher = PasswordHasher()
+
+
+class LoginThrottle:
+    """
+    LoginThrottle - Counts login attempts per client address and failed logins per user ID
+    over a sliding window of LOGIN_THROTTLE_SECONDS, so a throttled request is refused
+    before any password is hashed. Counts are kept per process. Behind a reverse proxy the
+    client address comes from X-Forwarded-For, so BT_PROXY_COUNT must be set; otherwise
+    every client shares the proxy's address.
+
+    Attributes:
+        throttled (int): Attempts refused.
+    """
+    max_keys = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._attempts = {}
+        self.throttled = 0
+
+    def _recent(self, key, now):
+        window_start = now - app.config['LOGIN_THROTTLE_SECONDS']
+        times = [t for t in self._attempts.get(key, ()) if t > window_start]
+        if times:
+            self._attempts[key] = times
+        else:
+            self._attempts.pop(key, None)
+        return times
+
+    def _record(self, key, now):
+        if key not in self._attempts and len(self._attempts) >= self.max_keys:
+            # Forget keys with no attempts left in the window before growing further
+            for stale in list(self._attempts):
+                self._recent(stale, now)
+        self._attempts.setdefault(key, []).append(now)
+
+    def allow(self, address, user_id=None):
+        """
+        Function Name:  allow
+        Description:    Records an attempt from a client and checks both limits
+        Args:           address (str): The client's address
+                        user_id (str): The user ID being signed in to (optional)
+        Returns:        bool: True if the attempt may go ahead
+        Raises:         None
+        """
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._recent(('ip', address), now)
+            failures = self._recent(('user', user_id), now) if user_id else []
+            if (len(attempts) >= app.config['LOGIN_MAX_ATTEMPTS_PER_IP']
+                    or len(failures) >= app.config['LOGIN_MAX_FAILURES_PER_USER']):
+                self.throttled += 1
+                return False
+            self._record(('ip', address), now)
+            return True
+
+    def failed(self, user_id):
+        """
+        Function Name:  failed
+        Description:    Records a failed login for a user ID
+        Args:           user_id (str): The user ID that was tried
+        Returns:        None
+        Raises:         None
+        """
+        with self._lock:
+            self._record(('user', user_id), time.monotonic())
+
+    def succeeded(self, user_id):
+        """
+        Function Name:  succeeded
+        Description:    Clears a user's failed logins after a successful one
+        Args:           user_id (str): The user ID that signed in
+        Returns:        None
+        Raises:         None
+        """
+        with self._lock:
+            self._attempts.pop(('user', user_id), None)
+
+
+login_throttle = LoginThrottle()
+
+
+# User Cache
+class UserCache:
+    """
+    UserCache - A process-wide cache of signed-in users' rows for load_user, so a request
+    whose handler does no other database work makes no round trip at all. Rows are reused
+    for USER_CACHE_SECONDS; this process drops a row as soon as the user is changed, and
+    other processes see the change when their copy expires. The password hash is never
+    cached: reading it from a cached user loads it from the database.
+
+    Attributes:
+        max_size (int): Most users held; the oldest entry is dropped beyond this.
+        hits (int): Users served from the cache.
+        misses (int): Users loaded from the database.
+        invalidations (int): Users dropped because they changed.
+    """
+    max_size = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}
+        # Bumped by every invalidate(), so a row read before a change is not cached after it
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id):
+        """
+        Function Name:  get
+        Description:    Returns a user attached to the current session, from the cache while
+                        the cached row is fresh (no SQL is issued), otherwise from the database
+        Args:           user_id (str): The user's unique identifier
+        Returns:        User: The user, or None if no such user exists
+        Raises:         None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and now - entry[1] < app.config['USER_CACHE_SECONDS']:
+                self.hits += 1
+                values = entry[0]
+            else:
+                self.misses += 1
+                values = None
+            generation = self._generation
+
+        if values is None:
+            user = db.session.get(User, user_id)
+            if user is not None and app.config['USER_CACHE_SECONDS'] > 0:
+                values = {
+                    attr.key: getattr(user, attr.key)
+                    for attr in inspect(User).column_attrs if attr.key != 'userPwd'
+                }
+                with self._lock:
+                    if self._generation != generation:
+                        # A user changed while this row was being read; it may be stale
+                        return user
+                    self._users.pop(user_id, None)
+                    if len(self._users) >= self.max_size:
+                        self._users.pop(next(iter(self._users)))
+                    self._users[user_id] = (values, now)
+            return user
+
+        # Merging a detached copy without loading attaches it to the session with no SQL
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    def invalidate(self, user_id):
+        """
+        Function Name:  invalidate
+        Description:    Drops a user's cached row after a change to it has been committed
+        Args:           user_id (str): The user's unique identifier
+        Returns:        None
+        Raises:         None
+        """
+        with self._lock:
+            self._generation += 1
+            if self._users.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def stats(self):
+        """
+        Function Name:  stats
+        Description:    Reports the cache's counters
+        Args:           None
+        Returns:        dict: hits, misses, invalidations, hit ratio and number of cached users
+        Raises:         None
+        """
+        with self._lock:
+            reads = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hitRatio': round(self.hits / reads, 4) if reads else None,
+                'size': len(self._users)
+            }
+
+
+user_cache = UserCache()
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    """
+    Function Name:  load_user
+    Description:    Loads a user for Flask-Login, from the user cache when possible
+    Args:           user_id (str): The current user's unique identifier
+    Returns:        User: The User object if found, None otherwise
+    Raises:         None
+    """
+    return user_cache.get(user_id)
+
+
+# Routes
+@app.route('/')
+def index():
+    """
+    Function Name:  index
+    Description:    Renders the home page or redirects authenticated users to dashboard
+    Args:           None
+    Returns:        flask.Response: Rendered template or redirect response
+    Raises:         None
+    """
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    return render_template('index.html')
+
+
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    """
+    Function Name:  login
+    Description:    Handles user authentication and login
+    Args:           None (data received via request form)
+    Returns:        flask.Response: Rendered login template or redirect to dashboard
+    Raises:         None
+    """
+    if request.method == 'POST':
+        user_id = request.form.get('user_id')
+        password = request.form.get('password')
+        if not login_throttle.allow(request.remote_addr, user_id):
+            flash('Too many login attempts. Please wait a few minutes and try again.')
+            return render_template('login.html'), 429
+
+        user = db.session.get(User, user_id)
+        try:
+            valid = user is not None and user.check_password(password)
+            rehash = valid and password_hasher.needs_rehash(user.userPwd)
+        except PasswordHashingBusy:
+            flash('The server is busy. Please try again in a moment.')
+            return render_template('login.html'), 503
+
+        if valid:
+            login_throttle.succeeded(user_id)
+            if rehash:
+                # The configured hash cost changed since this password was stored; upgrading
+                # it is best effort and never blocks the login
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                    user_cache.invalidate(user_id)
+                except Exception:
+                    db.session.rollback()
+            login_user(user)
+            return redirect(url_for('dashboard'))
+        login_throttle.failed(user_id)
+        flash('Invalid user ID or password')
+    return render_template('login.html')
+
+
+@app.route('/reset_password', methods=['GET', 'POST'])
+def reset_request():
+    """
+    Function Name:  reset_request
+    Description:    Handles password reset requests and sends reset emails
+    Args:           None (data received via request form)
+    Returns:        flask.Response: Rendered template or redirect response
+    Raises:         None
+    """
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    
+    if request.method == 'POST':
+        email = request.form.get('email')
+        user = User.query.filter_by(email=email).first()
+        
+        if user:
+            token = get_reset_token(user.userID)
+            reset_url = url_for('reset_token', token=token, _external=True)
+            
+            # Ensure we have valid email configuration (the password may be empty for a
+            # relay that needs no login)
+            if not app.config['MAIL_USERNAME']:
+                app.logger.error("Email configuration is missing")
+                flash('Email service is not properly configured. Please contact support.', 'error')
+                return redirect(url_for('login'))
+            
+            body = f'''To reset your password, visit the following link:
+{reset_url}
+
+If you did not make this request, please ignore this email.
+'''
+            # The email is sent by the background mail sender; the page returns once it is queued
+            try:
+                queue_email('Password Reset Request', [user.email], body)
+                db.session.commit()
+                start_mail_sender()
+                flash('An email has been sent with instructions to reset your password.', 'info')
+                return redirect(url_for('login'))
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Failed to queue email: {str(e)}")
+                flash('Error sending email. Please try again later.', 'error')
+        else:
+            flash('No account found with that email address.', 'error')
+    
+    return render_template('reset_request.html')
+
+
+@app.route('/reset_password/<token>', methods=['GET', 'POST'])
+def reset_token(token):
+    """
+    Function Name:  reset_token
+    Description:    Handles password reset using a valid token
+    Args:           token (str): The password reset token
+    Returns:        flask.Response: Rendered template or redirect response
+    Raises:         None
+    """
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    
+    user_id = verify_reset_token(token)
+    if user_id is None:
+        flash('Invalid or expired reset token', 'error')
+        return redirect(url_for('reset_request'))
+    
+    if request.method == 'POST':
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        
+        if password != confirm_password:
+            flash('Passwords do not match.', 'error')
+            return render_template('reset_token.html')
+        
+        user = db.session.get(User, user_id)
+        try:
+            user.set_password(password)
+        except PasswordHashingBusy:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('reset_token.html'), 503
+        
+        try:
+            db.session.commit()
+            user_cache.invalidate(user_id)
+            flash('Your password has been updated! You can now log in.', 'success')
+            return redirect(url_for('login'))
+        except Exception as e:
+            db.session.rollback()
+            flash('Error updating password. Please try again.', 'error')
+    
+    return render_template('reset_token.html')
+
+
+@app.route('/register', methods=['GET', 'POST'])
+def register():
+    """
+    Function Name:  register
+    Description:    Handles new user registration
+    Args:           None (user data received via request form)
+    Returns:        flask.Response: Rendered registration form or redirect after registration
+    Raises:         None
+    """
+    if request.method == 'POST':
+        # Get form data
+        user_id = request.form.get('user_id')
+        password = request.form.get('password')
+        first_name = request.form.get('first_name')
+        last_name = request.form.get('last_name')
+        email = request.form.get('email')
+        if not login_throttle.allow(request.remote_addr):
+            flash('Too many attempts. Please wait a few minutes and try again.')
+            return render_template('register.html'), 429
+        try:
+            budget = to_money(request.form.get('budget'))
+        except ValueError:
+            flash('Please enter a valid budget amount.')
+            return redirect(url_for('register'))
+
+        # Check if user already exists
+        if db.session.get(User, user_id):
+            flash('User ID already exists')
+            return redirect(url_for('register'))
+        
+        # Check if email already exists
+        if User.query.filter_by(email=email).first():
+            flash('Email address already registered')
+            return redirect(url_for('register'))
+
+        # Create new user
+        new_user = User(
+            userID=user_id,
+            fName=first_name,
+            lName=last_name,
+            email=email,
+            userBudget=budget
+        )
+        try:
+            new_user.set_password(password)  # Hash the password before saving
+        except PasswordHashingBusy:
+            flash('The server is busy. Please try again in a moment.')
+            return render_template('register.html'), 503
+        
+        try:
+            db.session.add(new_user)
+            db.session.commit()
+            flash('Registration successful! Please login.')
+            return redirect(url_for('login'))
+        except Exception as e:
+            db.session.rollback()
+            flash('Error during registration. Please try again.')
+            return redirect(url_for('register'))
+    
+    return render_template('register.html')
+
+
+@app.route('/dashboard')
+@login_required
+@read_replica
+def dashboard():
+    """
+    Function Name:  dashboard
+    Description:    Renders the user dashboard with financial summary and visualizations
+    Args:           None
+    Returns:        flask.Response: Rendered dashboard template with financial data
+    Raises:         None
+    """
+    # Get current month's start and end dates
+    today = datetime.now()
+    month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    
+    # Get this month's totals from the rollup tables
+    monthly_totals = db.session.get(UserMonthlyTotal, (current_user.userID, month_start.date()))
+    total_expenses = monthly_totals.expenseTotal if monthly_totals else 0
+    total_revenue = monthly_totals.revenueTotal if monthly_totals else 0
+    
+    # Get recent transactions
+    recent_transactions = Transaction.query.filter(
+        Transaction.userID == current_user.userID
+    ).order_by(Transaction.tranDate.desc()).limit(5).all()
+    
+    # Get recent revenues
+    recent_revenues = Revenue.query.filter_by(userID=current_user.userID)\
+        .order_by(Revenue.revDate.desc())\
+        .limit(5)\
+        .all()
+    
+    # Get category and revenue type breakdowns from the rollup tables
+    category_totals = UserMonthlyCategoryTotal.query.filter(
+        UserMonthlyCategoryTotal.userID == current_user.userID,
+        UserMonthlyCategoryTotal.monthStart == month_start.date(),
+        UserMonthlyCategoryTotal.entryCount > 0
+    ).order_by(UserMonthlyCategoryTotal.categoryKey).all()
+    
+    # Prepare data for charts
+    expense_categories = [cat.categoryKey for cat in category_totals if cat.entryType == 'expense']
+    expense_amounts = [float(cat.total) for cat in category_totals if cat.entryType == 'expense']
+    revenue_categories = [cat.categoryKey for cat in category_totals if cat.entryType == 'revenue']
+    revenue_amounts = [float(cat.total) for cat in category_totals if cat.entryType == 'revenue']
+    
+    return render_template('dashboard.html',
+                         monthly_expenses=total_expenses,
+                         monthly_revenue=total_revenue,
+                         recent_transactions=recent_transactions,
+                         recent_revenues=recent_revenues,
+                         expense_categories=expense_categories,
+                         expense_amounts=expense_amounts,
+                         revenue_categories=revenue_categories,
+                         revenue_amounts=revenue_amounts)
+
+
+@app.route('/logout')
+@login_required
+def logout():
+    """
+    Function Name:  logout
+    Description:    Logs out the current user and redirects to the home page
+    Args:           None
+    Returns:        flask.Response: Redirect to home page
+    Raises:         None
+    """
+    logout_user()
+    return redirect(url_for('index'))
+
+
+# Transaction Management Routes
+@app.route('/transactions/add', methods=['GET', 'POST'])
+@login_required
+def add_transaction():
+    """
+    Function Name:  add_transaction
+    Description:    Handles creation of a new transaction
+    Args:           None (transaction data received via request form)
+    Returns:        flask.Response: Rendered form template or redirect after creation
+    Raises:         None
+    """
+    if request.method == 'POST':
+        # Get form data
+        date = datetime.strptime(request.form.get('date'), '%Y-%m-%d').date()
+        time = request.form.get('time')
+        category_id = request.form.get('category')
+        description = request.form.get('description')
+        try:
+            amount = to_money(request.form.get('amount'))
+        except ValueError:
+            flash('Please enter a valid amount.', 'error')
+            return redirect(url_for('add_transaction'))
+
+        # Create new transaction
+        transaction = Transaction(
+            tranID=new_record_id(),
+            userID=current_user.userID,
+            tranDate=date,
+            tranTime=time,
+            catID=category_id,
+            tranDescription=description,
+            tranAmount=amount
+        )
+        db.session.add(transaction)
+        apply_transaction_rollup(transaction)
+        
+        try:
+            db.session.commit()
+            flash('Transaction added successfully!', 'success')
+            return redirect(url_for('view_transactions'))
+        except Exception as e:
+            db.session.rollback()
+            flash('Error adding transaction. Please try again.', 'error')
+    
+    # Get all categories for the form, most used first
+    categories = categories_by_usage(current_user.userID)
+    
+    # Get current date and time for default values
+    today = datetime.now().strftime('%Y-%m-%d')
+    now = datetime.now().strftime('%H:%M')
+    
+    return render_template('add_transaction.html', 
+                         categories=categories,
+                         today=today,
+                         now=now)
+
+
+@app.route('/transactions')
+@login_required
+def view_transactions():
+    """
+    Function Name:  view_transactions
+    Description:    Displays a cursor-paginated list of user transactions with filtering options
+    Args:           None (filter and cursor parameters received via request args)
+    Returns:        flask.Response: Rendered template with transaction data
+    Raises:         None
+    """
+    # Get filter parameters
+    cursor = request.args.get('cursor')
+    per_page = 10
+    category = request.args.get('category')
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    search_term = request.args.get('search', '')
+
+    # Set default dates to current year if not provided
+    current_year = datetime.now().year
+    if not date_from:
+        date_from = f"{current_year}-01-01"
+    if not date_to:
+        date_to = f"{current_year}-12-31"
+
+    # Build query
+    query = Transaction.query.filter(
+        Transaction.userID == current_user.userID
+    )
+
+    # Apply filters
+    if category:
+        query = query.filter(Transaction.catID == category)
+    if date_from:
+        query = query.filter(Transaction.tranDate >= datetime.strptime(date_from, '%Y-%m-%d').date())
+    if date_to:
+        query = query.filter(Transaction.tranDate <= datetime.strptime(date_to, '%Y-%m-%d').date())
+    if search_term:
+        query = get_search_backend().filter_query(query, 'transactions', current_user.userID, search_term)
+
+    # Seek to the requested page, newest first
+    transactions, next_cursor, prev_cursor = keyset_paginate(
+        query,
+        [Transaction.tranDate, Transaction.tranTime, Transaction.tranID],
+        cursor,
+        per_page
+    )
+
+    # Page count is optional and served from a short-lived cache
+    total_count = None
+    total_pages = None
+    if app.config['SHOW_PAGE_COUNTS']:
+        total_count = cached_count(
+            ('transactions', current_user.userID, category, date_from, date_to, search_term),
+            query
+        )
+        total_pages = (total_count + per_page - 1) // per_page
+
+    # Get all categories for the filter, most used first
+    categories = categories_by_usage(current_user.userID)
+
+    return render_template('view_transactions.html',
+                         transactions=transactions,
+                         categories=categories,
+                         selected_category=category,
+                         date_from=date_from,
+                         date_to=date_to,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
+                         total_count=total_count,
+                         total_pages=total_pages,
+                         search_term=search_term)
+
+
+@app.route('/transactions/<tran_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_transaction(tran_id):
+    """
+    Function Name:  edit_transaction
+    Description:    Handles editing of an existing transaction
+    Args:           tran_id (str): Unique identifier of the transaction to edit
+    Returns:        flask.Response: Rendered edit form or redirect after update
+    Raises:         werkzeug.exceptions.NotFound: If transaction not found or not owned by user
+    """
+    # Get transaction and verify ownership
+    transaction = Transaction.query.filter(
+        Transaction.tranID == tran_id,
+        Transaction.userID == current_user.userID
+    ).first_or_404()
+
+    if request.method == 'POST':
+        try:
+            amount = to_money(request.form.get('amount'))
+        except ValueError:
+            flash('Please enter a valid amount.', 'error')
+            return redirect(url_for('edit_transaction', tran_id=tran_id))
+
+        # Take the old values out of the rollups before they change
+        apply_transaction_rollup(transaction, -1)
+
+        # Update transaction
+        transaction.tranDate = datetime.strptime(request.form.get('date'), '%Y-%m-%d').date()
+        transaction.tranTime = request.form.get('time')
+        transaction.catID = request.form.get('category')
+        transaction.tranDescription = request.form.get('description')
+        transaction.tranAmount = amount
+        apply_transaction_rollup(transaction)
+
+        try:
+            db.session.commit()
+            flash('Transaction updated successfully!', 'success')
+            return redirect(url_for('view_transactions'))
+        except Exception as e:
+            db.session.rollback()
+            flash('Error updating transaction. Please try again.', 'error')
+
+    # Get all categories for the form, most used first
+    categories = categories_by_usage(current_user.userID)
+    return render_template('edit_transaction.html', transaction=transaction, categories=categories)
+
+
+@app.route('/transactions/<tran_id>/delete', methods=['POST'])
+@login_required
+def delete_transaction(tran_id):
+    """
+    Function Name:  delete_transaction
+    Description:    Handles deletion of an existing transaction
     Args:           tran_id (str): Unique identifier of the transaction to delete
     Returns:        flask.Response: JSON response indicating success or failure
-    Raises:         werkzeug.exceptions.NotFound: If transaction not found or not owned by user
+    Raises:         werkzeug.exceptions.NotFound: If transaction not found or not owned by user
+    """
+    # Get transaction and verify ownership
+    transaction = Transaction.query.filter(
+        Transaction.tranID == tran_id,
+        Transaction.userID == current_user.userID
+    ).first_or_404()
+
+    try:
+        # Delete any user-transaction associations first
+        UserTransaction.query.filter_by(tranID=tran_id).delete()
+        
+        # Delete transaction
+        apply_transaction_rollup(transaction, -1)
+        db.session.delete(transaction)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Transaction deleted successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Error deleting transaction'}), 500
+
+
+@app.route('/search')
+@login_required
+def search():
+    """
+    Function Name:  search
+    Description:    Searches the user's transaction and revenue descriptions, matching each
+                    word as a prefix and returning the best matches first
+    Args:           None (search term received via the 'q' request arg)
+    Returns:        flask.Response: JSON response with the ranked transactions and revenues
+    Raises:         None
+    """
+    term = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    if not term:
+        return jsonify({'transactions': [], 'revenues': []})
+
+    backend = get_search_backend()
+    transactions = backend.ranked('transactions', current_user.userID, term, limit)
+    revenues = backend.ranked('revenues', current_user.userID, term, limit)
+
+    return jsonify({
+        'transactions': [{
+            'id': t.tranID,
+            'date': t.tranDate.strftime('%Y-%m-%d'),
+            'time': t.tranTime,
+            'category': t.catID,
+            'description': t.tranDescription,
+            'amount': t.tranAmount
+        } for t in transactions],
+        'revenues': [{
+            'id': r.revID,
+            'date': r.revDate.strftime('%Y-%m-%d'),
+            'type': r.revType,
+            'description': r.revDescription,
+            'amount': r.revAmount
+        } for r in revenues]
+    })
+
+
+@app.route('/transactions/import', methods=['POST'])
+@login_required
+def import_transactions_upload():
+    """
+    Function Name:  import_transactions_upload
+    Description:    Imports transactions from an uploaded bank CSV or OFX file
+    Args:           None (file, format, profile, mapping and category received via request form)
+    Returns:        flask.Response: JSON import summary for API clients, otherwise a redirect
+                    to the transaction list with the summary flashed
+    Raises:         None
+    """
+    wants_json = request.accept_mimetypes.best == 'application/json'
+    upload = request.files.get('file')
+
+    try:
+        if not upload or not upload.filename:
+            raise ValueError('Please choose a file to import.')
+        file_format = request.form.get('format') or import_format_for(upload.filename)
+        profile = load_import_profile(request.form.get('profile'), request.form.get('mapping'))
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        summary = import_transactions(
+            current_user.userID,
+            read_import_rows(stream, file_format, profile),
+            profile,
+            default_category=request.form.get('category') or None
+        )
+    except ValueError as e:
+        if wants_json:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        flash(str(e), 'error')
+        return redirect(url_for('view_transactions'))
+
+    if wants_json:
+        return jsonify({'success': summary['failed'] is None, **summary})
+    if summary['failed']:
+        flash(f"Import stopped after {summary['imported']} transactions: {summary['failed']}", 'error')
+    else:
+        flash(f"Imported {summary['imported']} transactions ({summary['skipped']} rows skipped).", 'success')
+    return redirect(url_for('view_transactions'))
+
+
+# Import Helpers
+IMPORT_PROFILES = {
+    # The CSV written by export_report, so exports can be imported again
+    'budgettracker': {
+        'date': 'Date', 'date_format': '%d-%m-%Y', 'time': 'Time', 'category': 'Category',
+        'description': 'Description', 'amount': 'Amount', 'expenses': 'positive'
+    },
+    # A single signed amount column where debits are negative
+    'generic': {
+        'date': 'Date', 'date_format': '%Y-%m-%d', 'description': 'Description',
+        'amount': 'Amount', 'expenses': 'negative'
+    },
+    # Separate debit and credit columns
+    'debit_credit': {
+        'date': 'Date', 'date_format': '%d/%m/%Y', 'description': 'Description',
+        'debit': 'Debit', 'credit': 'Credit'
+    }
+}
+
+
+def load_import_profile(name=None, mapping=None):
+    """
+    Function Name:  load_import_profile
+    Description:    Builds the column-mapping profile for an import from a named profile and
+                    optional overrides. Profile keys: date, date_format, time, description,
+                    amount or debit/credit, category, expenses ('negative' when debits are
+                    negative amounts, 'positive' when every row is an expense) and
+                    category_rules (a list of [description text, category ID] pairs).
+    Args:           name (str): One of IMPORT_PROFILES, 'generic' when not given
+                    mapping (str or dict): JSON object of keys overriding the named profile
+    Returns:        dict: The profile
+    Raises:         ValueError: If the profile name or mapping is invalid
+    """
+    if (name or 'generic') not in IMPORT_PROFILES:
+        raise ValueError(f"Unknown import profile '{name}'. Choose one of: {', '.join(IMPORT_PROFILES)}.")
+    profile = dict(IMPORT_PROFILES[name or 'generic'])
+    if mapping:
+        try:
+            overrides = json.loads(mapping) if isinstance(mapping, str) else mapping
+        except json.JSONDecodeError:
+            raise ValueError('The column mapping must be a JSON object.')
+        if not isinstance(overrides, dict):
+            raise ValueError('The column mapping must be a JSON object.')
+        profile.update(overrides)
+    if not profile.get('amount') and not profile.get('debit'):
+        raise ValueError('The column mapping needs an amount or debit column.')
+    return profile
+
+
+def import_format_for(filename):
+    """
+    Function Name:  import_format_for
+    Description:    Picks the import format from a file's extension
+    Args:           filename (str): Name of the file being imported
+    Returns:        str: 'ofx' for .ofx and .qfx files, otherwise 'csv'
+    Raises:         None
+    """
+    return 'ofx' if filename.lower().endswith(('.ofx', '.qfx')) else 'csv'
+
+
+def parse_import_amount(value):
+    """
+    Function Name:  parse_import_amount
+    Description:    Parses a bank statement amount such as '-1,234.50', '$12.00' or '(5.00)'
+    Args:           value (str): The amount as written in the file
+    Returns:        Decimal: The amount, or None if the value is blank
+    Raises:         ValueError: If the value is not a number
+    """
+    value = (value or '').strip().replace(',', '').replace('$', '')
+    if not value:
+        return None
+    if value.startswith('(') and value.endswith(')'):
+        value = '-' + value[1:-1]
+    return to_money(value)
+
+
+def read_import_rows(stream, file_format, profile):
+    """
+    Function Name:  read_import_rows
+    Description:    Streams the rows of an import file, one at a time, as raw dicts with
+                    date, time, description, amount and category keys
+    Args:           stream (io.TextIOBase): The file being imported
+                    file_format (str): 'csv' or 'ofx'
+                    profile (dict): Profile from load_import_profile (used for CSV)
+    Returns:        generator: (line number, row dict) tuples; expense amounts are positive
+                    and non-expense rows have an amount of None
+    Raises:         ValueError: If the format is unknown or a mapped CSV column is missing
+    """
+    if file_format == 'ofx':
+        return read_ofx_rows(stream)
+    if file_format == 'csv':
+        return read_csv_rows(stream, profile)
+    raise ValueError(f"Unknown import format '{file_format}'. Use csv or ofx.")
+
+
+def read_csv_rows(stream, profile):
+    """
+    Function Name:  read_csv_rows
+    Description:    Streams a bank CSV through its column-mapping profile
+    Args:           stream (io.TextIOBase): The CSV file
+                    profile (dict): Profile from load_import_profile
+    Returns:        generator: (line number, row dict) tuples
+    Raises:         ValueError: If a mapped column is missing from the header
+    """
+    reader = csv.DictReader(stream)
+    columns = [profile.get(key) for key in ('date', 'time', 'description', 'amount', 'debit', 'credit', 'category')]
+    missing = [column for column in columns if column and column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"The file has no {', '.join(missing)} column. Check the import profile.")
+
+    for record in reader:
+        try:
+            if profile.get('debit'):
+                amount = parse_import_amount(record.get(profile['debit']))
+                amount = abs(amount) if amount else None
+            else:
+                amount = parse_import_amount(record.get(profile['amount']))
+                if amount is not None and profile.get('expenses', 'negative') == 'negative':
+                    amount = -amount if amount < 0 else None
+            yield reader.line_num, {
+                'date': datetime.strptime(record[profile['date']].strip(), profile.get('date_format', '%Y-%m-%d')).date(),
+                'time': (record.get(profile.get('time') or '', '') or '00:00').strip()[:5],
+                'description': (record.get(profile['description']) or '').strip(),
+                'amount': amount,
+                'category': (record.get(profile.get('category') or '') or '').strip() or None
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            yield reader.line_num, ValueError(f'Could not read row: {str(e)}')
+
+
+def read_ofx_rows(stream):
+    """
+    Function Name:  read_ofx_rows
+    Description:    Streams the STMTTRN records of an OFX (or QFX) statement. Both the SGML
+                    form without closing tags and the XML form are read tag by tag, so the
+                    whole statement is never held in memory.
+    Args:           stream (io.TextIOBase): The OFX file
+    Returns:        generator: (line number, row dict) tuples
+    Raises:         None
+    """
+    record = None
+    line_num = 0
+    tag_pattern = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+    for line_num, line in enumerate(stream, start=1):
+        for closing, tag, value in tag_pattern.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and record is not None:
+                    yield line_num, ofx_record_to_row(record)
+                    record = None
+                elif not closing:
+                    record = {}
+            elif record is not None and not closing and value.strip():
+                record[tag] = value.strip()
+
+
+def ofx_record_to_row(record):
+    """
+    Function Name:  ofx_record_to_row
+    Description:    Converts the fields of one OFX STMTTRN record to an import row
+    Args:           record (dict): The record's tags and values
+    Returns:        dict or ValueError: The row, or the error that made it unreadable
+    Raises:         None
+    """
+    try:
+        posted = record['DTPOSTED']
+        amount = parse_import_amount(record.get('TRNAMT'))
+        return {
+            'date': datetime.strptime(posted[:8], '%Y%m%d').date(),
+            'time': f'{posted[8:10]}:{posted[10:12]}' if len(posted) >= 12 else '00:00',
+            'description': record.get('NAME') or record.get('MEMO') or '',
+            'amount': -amount if amount is not None and amount < 0 else None,
+            'category': None
+        }
+    except (ValueError, KeyError) as e:
+        return ValueError(f'Could not read transaction: {str(e)}')
+
+
+def import_transactions(user_id, rows, profile, default_category=None, batch_size=None, progress=None):
+    """
+    Function Name:  import_transactions
+    Description:    Imports rows from read_import_rows as the user's transactions. Rows are
+                    validated and mapped to categories as they stream in, then inserted with
+                    one executemany INSERT per batch. Each batch commits on its own together
+                    with its rollup and category usage changes, applied once per month and
+                    category rather than once per row.
+    Args:           user_id (str): The owner of the imported transactions
+                    rows (iterable): (line number, row dict or ValueError) tuples
+                    profile (dict): Profile from load_import_profile (for category_rules)
+                    default_category (str): Category ID for rows no category maps to (optional)
+                    batch_size (int): Rows per batch, IMPORT_BATCH_SIZE when not given
+                    progress (callable): Called with the summary after each batch (optional)
+    Returns:        dict: imported, skipped and read row counts, the first row errors and
+                    failed, the error that stopped the import or None
+    Raises:         ValueError: If the default category does not exist
+    """
+    batch_size = batch_size or app.config['IMPORT_BATCH_SIZE']
+    categories = category_cache.all()
+    category_ids = {category.catID for category in categories}
+    category_names = {category.catName.lower(): category.catID for category in categories}
+    rules = [(content.lower(), cat_id) for content, cat_id in profile.get('category_rules', [])]
+    if default_category and default_category not in category_ids:
+        raise ValueError(f'Category {default_category} does not exist.')
+
+    summary = {'read': 0, 'imported': 0, 'skipped': 0, 'errors': [], 'failed': None}
+
+    def skip(line_num, message):
+        summary['skipped'] += 1
+        if len(summary['errors']) < 100:
+            summary['errors'].append({'line': line_num, 'message': message})
+
+    def flush(batch):
+        try:
+            db.session.execute(insert(Transaction), batch)
+            apply_batch_rollups(user_id, added=batch)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            summary['failed'] = f'Database error while saving a batch: {str(e)[:200]}'
+            return False
+        summary['imported'] += len(batch)
+        if progress:
+            progress(summary)
+        return True
+
+    batch = []
+    for line_num, row in rows:
+        summary['read'] += 1
+        if isinstance(row, ValueError):
+            skip(line_num, str(row))
+            continue
+        if row['amount'] is None:
+            # Credits are income, which is recorded as revenue rather than transactions
+            summary['skipped'] += 1
+            continue
+
+        cat_id = row['category']
+        if cat_id and cat_id not in category_ids:
+            cat_id = category_names.get(cat_id.lower())
+        if not cat_id:
+            description = row['description'].lower()
+            cat_id = next((rule_cat for content, rule_cat in rules if content in description), default_category)
+        if cat_id not in category_ids:
+            skip(line_num, 'No category matches this row; choose a default category.')
+            continue
+        try:
+            tran_time = normalize_time(row['time'])
+            minute = minute_of_day(tran_time)
+        except ValueError:
+            skip(line_num, f"Invalid time '{row['time']}'.")
+            continue
+
+        batch.append({
+            'tranID': new_record_id(),
+            'userID': user_id,
+            'tranDate': row['date'],
+            'tranTime': tran_time,
+            'tranMinute': minute,
+            'catID': cat_id,
+            'tranDescription': row['description'][:50],
+            'tranAmount': row['amount'],
+            'isExpense': True
+        })
+        if len(batch) >= batch_size:
+            if not flush(batch):
+                return summary
+            batch = []
+
+    if batch:
+        flush(batch)
+    return summary
+
+
+# Transaction API Routes
+BATCH_TRANSACTION_FIELDS = ('date', 'time', 'category', 'description', 'amount')
+
+
+@app.route('/api/v1/transactions:batch', methods=['POST'])
+@login_required
+def batch_transactions():
+    """
+    Function Name:  batch_transactions
+    Description:    Applies a list of transaction create, update and delete operations in one
+                    database transaction. Every operation is validated first; if any is
+                    invalid nothing is applied. The operations are then written with one
+                    INSERT, one UPDATE (executemany) and one DELETE per table, and the
+                    rollups and category counters are adjusted once per month and category.
+    Args:           None (JSON body: {"operations": [{"op": "create", "data": {...}},
+                    {"op": "update", "id": "...", "data": {...}}, {"op": "delete", "id": "..."}]},
+                    where data holds date, time, category, description and amount; updates
+                    may send only the fields that change)
+    Returns:        flask.Response: JSON with a result per operation, in request order
+    Raises:         None
+    """
+    payload = request.get_json(silent=True)
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'message': 'Send a JSON object with a non-empty "operations" list.'}), 400
+    if len(operations) > app.config['API_BATCH_MAX_OPERATIONS']:
+        return jsonify({
+            'success': False,
+            'message': f"A batch can hold at most {app.config['API_BATCH_MAX_OPERATIONS']} operations."
+        }), 413
+
+    # Load every row being updated or deleted with one query
+    target_ids = {op.get('id') for op in operations if isinstance(op, dict) and isinstance(op.get('id'), str)}
+    existing = {}
+    if target_ids:
+        rows = db.session.execute(
+            select(Transaction.tranID, Transaction.tranDate, Transaction.tranTime, Transaction.catID,
+                   Transaction.tranDescription, Transaction.tranAmount)
+            .where(Transaction.userID == current_user.userID, Transaction.tranID.in_(target_ids))
+        ).all()
+        existing = {row.tranID: row._asdict() for row in rows}
+
+    category_ids = {category.catID for category in category_cache.all()}
+    results = []
+    creates, updates, deletes = [], [], []
+    seen_ids = set()
+
+    for index, op in enumerate(operations):
+        result = {'index': index}
+        results.append(result)
+        if not isinstance(op, dict) or op.get('op') not in ('create', 'update', 'delete'):
+            result['error'] = 'op must be create, update or delete.'
+            continue
+        result['op'] = op['op']
+
+        if op['op'] != 'create':
+            tran_id = op.get('id')
+            if not isinstance(tran_id, str):
+                result['error'] = 'id must be a string.'
+                continue
+            result['id'] = tran_id
+            if tran_id not in existing:
+                result['error'] = 'Transaction not found.'
+                continue
+            if tran_id in seen_ids:
+                result['error'] = 'A transaction can appear in only one operation per batch.'
+                continue
+            seen_ids.add(tran_id)
+            if op['op'] == 'delete':
+                deletes.append(existing[tran_id])
+                continue
+
+        data = op.get('data')
+        if not isinstance(data, dict):
+            result['error'] = 'data must be an object.'
+            continue
+        values, error = parse_batch_transaction(data, category_ids, partial=op['op'] == 'update')
+        if error:
+            result['error'] = error
+            continue
+
+        if op['op'] == 'create':
+            values.update(tranID=new_record_id(), userID=current_user.userID, isExpense=True)
+            result['id'] = values['tranID']
+            creates.append(values)
+        else:
+            old = existing[op['id']]
+            new = {**old, **values}
+            new['tranMinute'] = minute_of_day(new['tranTime'])
+            updates.append((old, new))
+
+    if any('error' in result for result in results):
+        return jsonify({
+            'success': False,
+            'message': 'No changes were applied because some operations are invalid.',
+            'results': results
+        }), 422
+
+    try:
+        if creates:
+            db.session.execute(insert(Transaction), creates)
+        if updates:
+            db.session.execute(update(Transaction), [new for old, new in updates])
+        if deletes:
+            delete_ids = [row['tranID'] for row in deletes]
+            db.session.execute(delete(UserTransaction).where(UserTransaction.tranID.in_(delete_ids)))
+            db.session.execute(delete(Transaction).where(
+                Transaction.userID == current_user.userID,
+                Transaction.tranID.in_(delete_ids)
+            ))
+        apply_batch_rollups(
+            current_user.userID,
+            added=creates + [new for old, new in updates],
+            removed=deletes + [old for old, new in updates]
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Error applying the batch. No changes were made.'}), 500
+
+    for result in results:
+        result['status'] = {'create': 'created', 'update': 'updated', 'delete': 'deleted'}[result['op']]
+    return jsonify({'success': True, 'message': f'{len(results)} operations applied.', 'results': results})
+
+
+def parse_batch_transaction(data, category_ids, partial=False):
+    """
+    Function Name:  parse_batch_transaction
+    Description:    Validates the fields of a batch create or update operation
+    Args:           data (dict): date (YYYY-MM-DD), time (HH:MM), category, description and amount
+                    category_ids (set): IDs of the existing categories
+                    partial (bool): True for updates, where missing fields keep their value
+    Returns:        tuple: (Transaction column values, None) or (None, error message)
+    Raises:         None
+    """
+    unknown = set(data) - set(BATCH_TRANSACTION_FIELDS)
+    if unknown:
+        return None, f"Unknown fields: {', '.join(sorted(unknown))}."
+    if not partial:
+        missing = [field for field in BATCH_TRANSACTION_FIELDS if field not in data]
+        if missing:
+            return None, f"Missing fields: {', '.join(missing)}."
+
+    values = {}
+    try:
+        if 'date' in data:
+            values['tranDate'] = datetime.strptime(str(data['date']), '%Y-%m-%d').date()
+    except ValueError:
+        return None, 'date must be YYYY-MM-DD.'
+    if 'time' in data:
+        try:
+            values['tranTime'] = normalize_time(str(data['time']))
+        except ValueError:
+            return None, 'time must be HH:MM.'
+        values['tranMinute'] = minute_of_day(values['tranTime'])
+    if 'category' in data:
+        if str(data['category']) not in category_ids:
+            return None, f"Category {data['category']} does not exist."
+        values['catID'] = str(data['category'])
+    if 'description' in data:
+        if not isinstance(data['description'], str) or len(data['description']) > 50:
+            return None, 'description must be text of at most 50 characters.'
+        values['tranDescription'] = data['description']
+    if 'amount' in data:
+        if isinstance(data['amount'], bool) or not isinstance(data['amount'], (int, float, str)):
+            return None, 'amount must be a number or a decimal string.'
+        try:
+            values['tranAmount'] = to_money(data['amount'])
+        except ValueError as e:
+            return None, str(e)
+    return values, None
+
+
+def apply_batch_rollups(user_id, added=(), removed=()):
+    """
+    Function Name:  apply_batch_rollups
+    Description:    Adjusts the monthly rollups and category usage counters for a set of
+                    transactions written with bulk statements, once per month and category.
+                    Must run after the statements so removed rows no longer count towards a
+                    category's latest date.
+    Args:           user_id (str): The owner of the transactions
+                    added (list): Column values of the transactions added (or new values of updates)
+                    removed (list): Column values of the transactions removed (or old values of updates)
+    Returns:        None
+    Raises:         None
+    """
+    rollups = defaultdict(lambda: [0, 0])
+    usage = defaultdict(lambda: [0, 0, None])
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            rollup = rollups[(row['tranDate'].replace(day=1), row['catID'])]
+            rollup[0] += sign * row['tranAmount']
+            rollup[1] += sign
+            stats = usage[row['catID']]
+            stats[0] += sign
+            stats[1] += sign * row['tranAmount']
+            if sign > 0:
+                stats[2] = max(stats[2] or row['tranDate'], row['tranDate'])
+
+    for (month_start, cat_id), (amount, count) in rollups.items():
+        _apply_rollup(user_id, month_start, 'expense', cat_id, amount, count)
+
+    # A category that lost transactions takes its latest date from the rows it has left
+    removed_categories = {row['catID'] for row in removed}
+    last_used = {}
+    if removed_categories:
+        last_used = dict(db.session.execute(
+            select(Transaction.catID, func.max(Transaction.tranDate))
+            .where(Transaction.userID == user_id, Transaction.catID.in_(removed_categories))
+            .group_by(Transaction.catID)
+        ).all())
+    for cat_id, (count, amount, added_last_used) in usage.items():
+        if cat_id in removed_categories:
+            apply_category_stats(user_id, cat_id, count, amount, last_used.get(cat_id), replace_last_used=True)
+        else:
+            apply_category_stats(user_id, cat_id, count, amount, added_last_used)
+
+
+# Category Management Routes
+@app.route('/categories')
+@login_required
+def view_categories():
+    """
+    Function Name:  view_categories
+    Description:    Displays a list of all expense categories with the user's usage of each
+    Args:           None
+    Returns:        flask.Response: Rendered template with category data
+    Raises:         None
+    """
+    categories = category_cache.all()
+    stats = {stat.catID: stat for stat in CategoryStat.query.filter_by(userID=current_user.userID)}
+    return render_template('categories.html', categories=categories, stats=stats)
+
+
+@app.route('/categories/add', methods=['POST'])
+def add_category():
+    """
+    Function Name:  add_category
+    Description:    Handles creation of a new expense category
+    Args:           None (category data received via request form)
+    Returns:        flask.Response: JSON response indicating success or failure
+    Raises:         None
+    """
+    try:
+        category_id = request.form.get('categoryId')
+        category_name = request.form.get('categoryName')
+
+        # Validate category ID format
+        if not category_id or not category_id.isdigit() or len(category_id) != 4:
+            return jsonify({
+                'success': False,
+                'message': 'Category ID must be a 4-digit number'
+            }), 400
+
+        # Check if category ID already exists
+        existing_category = Category.query.filter_by(catID=category_id).first()
+        if existing_category:
+            return jsonify({
+                'success': False,
+                'message': f'Category ID {category_id} already exists. Please use a different ID.'
+            }), 400
+
+        # Create new category
+        new_category = Category(catID=category_id, catName=category_name)
+        db.session.add(new_category)
+        bump_cache_version(CategoryCache.name)
+        db.session.commit()
+        category_cache.invalidate()
+
+        return jsonify({
+            'success': True,
+            'message': 'Category added successfully',
+            'categoryId': category_id,
+            'categoryName': category_name
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        error_message = str(e)
+        if 'Duplicate entry' in error_message:
+            return jsonify({
+                'success': False,
+                'message': f'Category ID {category_id} already exists. Please use a different ID.'
+            }), 400
+        return jsonify({
+            'success': False,
+            'message': 'An error occurred while adding the category. Please try again.'
+        }), 500
+
+
+@app.route('/categories/<cat_id>/edit', methods=['POST'])
+@login_required
+def edit_category(cat_id):
+    """
+    Function Name:  edit_category
+    Description:    Handles updating of an existing expense category
+    Args:           cat_id (str): Unique identifier of the category to edit
+    Returns:        flask.Response: JSON response indicating success or failure
+    Raises:         None
+    """
+    category = db.session.get(Category, cat_id)
+    if not category:
+        return jsonify({'success': False, 'message': 'Category not found'}), 404
+        
+    category_name = request.form.get('categoryName')
+
+    try:
+        category.catName = category_name
+        bump_cache_version(CategoryCache.name)
+        db.session.commit()
+        category_cache.invalidate()
+        return jsonify({'success': True, 'message': 'Category updated successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Error updating category'}), 500
+
+
+@app.route('/categories/<cat_id>/delete', methods=['POST'])
+@login_required
+def delete_category(cat_id):
+    """
+    Function Name:  delete_category
+    Description:    Handles deletion of an existing expense category
+    Args:           cat_id (str): Unique identifier of the category to delete
+    Returns:        flask.Response: JSON response indicating success or failure
+    Raises:         None
+    """
+    category = db.session.get(Category, cat_id)
+    if not category:
+        return jsonify({'success': False, 'message': 'Category not found'}), 404
+
+    # Check if category is being used in any user's transactions
+    in_use = CategoryStat.query.filter(CategoryStat.catID == cat_id, CategoryStat.tranCount > 0).first()
+    if in_use:
+        return jsonify({
+            'success': False, 
+            'message': 'Cannot delete category that is being used in transactions'
+        }), 400
+
+    try:
+        db.session.delete(category)
+        bump_cache_version(CategoryCache.name)
+        db.session.commit()
+        category_cache.invalidate()
+        return jsonify({'success': True, 'message': 'Category deleted successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Error deleting category'}), 500
+
+
+# Report Routes
+@app.route('/reports')
+@login_required
+@read_replica
+def reports():
+    """
+    Function Name:  reports
+    Description:    Renders the main reports page with financial data visualizations
+    Args:           None (start_date, end_date and an optional trend bucket of day, week,
+                    month or year received via request args)
+    Returns:        flask.Response: Rendered template with report data
+    Raises:         None
+    """
+    # Get date range from query parameters or use default (last 30 days)
+    end_date = datetime.now()
+    start_date = request.args.get('start_date', (end_date - timedelta(days=30)).strftime('%Y-%m-%d'))
+    end_date = request.args.get('end_date', end_date.strftime('%Y-%m-%d'))
+    
+    # Convert string dates to datetime objects
+    start_date = datetime.strptime(start_date, '%Y-%m-%d')
+    end_date = datetime.strptime(end_date, '%Y-%m-%d')
+    
+    # Calculate totals for the date range
+    total_expenses = expense_summary([
+        Transaction.userID == current_user.userID,
+        Transaction.tranDate >= start_date,
+        Transaction.tranDate <= end_date
+    ]).total
+    total_revenue = db.session.query(func.coalesce(func.sum(Revenue.revAmount), 0)).filter(
+        Revenue.userID == current_user.userID,
+        Revenue.revDate >= start_date,
+        Revenue.revDate <= end_date
+    ).scalar()
+    
+    # Get expense categories breakdown
+    expense_categories_raw = db.session.query(
+        Category.catName.label('name'),
+        func.sum(Transaction.tranAmount).label('amount')
+    ).join(Transaction, Category.catID == Transaction.catID)\
+    .filter(
+        Transaction.userID == current_user.userID,
+        Transaction.tranDate >= start_date,
+        Transaction.tranDate <= end_date
+    ).group_by(Category.catName).all()
+    
+    # Convert expense categories to list of dictionaries with percentages
+    expense_categories = []
+    for cat in expense_categories_raw:
+        expense_categories.append({
+            'name': cat.name,
+            'amount': cat.amount,
+            'percentage': (cat.amount / total_expenses * 100) if total_expenses > 0 else 0
+        })
+    
+    # Get revenue categories breakdown
+    revenue_categories_raw = db.session.query(
+        Revenue.revType.label('name'),
+        func.sum(Revenue.revAmount).label('amount')
+    ).filter(
+        Revenue.userID == current_user.userID,
+        Revenue.revDate >= start_date,
+        Revenue.revDate <= end_date
+    ).group_by(Revenue.revType).all()
+    
+    # Convert revenue categories to list of dictionaries with percentages
+    revenue_categories = []
+    for cat in revenue_categories_raw:
+        revenue_categories.append({
+            'name': cat.name,
+            'amount': cat.amount,
+            'percentage': (cat.amount / total_revenue * 100) if total_revenue > 0 else 0
+        })
+    
+    # Get trend data, bucketed so long ranges stay within TREND_MAX_POINTS
+    bucket = choose_trend_bucket(start_date.date(), end_date.date(), request.args.get('bucket'))
+    expense_trend = trend_series(
+        Transaction.tranDate,
+        Transaction.tranAmount,
+        [
+            Transaction.userID == current_user.userID,
+            Transaction.tranDate >= start_date,
+            Transaction.tranDate <= end_date
+        ],
+        start_date.date(),
+        end_date.date(),
+        bucket
+    )
+    revenue_trend = trend_series(
+        Revenue.revDate,
+        Revenue.revAmount,
+        [
+            Revenue.userID == current_user.userID,
+            Revenue.revDate >= start_date,
+            Revenue.revDate <= end_date
+        ],
+        start_date.date(),
+        end_date.date(),
+        bucket
+    )
+    
+    # Prepare category data for charts
+    category_labels = [cat['name'] for cat in expense_categories] + [cat['name'] for cat in revenue_categories]
+    category_data = [float(cat['amount']) for cat in expense_categories + revenue_categories]
+    
+    return render_template('reports.html',
+                         start_date=start_date.strftime('%Y-%m-%d'),
+                         end_date=end_date.strftime('%Y-%m-%d'),
+                         total_expenses=total_expenses,
+                         total_revenue=total_revenue,
+                         expense_categories=expense_categories,
+                         revenue_categories=revenue_categories,
+                         trend_bucket=bucket,
+                         trend_labels=trend_labels(start_date.date(), end_date.date(), bucket),
+                         expense_trend=expense_trend,
+                         revenue_trend=revenue_trend,
+                         category_labels=category_labels,
+                         category_data=category_data)
+
+
+@app.route('/reports/category')
+@login_required
+@read_replica
+def category_report():
+    """
+    Function Name:  category_report
+    Description:    Generates and displays a report for a specific expense category
+    Args:           None (category, optional trend bucket and listing cursor received via request args)
+    Returns:        flask.Response: Rendered template with category report data
+    Raises:         None
+    """
+    category_id = request.args.get('category')
+    
+    if not category_id:
+        flash('Please select a category.', 'error')
+        return redirect(url_for('reports'))
+    
+    category = next((c for c in category_cache.all() if c.catID == category_id), None)
+    if category is None:
+        abort(404)
+    criteria = [
+        Transaction.userID == current_user.userID,
+        Transaction.catID == category_id
+    ]
+    
+    # Totals and the trend come from aggregate queries over the whole category
+    summary = expense_summary(criteria)
+    category_avg = (summary.total / summary.count).quantize(CENT) if summary.count > 0 else 0
+    
+    trend_labels_list = []
+    trend_data = []
+    if summary.count > 0:
+        bucket = choose_trend_bucket(summary.first_date, summary.last_date, request.args.get('bucket'))
+        trend_labels_list = trend_labels(summary.first_date, summary.last_date, bucket)
+        trend_data = trend_series(
+            Transaction.tranDate, Transaction.tranAmount, criteria,
+            summary.first_date, summary.last_date, bucket
+        )
+    
+    # Only one page of the category's transactions is listed
+    transactions, next_cursor, prev_cursor = report_listing(criteria, request.args.get('cursor'))
+    
+    return render_template('report_detail.html',
+                         report_title=f'Category Report: {category.catName}',
+                         report_total=summary.total,
+                         report_count=summary.count,
+                         report_average=category_avg,
+                         average_label='Average per Transaction',
+                         charts=[{'title': 'Spending Over Time', 'labels': trend_labels_list, 'data': trend_data}],
+                         transactions=transactions,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
+                         page_args={'category': category_id})
+
+
+@app.route('/reports/date')
+@login_required
+@read_replica
+def date_report():
+    """
+    Function Name:  date_report
+    Description:    Generates and displays a report for a specific date range
+    Args:           None (date range, optional trend bucket and listing cursor received via request args)
+    Returns:        flask.Response: Rendered template with date range report data
+    Raises:         None
+    """
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    
+    if not date_from or not date_to:
+        flash('Please select both start and end dates.', 'error')
+        return redirect(url_for('reports'))
+    
+    # Convert string dates to datetime objects
+    try:
+        date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
+        date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
+    except ValueError:
+        flash('Invalid date range.', 'error')
+        return redirect(url_for('reports'))
+    
+    criteria = [
+        Transaction.userID == current_user.userID,
+        Transaction.tranDate.between(date_from, date_to)
+    ]
+    
+    summary = expense_summary(criteria)
+    days_diff = (date_to - date_from).days + 1
+    date_daily_avg = (summary.total / days_diff).quantize(CENT) if days_diff > 0 else 0
+    
+    # Bucket the range so long ranges stay within TREND_MAX_POINTS
+    bucket = choose_trend_bucket(date_from, date_to, request.args.get('bucket'))
+    
+    transactions, next_cursor, prev_cursor = report_listing(criteria, request.args.get('cursor'))
+    
+    return render_template('report_detail.html',
+                         report_title=f"Date Report: {date_from.strftime('%d-%m-%Y')} to {date_to.strftime('%d-%m-%Y')}",
+                         report_total=summary.total,
+                         report_count=summary.count,
+                         report_average=date_daily_avg,
+                         average_label='Daily Average',
+                         charts=[{
+                             'title': 'Expenses by Date',
+                             'labels': trend_labels(date_from, date_to, bucket),
+                             'data': trend_series(
+                                 Transaction.tranDate, Transaction.tranAmount, criteria,
+                                 date_from, date_to, bucket
+                             )
+                         }],
+                         transactions=transactions,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
+                         page_args={'date_from': date_from.strftime('%Y-%m-%d'),
+                                    'date_to': date_to.strftime('%Y-%m-%d')})
+
+
+@app.route('/reports/time')
+@login_required
+@read_replica
+def time_report():
+    """
+    Function Name:  time_report
+    Description:    Generates and displays a report for transactions within a specific time
+                    of day; a range whose end is before its start wraps past midnight
+    Args:           None (time range (HH:MM) and listing cursor received via request args)
+    Returns:        flask.Response: Rendered template with time range report data
+    Raises:         None
+    """
+    time_from = request.args.get('time_from')
+    time_to = request.args.get('time_to')
+    
+    if not time_from or not time_to:
+        flash('Please select both start and end times.', 'error')
+        return redirect(url_for('reports'))
+    
+    try:
+        minute_from = minute_of_day(time_from)
+        minute_to = minute_of_day(time_to)
+    except ValueError:
+        flash('Invalid time range.', 'error')
+        return redirect(url_for('reports'))
+    
+    criteria = [
+        Transaction.userID == current_user.userID,
+        minute_range_criteria(minute_from, minute_to)
+    ]
+    
+    summary = expense_summary(criteria)
+    time_avg = (summary.total / summary.count).quantize(CENT) if summary.count > 0 else 0
+    
+    # Hour-of-day and day-of-week distributions are grouped in SQL
+    hour_labels, hour_data = hourly_series(criteria, minute_from, minute_to)
+    weekday_labels, weekday_data = weekday_series(criteria)
+    
+    transactions, next_cursor, prev_cursor = report_listing(criteria, request.args.get('cursor'))
+    
+    return render_template('report_detail.html',
+                         report_title=f'Time Report: {time_from} to {time_to}',
+                         report_total=summary.total,
+                         report_count=summary.count,
+                         report_average=time_avg,
+                         average_label='Average per Transaction',
+                         charts=[
+                             {'title': 'Expenses by Hour', 'labels': hour_labels, 'data': hour_data},
+                             {'title': 'Expenses by Day of Week', 'labels': weekday_labels, 'data': weekday_data}
+                         ],
+                         transactions=transactions,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
+                         page_args={'time_from': time_from, 'time_to': time_to})
+
+
+@app.route('/reports/export/<report_type>/<format>')
+@login_required
+@read_replica
+def export_report(report_type, format):
+    """
+    Function Name:  export_report
+    Description:    Exports a transaction report in the specified format
+    Args:           report_type (str): Type of report to export ('current' or other types)
+                    format (str): Export format ('csv', 'excel', or 'pdf')
+                    Optional request args: date_from, date_to (YYYY-MM-DD) and category
+    Returns:        flask.Response: File download response with appropriate content type
+    Raises:         None
+    """
+    if report_type != 'current':
+        flash('Invalid report type.', 'error')
+        return redirect(url_for('reports'))
+    
+    try:
+        date_from, date_to, category_id = parse_export_filters(request.args)
+        query = export_query(
+            current_user.userID,
+            date_from=date_from,
+            date_to=date_to,
+            category_id=category_id
+        )
+    except ValueError:
+        flash('Invalid export date range.', 'error')
+        return redirect(url_for('reports'))
+    
+    if format == 'csv':
+        # Stream the rows straight from the database cursor
+        return Response(
+            stream_with_context(stream_transactions_csv(query)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment;filename=expense_report_{datetime.now().strftime("%Y%m%d")}.csv'}
+        )
+    
+    elif format == 'excel':
+        from io import BytesIO
+        
+        output = BytesIO()
+        write_transactions_xlsx(query, output)
+        
+        output.seek(0)
+        return Response(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={'Content-Disposition': f'attachment;filename=expense_report_{datetime.now().strftime("%Y%m%d")}.xlsx'}
+        )
+    
+    elif format == 'pdf':
+        path = cached_statement_pdf(current_user.userID, query, date_from, date_to, category_id)
+        return send_file(
+            path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'expense_report_{datetime.now().strftime("%Y%m%d")}.pdf'
+        )
+    
+    else:
+        flash('Invalid export format.', 'error')
+        return redirect(url_for('reports'))
+
+
+@app.route('/reports/export', methods=['POST'])
+@login_required
+def queue_export():
+    """
+    Function Name:  queue_export
+    Description:    Queues a transaction export for the background export workers so the
+                    request returns straight away; the client polls export_status for the file
+    Args:           None (report_type, format, date_from, date_to and category received as
+                    JSON or form data)
+    Returns:        flask.Response: JSON response with the job ID and its status URL
+    Raises:         None
+    """
+    data = request.get_json(silent=True) or request.form
+    if data.get('report_type', 'current') != 'current':
+        return jsonify({'success': False, 'message': 'Invalid report type'}), 400
+    if data.get('format') not in EXPORT_FILE_TYPES:
+        return jsonify({'success': False, 'message': 'Invalid export format'}), 400
+
+    try:
+        date_from, date_to, category_id = parse_export_filters(data)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid export date range'}), 400
+
+    job = ExportJob(
+        jobID=uuid.uuid4().hex,
+        userID=current_user.userID,
+        format=data['format'],
+        params=json.dumps({
+            'date_from': str(date_from) if date_from else None,
+            'date_to': str(date_to) if date_to else None,
+            'category': category_id
+        }),
+        status='queued',
+        progress=0,
+        createdAt=datetime.now()
+    )
+    try:
+        db.session.add(job)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Error queueing export'}), 500
+
+    start_export_worker()
+    return jsonify({
+        'success': True,
+        'jobId': job.jobID,
+        'statusUrl': url_for('export_status', job_id=job.jobID)
+    }), 202
+
+
+@app.route('/reports/export/<job_id>')
+@login_required
+def export_status(job_id):
+    """
+    Function Name:  export_status
+    Description:    Reports the status and progress of a queued export
+    Args:           job_id (str): Unique identifier of the export job
+    Returns:        flask.Response: JSON response with the job status, progress and, once
+                    the export is done, its download URL
+    Raises:         werkzeug.exceptions.NotFound: If job not found or not owned by user
+    """
+    job = ExportJob.query.filter(
+        ExportJob.jobID == job_id,
+        ExportJob.userID == current_user.userID
+    ).first_or_404()
+
+    status = {
+        'success': True,
+        'jobId': job.jobID,
+        'status': job.status,
+        'progress': max(job.progress, _export_progress.get(job.jobID, 0))
+    }
+    if job.status == 'done':
+        status['downloadUrl'] = url_for('download_export', job_id=job.jobID)
+    elif job.status == 'failed':
+        status['message'] = job.error or 'Export failed'
+    return jsonify(status)
+
+
+@app.route('/reports/export/<job_id>/download')
+@login_required
+def download_export(job_id):
+    """
+    Function Name:  download_export
+    Description:    Downloads the file of a finished export
+    Args:           job_id (str): Unique identifier of the export job
+    Returns:        flask.Response: File download response, or a redirect to the reports
+                    page if the export is unfinished or has expired
+    Raises:         werkzeug.exceptions.NotFound: If job not found or not owned by user
+    """
+    job = ExportJob.query.filter(
+        ExportJob.jobID == job_id,
+        ExportJob.userID == current_user.userID
+    ).first_or_404()
+
+    path = os.path.join(app.config['EXPORT_DIR'], job.fileName) if job.fileName else None
+    if job.status != 'done' or not os.path.exists(path):
+        flash('This export is not available. Please export the report again.', 'error')
+        return redirect(url_for('reports'))
+
+    extension, mimetype = EXPORT_FILE_TYPES[job.format]
+    return send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f'expense_report_{job.createdAt.strftime("%Y%m%d")}.{extension}'
+    )
+
+
+def parse_export_filters(args):
+    """
+    Function Name:  parse_export_filters
+    Description:    Reads the optional export filters from request args or job parameters
+    Args:           args (dict): Mapping with optional date_from, date_to (YYYY-MM-DD) and
+                    category keys
+    Returns:        tuple: (date_from, date_to, category_id), each None when not given
+    Raises:         ValueError: If a date is not in YYYY-MM-DD format
+    """
+    date_from = args.get('date_from')
+    date_to = args.get('date_to')
+    date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+    date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+    return date_from, date_to, args.get('category') or None
+
+
+def export_query(user_id, date_from=None, date_to=None, category_id=None):
+    """
+    Function Name:  export_query
+    Description:    Builds the query for a transaction export, joining the category name
+                    and pushing the optional filters into SQL
+    Args:           user_id (str): The owner of the transactions
+                    date_from (date): Earliest transaction date to include (optional)
+                    date_to (date): Latest transaction date to include (optional)
+                    category_id (str): Only include this category (optional)
+    Returns:        flask_sqlalchemy.query.Query: Rows of (tranDate, tranTime, catName,
+                    tranDescription, tranAmount), newest first
+    Raises:         None
+    """
+    query = db.session.query(
+        Transaction.tranDate,
+        Transaction.tranTime,
+        Category.catName,
+        Transaction.tranDescription,
+        Transaction.tranAmount
+    ).join(Category, Category.catID == Transaction.catID).filter(
+        Transaction.userID == user_id
+    )
+    
+    if date_from:
+        query = query.filter(Transaction.tranDate >= date_from)
+    if date_to:
+        query = query.filter(Transaction.tranDate <= date_to)
+    if category_id:
+        query = query.filter(Transaction.catID == category_id)
+    
+    return query.order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc())
+
+
+def stream_transactions_csv(query, chunk_size=8192, progress=None):
+    """
+    Function Name:  stream_transactions_csv
+    Description:    Generates a CSV export in chunks while rows are fetched from a
+                    server-side cursor, so memory use stays flat for any history size
+    Args:           query (flask_sqlalchemy.query.Query): Query built by export_query
+                    chunk_size (int): Approximate number of characters per yielded chunk
+                    progress (callable): Called with the number of rows written so far (optional)
+    Returns:        generator: CSV text chunks
+    Raises:         None
+    """
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['Date', 'Time', 'Category', 'Description', 'Amount'])
+    
+    for count, row in enumerate(query.yield_per(1000), start=1):
+        if progress and count % 1000 == 0:
+            progress(count)
+        writer.writerow([
+            row.tranDate.strftime('%d-%m-%Y'),
+            row.tranTime,
+            row.catName,
+            row.tranDescription,
+            f"{row.tranAmount:.2f}"
+        ])
+        if output.tell() >= chunk_size:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    
+    yield output.getvalue()
+
+
+def write_transactions_xlsx(query, output, progress=None):
+    """
+    Function Name:  write_transactions_xlsx
+    Description:    Writes a transaction export as an XLSX workbook using openpyxl's
+                    write-only mode, streaming rows from the database cursor. Write-only
+                    sheets need their column widths before the first row, so the widths
+                    come from one MAX(LENGTH()) aggregate over the same filtered query.
+    Args:           query (flask_sqlalchemy.query.Query): Query built by export_query
+                    output (file): Binary file-like object the workbook is saved to
+                    progress (callable): Called with the number of rows written so far (optional)
+    Returns:        None
+    Raises:         None
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+    
+    headers = ['Date', 'Time', 'Category', 'Description', 'Amount']
+    amount_format = '#,##0.00'
+    
+    # Size the columns from the longest value in each one
+    longest_category, longest_description, smallest_amount, largest_amount = query.order_by(None).with_entities(
+        func.max(func.length(Category.catName)),
+        func.max(func.length(Transaction.tranDescription)),
+        func.min(Transaction.tranAmount),
+        func.max(Transaction.tranAmount)
+    ).one()
+    amount_width = max(len(f"{amount or 0:,.2f}") for amount in (smallest_amount, largest_amount))
+    widths = [10, 5, longest_category or 0, longest_description or 0, amount_width]
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Expenses')
+    for idx, (header, width) in enumerate(zip(headers, widths), start=1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = max(width, len(header)) + 2
+    
+    bold = Font(bold=True)
+    header_row = []
+    for header in headers:
+        cell = WriteOnlyCell(worksheet, value=header)
+        cell.font = bold
+        header_row.append(cell)
+    worksheet.append(header_row)
+    
+    total = 0
+    for count, row in enumerate(query.yield_per(1000), start=1):
+        if progress and count % 1000 == 0:
+            progress(count)
+        amount = WriteOnlyCell(worksheet, value=row.tranAmount)
+        amount.number_format = amount_format
+        worksheet.append([
+            row.tranDate.strftime('%d-%m-%Y'),
+            row.tranTime,
+            row.catName,
+            row.tranDescription,
+            amount
+        ])
+        total += row.tranAmount
+    
+    label = WriteOnlyCell(worksheet, value='Total')
+    label.font = bold
+    total_cell = WriteOnlyCell(worksheet, value=total)
+    total_cell.font = bold
+    total_cell.number_format = amount_format
+    worksheet.append([None, None, None, label, total_cell])
+    
+    workbook.save(output)
+
+
+def render_statement_pdf(query, output, date_from=None, date_to=None, progress=None):
+    """
+    Function Name:  render_statement_pdf
+    Description:    Renders a transaction statement as a PDF with one section per month.
+                    Each month is a LongTable that repeats its header row on every page
+                    and ends with a subtotal; the statement ends with a grand total.
+    Args:           query (flask_sqlalchemy.query.Query): Query built by export_query
+                    output (file): Binary file-like object the PDF is written to
+                    date_from (date): Start of the statement period, for the title (optional)
+                    date_to (date): End of the statement period, for the title (optional)
+                    progress (callable): Called with the number of rows laid out so far (optional)
+    Returns:        None
+    Raises:         None
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
+    
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(output, pagesize=letter, title='Expense Statement')
+    col_widths = [70, 45, 110, 230, 75]
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+        ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black),
+        ('GRID', (0, 0), (-1, -2), 0.5, colors.black)
+    ])
+    
+    period = 'All transactions'
+    if date_from or date_to:
+        period = f"{date_from.strftime('%d-%m-%Y') if date_from else 'Start'} to " \
+                 f"{date_to.strftime('%d-%m-%Y') if date_to else 'Today'}"
+    elements = [Paragraph('Expense Statement', styles['Title']), Paragraph(period, styles['Normal'])]
+    
+    def add_section(month, rows, subtotal):
+        rows.append(['', '', '', f"{month.strftime('%B %Y')} total", f"{subtotal:,.2f}"])
+        elements.append(Spacer(1, 12))
+        elements.append(Paragraph(month.strftime('%B %Y'), styles['Heading2']))
+        table = LongTable(rows, colWidths=col_widths, repeatRows=1)
+        table.setStyle(table_style)
+        elements.append(table)
+    
+    header = ['Date', 'Time', 'Category', 'Description', 'Amount']
+    month = None
+    rows = []
+    subtotal = 0
+    total = 0
+    for count, row in enumerate(query.yield_per(1000), start=1):
+        if progress and count % 1000 == 0:
+            progress(count)
+        row_month = row.tranDate.replace(day=1)
+        if row_month != month:
+            if month is not None:
+                add_section(month, rows, subtotal)
+            month, rows, subtotal = row_month, [header], 0
+        rows.append([
+            row.tranDate.strftime('%d-%m-%Y'),
+            row.tranTime,
+            row.catName,
+            row.tranDescription,
+            f"{row.tranAmount:,.2f}"
+        ])
+        subtotal += row.tranAmount
+        total += row.tranAmount
+    if month is not None:
+        add_section(month, rows, subtotal)
+    
+    elements.append(Spacer(1, 18))
+    elements.append(Paragraph(f"Total: {total:,.2f}", styles['Heading2']))
+    doc.build(elements)
+
+
+# Bump when render_statement_pdf changes so previously cached statements are not served
+STATEMENT_LAYOUT_VERSION = 1
+
+
+def statement_cache_key(user_id, date_from, date_to, category_id):
+    """
+    Function Name:  statement_cache_key
+    Description:    Builds the cache key of a user's statement for a date range. The key
+                    covers the revision of every month in the range (bumped by each write
+                    through the rollups) and the categories' cache version, so any change
+                    that would alter the statement produces a new key.
+    Args:           user_id (str): The owner of the statement
+                    date_from (date): Start of the range, or None for the first entry
+                    date_to (date): End of the range, or None for the latest entry
+                    category_id (str): The category filter, or None for all categories
+    Returns:        str: Hex digest identifying the statement's content
+    Raises:         None
+    """
+    query = db.session.query(UserMonthlyTotal.monthStart, UserMonthlyTotal.revision).filter(
+        UserMonthlyTotal.userID == user_id
+    )
+    if date_from:
+        query = query.filter(UserMonthlyTotal.monthStart >= date_from.replace(day=1))
+    if date_to:
+        query = query.filter(UserMonthlyTotal.monthStart <= date_to)
+    revisions = [(str(month), revision) for month, revision in query.order_by(UserMonthlyTotal.monthStart)]
+    
+    key = json.dumps([STATEMENT_LAYOUT_VERSION, user_id, str(date_from), str(date_to), category_id,
+                      revisions, cache_version(CategoryCache.name)])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def cached_statement_pdf(user_id, query, date_from=None, date_to=None, category_id=None, progress=None):
+    """
+    Function Name:  cached_statement_pdf
+    Description:    Returns the path of a rendered statement PDF, rendering it only if no
+                    statement with the same content is in the on-disk cache. Expired cache
+                    files are removed whenever a new statement is rendered.
+    Args:           user_id (str): The owner of the statement
+                    query (flask_sqlalchemy.query.Query): Query built by export_query
+                    date_from (date): Start of the statement period (optional)
+                    date_to (date): End of the statement period (optional)
+                    category_id (str): Category the query is filtered to (optional)
+                    progress (callable): Passed on to render_statement_pdf (optional)
+    Returns:        str: Path to the cached PDF file
+    Raises:         None
+    """
+    cache_dir = app.config['STATEMENT_CACHE_DIR']
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'{statement_cache_key(user_id, date_from, date_to, category_id)}.pdf')
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+    
+    # Remove expired statements before adding a new one
+    expires_before = time.time() - app.config['STATEMENT_CACHE_SECONDS']
+    for name in os.listdir(cache_dir):
+        cached_path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(cached_path) < expires_before:
+                os.remove(cached_path)
+        except OSError:
+            pass
+    
+    # Render to a temporary file first so a partial PDF is never served
+    temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(temp_path, 'wb') as output:
+        render_statement_pdf(query, output, date_from, date_to, progress)
+    os.replace(temp_path, path)
+    return path
+
+
+# Export Job Helpers
+EXPORT_FILE_TYPES = {
+    'csv': ('csv', 'text/csv'),
+    'excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'pdf': ('pdf', 'application/pdf')
+}
+
+_export_executor = None
+_export_progress = {}
+
+
+def start_export_worker():
     """
-    # Get transaction and verify ownership
-    transaction = Transaction.query.join(UserTransaction).filter(
-        Transaction.tranID == tran_id,
-        UserTransaction.userID == current_user.userID
-    ).first_or_404()
+    Function Name:  start_export_worker
+    Description:    Hands the export queue to the process's worker pool. Each call submits
+                    one drain of the queue, so a new job is picked up by an idle worker
+                    straight away and busy workers carry on with the next queued job.
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    global _export_executor
+    if _export_executor is None:
+        _export_executor = ThreadPoolExecutor(
+            max_workers=app.config['EXPORT_WORKERS'],
+            thread_name_prefix='export'
+        )
+    _export_executor.submit(process_export_jobs)
 
-    try:
-        # Delete user-transaction association first
-        UserTransaction.query.filter_by(
-            userID=current_user.userID,
-            tranID=tran_id
-        ).delete()
-        
-        # Delete transaction
-        db.session.delete(transaction)
+
+def process_export_jobs():
+    """
+    Function Name:  process_export_jobs
+    Description:    Runs queued export jobs until the queue is empty, after removing expired
+                    exports. Runs on a worker thread, so it sets up its own app context.
+    Args:           None
+    Returns:        int: Number of jobs run
+    Raises:         None
+    """
+    with app.app_context():
+        processed = 0
+        try:
+            cleanup_export_jobs()
+            while True:
+                job = claim_export_job()
+                if job is None:
+                    break
+                run_export_job(job)
+                processed += 1
+        except Exception:
+            app.logger.exception('Export worker stopped')
+        return processed
+
+
+def claim_export_job():
+    """
+    Function Name:  claim_export_job
+    Description:    Claims the oldest queued export job. The claim is a conditional update,
+                    so when several workers or processes race for a job only one wins.
+                    Jobs left running by a worker that died are claimed again after
+                    EXPORT_JOB_TIMEOUT_SECONDS.
+    Args:           None
+    Returns:        ExportJob: The claimed job, or None if the queue is empty
+    Raises:         None
+    """
+    now = datetime.now()
+    claimable = or_(
+        ExportJob.status == 'queued',
+        and_(
+            ExportJob.status == 'running',
+            ExportJob.startedAt < now - timedelta(seconds=app.config['EXPORT_JOB_TIMEOUT_SECONDS'])
+        )
+    )
+    candidates = db.session.query(ExportJob.jobID).filter(claimable).order_by(ExportJob.createdAt).limit(5).all()
+    db.session.rollback()
+
+    for (job_id,) in candidates:
+        claimed = ExportJob.query.filter(ExportJob.jobID == job_id, claimable).update(
+            {'status': 'running', 'progress': 0, 'startedAt': now},
+            synchronize_session=False
+        )
         db.session.commit()
-        
-        return jsonify({'success': True, 'message': 'Transaction deleted successfully'})
+        if claimed:
+            return db.session.get(ExportJob, job_id)
+    return None
+
+
+def run_export_job(job):
+    """
+    Function Name:  run_export_job
+    Description:    Writes a claimed export job's file to the export directory and marks the
+                    job done, or failed if the export raises. Progress is kept in memory for
+                    this process and, except on SQLite (where a write would wait on the
+                    export's open read cursor), also written to the job on its own connection.
+    Args:           job (ExportJob): The claimed job
+    Returns:        None
+    Raises:         None
+    """
+    try:
+        date_from, date_to, category_id = parse_export_filters(json.loads(job.params))
+        query = export_query(job.userID, date_from=date_from, date_to=date_to, category_id=category_id)
+        row_count = query.order_by(None).count()
+        last_update = time.time()
+
+        def progress(rows):
+            nonlocal last_update
+            if not row_count:
+                return
+            _export_progress[job.jobID] = min(99, rows * 100 // row_count)
+            if db.engine.dialect.name == 'sqlite' or time.time() - last_update < 1:
+                return
+            last_update = time.time()
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        ExportJob.__table__.update()
+                        .where(ExportJob.jobID == job.jobID)
+                        .values(progress=_export_progress[job.jobID])
+                    )
+            except Exception:
+                # Progress is informational; a busy database must not fail the export
+                pass
+
+        export_dir = app.config['EXPORT_DIR']
+        os.makedirs(export_dir, exist_ok=True)
+        file_name = f'{job.jobID}.{EXPORT_FILE_TYPES[job.format][0]}'
+        path = os.path.join(export_dir, file_name)
+
+        # Write to a temporary file first so a partial export is never downloaded
+        temp_path = f'{path}.tmp'
+        if job.format == 'csv':
+            with open(temp_path, 'w', newline='', encoding='utf-8') as output:
+                for chunk in stream_transactions_csv(query, progress=progress):
+                    output.write(chunk)
+        elif job.format == 'excel':
+            with open(temp_path, 'wb') as output:
+                write_transactions_xlsx(query, output, progress)
+        else:
+            statement = cached_statement_pdf(job.userID, query, date_from, date_to, category_id, progress)
+            shutil.copyfile(statement, temp_path)
+        os.replace(temp_path, path)
+
+        job.status = 'done'
+        job.progress = 100
+        job.fileName = file_name
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'message': 'Error deleting transaction'}), 500
+        app.logger.exception('Export job %s failed', job.jobID)
+        job.status = 'failed'
+        job.error = str(e)[:255]
+
+    _export_progress.pop(job.jobID, None)
+    job.finishedAt = datetime.now()
+    job.expiresAt = job.finishedAt + timedelta(seconds=app.config['EXPORT_TTL_SECONDS'])
+    db.session.commit()
 
 
-# Category Management Routes
-@app.route('/categories')
-@login_required
-def view_categories():
+def cleanup_export_jobs():
     """
-    Function Name:  view_categories
-    Description:    Displays a list of all expense categories
+    Function Name:  cleanup_export_jobs
+    Description:    Deletes export jobs past their expiry time along with their files
     Args:           None
-    Returns:        flask.Response: Rendered template with category data
+    Returns:        int: Number of jobs removed
     Raises:         None
     """
-    categories = Category.query.all()
-    return render_template('categories.html', categories=categories)
+    expired = ExportJob.query.filter(ExportJob.expiresAt < datetime.now()).all()
+    for job in expired:
+        if job.fileName:
+            try:
+                os.remove(os.path.join(app.config['EXPORT_DIR'], job.fileName))
+            except OSError:
+                pass
+        db.session.delete(job)
+    db.session.commit()
+    return len(expired)
 
 
-@app.route('/categories/add', methods=['POST'])
-def add_category():
+# Mail Outbox
+_mail_executor = None
+_mail_lock = threading.Lock()
+_mail_wakeup = threading.Event()
+_mail_sender_running = False
+
+
+def queue_email(subject, recipients, body):
     """
-    Function Name:  add_category
-    Description:    Handles creation of a new expense category
-    Args:           None (category data received via request form)
-    Returns:        flask.Response: JSON response indicating success or failure
+    Function Name:  queue_email
+    Description:    Adds an email to the outbox in the current session. It is sent after
+                    the caller commits and calls start_mail_sender.
+    Args:           subject (str): Subject line
+                    recipients (list): Recipient addresses
+                    body (str): Plain text body
+    Returns:        OutboxEmail: The queued email
     Raises:         None
     """
-    try:
-        category_id = request.form.get('categoryId')
-        category_name = request.form.get('categoryName')
+    now = datetime.now()
+    email = OutboxEmail(
+        mailID=uuid.uuid4().hex,
+        recipients=json.dumps(recipients),
+        subject=subject,
+        body=body,
+        status='queued',
+        attempts=0,
+        createdAt=now,
+        nextAttemptAt=now
+    )
+    db.session.add(email)
+    return email
 
-        # Validate category ID format
-        if not category_id or not category_id.isdigit() or len(category_id) != 4:
-            return jsonify({
-                'success': False,
-                'message': 'Category ID must be a 4-digit number'
-            }), 400
 
-        # Check if category ID already exists
-        existing_category = Category.query.filter_by(catID=category_id).first()
-        if existing_category:
-            return jsonify({
-                'success': False,
-                'message': f'Category ID {category_id} already exists. Please use a different ID.'
-            }), 400
+def start_mail_sender():
+    """
+    Function Name:  start_mail_sender
+    Description:    Wakes this process's background mail sender, starting it if it is idle.
+                    One sender thread runs per process and drains the outbox in batches.
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    global _mail_executor, _mail_sender_running
+    with _mail_lock:
+        _mail_wakeup.set()
+        if _mail_sender_running:
+            return
+        _mail_sender_running = True
+        if _mail_executor is None:
+            _mail_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mail')
+    _mail_executor.submit(run_mail_sender)
 
-        # Create new category
-        new_category = Category(catID=category_id, catName=category_name)
-        db.session.add(new_category)
-        db.session.commit()
 
-        return jsonify({
-            'success': True,
-            'message': 'Category added successfully',
-            'categoryId': category_id,
-            'categoryName': category_name
-        })
+def run_mail_sender():
+    """
+    Function Name:  run_mail_sender
+    Description:    Sends batches from the outbox until nothing is left to send, sleeping
+                    until the next retry is due while failed emails are waiting to be
+                    retried. Runs on the mail thread, so it sets up its own app context.
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    global _mail_sender_running
+    with app.app_context():
+        while True:
+            _mail_wakeup.clear()
+            try:
+                while send_outbox_batch():
+                    pass
+                next_attempt = db.session.query(func.min(OutboxEmail.nextAttemptAt)).filter(
+                    OutboxEmail.status == 'queued'
+                ).scalar()
+                db.session.rollback()
+            except Exception:
+                app.logger.exception('Mail sender failed')
+                db.session.rollback()
+                next_attempt = datetime.now() + timedelta(seconds=app.config['MAIL_RETRY_SECONDS'])
 
-    except Exception as e:
-        db.session.rollback()
-        error_message = str(e)
-        if 'Duplicate entry' in error_message:
-            return jsonify({
-                'success': False,
-                'message': f'Category ID {category_id} already exists. Please use a different ID.'
-            }), 400
-        return jsonify({
-            'success': False,
-            'message': 'An error occurred while adding the category. Please try again.'
-        }), 500
+            if next_attempt is None:
+                with _mail_lock:
+                    if not _mail_wakeup.is_set():
+                        _mail_sender_running = False
+                        return
+                continue
+            _mail_wakeup.wait(max((next_attempt - datetime.now()).total_seconds(), 0.1))
 
 
-@app.route('/categories/<cat_id>/edit', methods=['POST'])
-@login_required
-def edit_category(cat_id):
+def claim_outbox_batch():
     """
-    Function Name:  edit_category
-    Description:    Handles updating of an existing expense category
-    Args:           cat_id (str): Unique identifier of the category to edit
-    Returns:        flask.Response: JSON response indicating success or failure
+    Function Name:  claim_outbox_batch
+    Description:    Claims up to MAIL_BATCH_SIZE emails that are due to be sent. Each claim
+                    is a conditional update, so senders in different processes never send
+                    the same email twice. Emails left 'sending' by a sender that died are
+                    claimed again after MAIL_SEND_TIMEOUT_SECONDS.
+    Args:           None
+    Returns:        list: The claimed OutboxEmail rows
     Raises:         None
     """
-    category = db.session.get(Category, cat_id)
-    if not category:
-        return jsonify({'success': False, 'message': 'Category not found'}), 404
-        
-    category_name = request.form.get('categoryName')
+    now = datetime.now()
+    claimable = or_(
+        and_(OutboxEmail.status == 'queued', OutboxEmail.nextAttemptAt <= now),
+        and_(
+            OutboxEmail.status == 'sending',
+            OutboxEmail.nextAttemptAt < now - timedelta(seconds=app.config['MAIL_SEND_TIMEOUT_SECONDS'])
+        )
+    )
+    candidates = db.session.query(OutboxEmail.mailID).filter(claimable)\
+        .order_by(OutboxEmail.nextAttemptAt).limit(app.config['MAIL_BATCH_SIZE']).all()
+    db.session.rollback()
 
-    try:
-        category.catName = category_name
-        db.session.commit()
-        return jsonify({'success': True, 'message': 'Category updated successfully'})
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': 'Error updating category'}), 500
+    claimed = []
+    for (mail_id,) in candidates:
+        # While an email is being sent, nextAttemptAt records when it was claimed
+        if OutboxEmail.query.filter(OutboxEmail.mailID == mail_id, claimable).update(
+            {'status': 'sending', 'nextAttemptAt': now},
+            synchronize_session=False
+        ):
+            claimed.append(mail_id)
+    db.session.commit()
+    return OutboxEmail.query.filter(OutboxEmail.mailID.in_(claimed)).all() if claimed else []
 
 
-@app.route('/categories/<cat_id>/delete', methods=['POST'])
-@login_required
-def delete_category(cat_id):
+def send_outbox_batch():
     """
-    Function Name:  delete_category
-    Description:    Handles deletion of an existing expense category
-    Args:           cat_id (str): Unique identifier of the category to delete
-    Returns:        flask.Response: JSON response indicating success or failure
+    Function Name:  send_outbox_batch
+    Description:    Claims a batch of due emails and sends them over one SMTP connection.
+                    A failed email is retried with exponential backoff (MAIL_RETRY_SECONDS,
+                    doubled per attempt) until MAIL_MAX_ATTEMPTS, then marked 'failed'.
+                    If the connection itself fails, every email in the batch is retried.
+    Args:           None
+    Returns:        int: Number of emails claimed (0 when nothing is due)
     Raises:         None
     """
-    category = db.session.get(Category, cat_id)
-    if not category:
-        return jsonify({'success': False, 'message': 'Category not found'}), 404
+    batch = claim_outbox_batch()
+    if not batch:
+        return 0
 
-    # Check if category is being used in transactions
-    if Transaction.query.filter_by(catID=cat_id).first():
-        return jsonify({
-            'success': False, 
-            'message': 'Cannot delete category that is being used in transactions'
-        }), 400
+    def record_failure(email, error):
+        email.attempts += 1
+        email.lastError = str(error)[:255]
+        if email.attempts >= app.config['MAIL_MAX_ATTEMPTS']:
+            email.status = 'failed'
+            app.logger.error(f'Giving up on email {email.mailID}: {email.lastError}')
+        else:
+            email.status = 'queued'
+            email.nextAttemptAt = datetime.now() + timedelta(
+                seconds=app.config['MAIL_RETRY_SECONDS'] * 2 ** (email.attempts - 1)
+            )
 
     try:
-        db.session.delete(category)
-        db.session.commit()
-        return jsonify({'success': True, 'message': 'Category deleted successfully'})
+        with mail.connect() as connection:
+            for email in batch:
+                try:
+                    connection.send(Message(
+                        email.subject,
+                        sender=("Budget Tracker App", app.config['MAIL_USERNAME']),
+                        recipients=json.loads(email.recipients),
+                        body=email.body
+                    ))
+                    email.status = 'sent'
+                    email.attempts += 1
+                    email.sentAt = datetime.now()
+                except Exception as e:
+                    record_failure(email, e)
+                db.session.commit()
     except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': 'Error deleting category'}), 500
+        # The connection could not be opened (or dropped); retry what was not sent
+        app.logger.warning(f'Mail connection failed: {str(e)}')
+        for email in batch:
+            if email.status == 'sending':
+                record_failure(email, e)
+        db.session.commit()
 
+    purge_outbox()
+    return len(batch)
 
-# Report Routes
-@app.route('/reports')
-@login_required
-def reports():
+
+def purge_outbox():
     """
-    Function Name:  reports
-    Description:    Renders the main reports page with financial data visualizations
-    Args:           None (date range parameters received via request args)
-    Returns:        flask.Response: Rendered template with report data
+    Function Name:  purge_outbox
+    Description:    Deletes sent and failed emails older than MAIL_RETENTION_DAYS, so reset
+                    links in their bodies are not kept around
+    Args:           None
+    Returns:        int: Number of emails deleted
     Raises:         None
     """
-    # Get date range from query parameters or use default (last 30 days)
-    end_date = datetime.now()
-    start_date = request.args.get('start_date', (end_date - timedelta(days=30)).strftime('%Y-%m-%d'))
-    end_date = request.args.get('end_date', end_date.strftime('%Y-%m-%d'))
-    
-    # Convert string dates to datetime objects
-    start_date = datetime.strptime(start_date, '%Y-%m-%d')
-    end_date = datetime.strptime(end_date, '%Y-%m-%d')
-    
-    # Get expenses for the date range
-    expenses = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate >= start_date,
-        Transaction.tranDate <= end_date
-    ).all()
-    
-    # Get revenue for the date range
-    revenues = Revenue.query.filter(
-        Revenue.userID == current_user.userID,
-        Revenue.revDate >= start_date,
-        Revenue.revDate <= end_date
-    ).all()
-    
-    # Calculate totals
-    total_expenses = sum(expense.tranAmount for expense in expenses)
-    total_revenue = sum(revenue.revAmount for revenue in revenues)
-    
-    # Get expense categories breakdown
-    expense_categories_raw = db.session.query(
-        Category.catName.label('name'),
-        func.sum(Transaction.tranAmount).label('amount')
-    ).join(Transaction, Category.catID == Transaction.catID)\
-    .join(UserTransaction, Transaction.tranID == UserTransaction.tranID)\
-    .filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate >= start_date,
-        Transaction.tranDate <= end_date
-    ).group_by(Category.catName).all()
-    
-    # Convert expense categories to list of dictionaries with percentages
-    expense_categories = []
-    for cat in expense_categories_raw:
-        expense_categories.append({
-            'name': cat.name,
-            'amount': float(cat.amount),
-            'percentage': (float(cat.amount) / total_expenses * 100) if total_expenses > 0 else 0
-        })
-    
-    # Get revenue categories breakdown
-    revenue_categories_raw = db.session.query(
-        Revenue.revType.label('name'),
-        func.sum(Revenue.revAmount).label('amount')
-    ).filter(
-        Revenue.userID == current_user.userID,
-        Revenue.revDate >= start_date,
-        Revenue.revDate <= end_date
-    ).group_by(Revenue.revType).all()
-    
-    # Convert revenue categories to list of dictionaries with percentages
-    revenue_categories = []
-    for cat in revenue_categories_raw:
-        revenue_categories.append({
-            'name': cat.name,
-            'amount': float(cat.amount),
-            'percentage': (float(cat.amount) / total_revenue * 100) if total_revenue > 0 else 0
-        })
-    
-    # Get daily trend data
-    daily_expenses = db.session.query(
-        func.date(Transaction.tranDate).label('date'),
-        func.sum(Transaction.tranAmount).label('amount')
-    ).join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate >= start_date,
-        Transaction.tranDate <= end_date
-    ).group_by(func.date(Transaction.tranDate)).all()
-    
-    daily_revenues = db.session.query(
-        func.date(Revenue.revDate).label('date'),
-        func.sum(Revenue.revAmount).label('amount')
-    ).filter(
-        Revenue.userID == current_user.userID,
-        Revenue.revDate >= start_date,
-        Revenue.revDate <= end_date
-    ).group_by(func.date(Revenue.revDate)).all()
-    
-    # Create date range for trend chart
-    date_range = []
-    current_date = start_date
-    while current_date <= end_date:
-        date_range.append(current_date.strftime('%Y-%m-%d'))
-        current_date += timedelta(days=1)
-    
-    # Prepare trend data
-    expense_trend = [0] * len(date_range)
-    revenue_trend = [0] * len(date_range)
-    
-    for expense in daily_expenses:
-        date_index = date_range.index(expense.date.strftime('%Y-%m-%d'))
-        expense_trend[date_index] = float(expense.amount)
-    
-    for revenue in daily_revenues:
-        date_index = date_range.index(revenue.date.strftime('%Y-%m-%d'))
-        revenue_trend[date_index] = float(revenue.amount)
-    
-    # Prepare category data for charts
-    category_labels = [cat['name'] for cat in expense_categories] + [cat['name'] for cat in revenue_categories]
-    category_data = [cat['amount'] for cat in expense_categories] + [cat['amount'] for cat in revenue_categories]
-    
-    return render_template('reports.html',
-                         start_date=start_date.strftime('%Y-%m-%d'),
-                         end_date=end_date.strftime('%Y-%m-%d'),
-                         total_expenses=total_expenses,
-                         total_revenue=total_revenue,
-                         expense_categories=expense_categories,
-                         revenue_categories=revenue_categories,
-                         trend_labels=date_range,
-                         expense_trend=expense_trend,
-                         revenue_trend=revenue_trend,
-                         category_labels=category_labels,
-                         category_data=category_data)
+    cutoff = datetime.now() - timedelta(days=app.config['MAIL_RETENTION_DAYS'])
+    deleted = OutboxEmail.query.filter(or_(
+        and_(OutboxEmail.status == 'sent', OutboxEmail.sentAt < cutoff),
+        and_(OutboxEmail.status == 'failed', OutboxEmail.createdAt < cutoff)
+    )).delete()
+    db.session.commit()
+    return deleted
+
+
+# Slow Query Profiler
+# Slow statements waiting for the profiler thread; once it is full, further ones are dropped
+SLOW_QUERY_QUEUE_SIZE = 1000
+SLOW_QUERY_EXPLAINED_SIZE = 1000  # Fingerprints remembered as explained; the least recent is dropped
+
+_slow_query_queue = queue.Queue(maxsize=SLOW_QUERY_QUEUE_SIZE)
+_slow_query_lock = threading.Lock()
+_slow_query_thread = None
+_explained_fingerprints = {}  # Only touched by the profiler thread, in least recently seen order
+
+_SQL_COMMENT = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_SQL_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+
+
+def sql_fingerprint(statement):
+    """
+    Function Name:  sql_fingerprint
+    Description:    Normalizes a SQL statement so executions that differ only in their
+                    literal values, bound parameters or IN list lengths share a fingerprint
+    Args:           statement (str): The SQL sent to the database
+    Returns:        tuple: (fingerprint, normalized statement)
+    Raises:         None
+    """
+    normalized = _SQL_COMMENT.sub(' ', statement)
+    normalized = _SQL_LITERAL.sub('?', normalized)
+    normalized = _SQL_IN_LIST.sub('IN (...)', normalized)
+    normalized = ' '.join(normalized.split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest(), normalized
 
 
-@app.route('/reports/category')
-@login_required
-def category_report():
+def explain(connection, statement, parameters=None):
     """
-    Function Name:  category_report
-    Description:    Generates and displays a report for a specific expense category
-    Args:           None (category received via request args)
-    Returns:        flask.Response: Rendered template with category report data
+    Function Name:  explain
+    Description:    Runs the dialect's EXPLAIN on a statement
+    Args:           connection (sqlalchemy.engine.Connection): Open database connection
+                    statement (sqlalchemy.sql.Select or str): The statement to explain, or
+                        the SQL sent to the database
+                    parameters (tuple or dict): The SQL's bound parameters, if it is a string
+    Returns:        tuple: (column names, plan rows)
     Raises:         None
     """
-    category_id = request.args.get('category')
-    
-    if not category_id:
-        flash('Please select a category.', 'error')
-        return redirect(url_for('reports'))
-    
-    # Get transactions for the selected category
-    category_report = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.catID == category_id
-    ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc()).all()
-    
-    category_total = sum(t.tranAmount for t in category_report)
-    category_count = len(category_report)
-    category_avg = category_total / category_count if category_count > 0 else 0
-    
-    # Prepare data for category trend chart
-    category_trend_data = {}
-    for t in category_report:
-        date_key = t.tranDate.strftime('%Y-%m-%d')
-        if date_key not in category_trend_data:
-            category_trend_data[date_key] = 0
-        category_trend_data[date_key] += t.tranAmount
-    
-    # Sort trend data
-    category_trend_data = dict(sorted(category_trend_data.items()))
-    
-    # Get all categories for the form
-    categories = Category.query.all()
-    
-    return render_template('reports.html',
-                         category_report=category_report,
-                         category_total=category_total,
-                         category_count=category_count,
-                         category_avg=category_avg,
-                         category_trend_labels=list(category_trend_data.keys()),
-                         category_trend_data=list(category_trend_data.values()),
-                         categories=categories)
+    dialect = connection.dialect
+    if isinstance(statement, str):
+        sql = statement
+    else:
+        sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    result = connection.exec_driver_sql(prefix + sql, parameters)
+    return list(result.keys()), result.fetchall()
 
 
-@app.route('/reports/date')
-@login_required
-def date_report():
+def profile_slow_query(connection, statement, parameters, seconds):
     """
-    Function Name:  date_report
-    Description:    Generates and displays a report for a specific date range
-    Args:           None (date range received via request args)
-    Returns:        flask.Response: Rendered template with date range report data
+    Function Name:  profile_slow_query
+    Description:    Hands a SELECT that took longer than SLOW_QUERY_MS to the profiler
+                    thread, which explains and records it away from the request
+    Args:           connection (sqlalchemy.engine.Connection): The connection it ran on
+                    statement (str): The SQL sent to the database
+                    parameters (tuple or dict): Its bound parameters
+                    seconds (float): How long it took
+    Returns:        None
     Raises:         None
     """
-    date_from = request.args.get('date_from')
-    date_to = request.args.get('date_to')
-    
-    if not date_from or not date_to:
-        flash('Please select both start and end dates.', 'error')
-        return redirect(url_for('reports'))
-    
-    # Convert string dates to datetime objects
-    date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
-    date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
-    
-    # Get transactions within the date range
-    date_report = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranDate.between(date_from, date_to)
-    ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc()).all()
-    
-    date_total = sum(t.tranAmount for t in date_report)
-    date_count = len(date_report)
-    days_diff = (date_to - date_from).days + 1
-    date_daily_avg = date_total / days_diff if days_diff > 0 else 0
-    
-    # Prepare data for daily expenses chart
-    date_range_data = {}
-    for t in date_report:
-        date_key = t.tranDate.strftime('%Y-%m-%d')
-        if date_key not in date_range_data:
-            date_range_data[date_key] = 0
-        date_range_data[date_key] += t.tranAmount
-    
-    # Sort date range data
-    date_range_data = dict(sorted(date_range_data.items()))
-    
-    # Get all categories for the form
-    categories = Category.query.all()
-    
-    return render_template('reports.html',
-                         date_report=date_report,
-                         date_total=date_total,
-                         date_count=date_count,
-                         date_daily_avg=date_daily_avg,
-                         date_range_labels=list(date_range_data.keys()),
-                         date_range_data=list(date_range_data.values()),
-                         categories=categories)
+    global _slow_query_thread
+    if not connection.get_execution_options().get('slow_query_profile', True):
+        return
+    if not re.match(r'\s*(SELECT|WITH)\b', statement, re.I):
+        return
+    endpoint = request.endpoint if has_request_context() else None
+    try:
+        _slow_query_queue.put_nowait((connection.engine, statement, parameters, seconds, endpoint))
+    except queue.Full:
+        return
 
+    with _slow_query_lock:
+        if _slow_query_thread is None or not _slow_query_thread.is_alive():
+            _slow_query_thread = threading.Thread(target=run_slow_query_profiler, name='slow-query-profiler', daemon=True)
+            _slow_query_thread.start()
 
-@app.route('/reports/time')
-@login_required
-def time_report():
+
+def run_slow_query_profiler():
     """
-    Function Name:  time_report
-    Description:    Generates and displays a report for transactions within a specific time range
-    Args:           None (time range received via request args)
-    Returns:        flask.Response: Rendered template with time range report data
+    Function Name:  run_slow_query_profiler
+    Description:    Records slow statements from the queue for the life of the process.
+                    Runs on the profiler thread, so it sets up its own app context.
+    Args:           None
+    Returns:        None
     Raises:         None
     """
-    time_from = request.args.get('time_from')
-    time_to = request.args.get('time_to')
-    
-    if not time_from or not time_to:
-        flash('Please select both start and end times.', 'error')
-        return redirect(url_for('reports'))
-    
-    # Get transactions within the time range
-    time_report = Transaction.query.join(UserTransaction).filter(
-        UserTransaction.userID == current_user.userID,
-        Transaction.tranTime.between(time_from, time_to)
-    ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc()).all()
-    
-    time_total = sum(t.tranAmount for t in time_report)
-    time_count = len(time_report)
-    time_avg = time_total / time_count if time_count > 0 else 0
-    
-    # Prepare data for hourly distribution chart
-    time_range_data = {}
-    for t in time_report:
-        hour_key = t.tranTime.split(':')[0] + ':00'
-        if hour_key not in time_range_data:
-            time_range_data[hour_key] = 0
-        time_range_data[hour_key] += t.tranAmount
-    
-    # Sort time range data
-    time_range_data = dict(sorted(time_range_data.items()))
-    
-    # Get all categories for the form
-    categories = Category.query.all()
-    
-    return render_template('reports.html',
-                         time_report=time_report,
-                         time_total=time_total,
-                         time_count=time_count,
-                         time_avg=time_avg,
-                         time_range_labels=list(time_range_data.keys()),
-                         time_range_data=list(time_range_data.values()),
-                         categories=categories)
+    with app.app_context():
+        while True:
+            engine, statement, parameters, seconds, endpoint = _slow_query_queue.get()
+            try:
+                record_slow_query(engine, statement, parameters, seconds, endpoint)
+            except Exception:
+                app.logger.exception('Slow query profiler failed')
 
 
-@app.route('/reports/export/<report_type>/<format>')
-@login_required
-def export_report(report_type, format):
+def record_slow_query(engine, statement, parameters, seconds, endpoint=None):
     """
-    Function Name:  export_report
-    Description:    Exports a transaction report in the specified format
-    Args:           report_type (str): Type of report to export ('current' or other types)
-                    format (str): Export format ('csv', 'excel', or 'pdf')
-    Returns:        flask.Response: File download response with appropriate content type
+    Function Name:  record_slow_query
+    Description:    Adds a slow execution to its fingerprint's row in slow_queries. The
+                    first time this process sees a fingerprint, or the first time again after
+                    it was dropped from the bounded set of recently explained fingerprints,
+                    it also runs EXPLAIN on the statement's own database and stores the plan,
+                    replacing any older one.
+    Args:           engine (sqlalchemy.engine.Engine): The engine the statement ran on
+                    statement (str): The SQL sent to the database
+                    parameters (tuple or dict): Its bound parameters
+                    seconds (float): How long it took
+                    endpoint (str): The endpoint that ran it, if any
+    Returns:        None
     Raises:         None
     """
-    if report_type == 'current':
-        transactions = Transaction.query.join(UserTransaction).filter(
-            UserTransaction.userID == current_user.userID
-        ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc()).all()
-    else:
-        flash('Invalid report type.', 'error')
-        return redirect(url_for('reports'))
-    
-    if format == 'csv':
-        # Create CSV data
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Date', 'Time', 'Category', 'Description', 'Amount'])
-        
-        # Write data
-        for t in transactions:
-            writer.writerow([
-                t.tranDate.strftime('%d-%m-%Y'),
-                t.tranTime,
-                t.category.catName,
-                t.tranDescription,
-                f"{t.tranAmount:.2f}"
-            ])
-        
-        # Create response
-        output.seek(0)
-        return Response(
-            output,
-            mimetype='text/csv',
-            headers={'Content-Disposition': f'attachment;filename=expense_report_{datetime.now().strftime("%Y%m%d")}.csv'}
-        )
-    
-    elif format == 'excel':
-        import pandas as pd
-        from io import BytesIO
-        
-        # Create DataFrame
-        data = []
-        for t in transactions:
-            data.append({
-                'Date': t.tranDate.strftime('%d-%m-%Y'),
-                'Time': t.tranTime,
-                'Category': t.category.catName,
-                'Description': t.tranDescription,
-                'Amount': t.tranAmount
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # Create Excel file
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Expenses')
-            
-            # Auto-adjust column widths
-            worksheet = writer.sheets['Expenses']
-            for idx, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(col)
-                )
-                worksheet.column_dimensions[chr(65 + idx)].width = max_length + 2
-        
-        output.seek(0)
-        return Response(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers={'Content-Disposition': f'attachment;filename=expense_report_{datetime.now().strftime("%Y%m%d")}.xlsx'}
-        )
-    
-    elif format == 'pdf':
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-        from io import BytesIO
-        
-        # Create PDF
-        output = BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=letter)
-        elements = []
-        
-        # Prepare data
-        data = [['Date', 'Time', 'Category', 'Description', 'Amount']]
-        for t in transactions:
-            data.append([
-                t.tranDate.strftime('%d-%m-%Y'),
-                t.tranTime,
-                t.category.catName,
-                t.tranDescription,
-                f"{t.tranAmount:.2f}"
-            ])
-        
-        # Create table
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        
-        output.seek(0)
-        return Response(
-            output,
-            mimetype='application/pdf',
-            headers={'Content-Disposition': f'attachment;filename=expense_report_{datetime.now().strftime("%Y%m%d")}.pdf'}
-        )
-    
-    else:
-        flash('Invalid export format.', 'error')
-        return redirect(url_for('reports'))
+    fingerprint, normalized = sql_fingerprint(statement)
+    milliseconds = seconds * 1000
+    now = datetime.now()
+    table = SlowQuery.__table__
+
+    plan_values = {}
+    if _explained_fingerprints.pop(fingerprint, None) is None:
+        if len(_explained_fingerprints) >= SLOW_QUERY_EXPLAINED_SIZE:
+            _explained_fingerprints.pop(next(iter(_explained_fingerprints)))
+        try:
+            with engine.connect().execution_options(slow_query_profile=False) as connection:
+                columns, rows = explain(connection, statement, parameters)
+            plan = {'columns': columns, 'rows': [list(row) for row in rows]}
+        except Exception as e:
+            plan = {'error': str(e)}
+        plan_values = {
+            'queryPlan': json.dumps(plan, default=str),
+            'dialect': engine.dialect.name,
+            'planCapturedAt': now
+        }
+    _explained_fingerprints[fingerprint] = True
+
+    counters = update(table).where(table.c.fingerprint == fingerprint).values(
+        callCount=table.c.callCount + 1,
+        totalMs=table.c.totalMs + milliseconds,
+        maxMs=case((table.c.maxMs < milliseconds, milliseconds), else_=table.c.maxMs),
+        lastEndpoint=endpoint,
+        lastSeenAt=now,
+        **plan_values
+    )
+    with db.engine.connect().execution_options(slow_query_profile=False) as connection:
+        if connection.execute(counters).rowcount == 0:
+            try:
+                connection.execute(insert(table).values(
+                    fingerprint=fingerprint,
+                    statement=normalized,
+                    callCount=1,
+                    totalMs=milliseconds,
+                    maxMs=milliseconds,
+                    lastEndpoint=endpoint,
+                    firstSeenAt=now,
+                    lastSeenAt=now,
+                    **plan_values
+                ))
+            except IntegrityError:
+                # Another process recorded the fingerprint first
+                connection.rollback()
+                connection.execute(counters)
+        connection.commit()
 
 
 # Revenue Management Routes
 class RevenueForm(FlaskForm):
-    amount = FloatField('Amount', validators=[DataRequired(), NumberRange(min=0.01)])
+    amount = DecimalField('Amount', places=2, validators=[DataRequired(), NumberRange(min=Decimal('0.01'))])
     description = StringField('Description', validators=[DataRequired(), Length(max=200)])
     date = DateField('Date', validators=[DataRequired()])
     category = SelectField('Category', choices=[
@@ -1261,15 +4943,15 @@ def add_revenue():
     form = RevenueForm()
     if form.validate_on_submit():
         revenue = Revenue(
-            revID=str(uuid.uuid4())[:8],
+            revID=new_record_id(),
             revDate=form.date.data,
-            revTime=datetime.now().strftime('%H:%M'),
             revDescription=form.description.data,
             revAmount=form.amount.data,
             revType=form.category.data,
             userID=current_user.userID
         )
         db.session.add(revenue)
+        apply_revenue_rollup(revenue)
         db.session.commit()
         flash('Revenue added successfully!', 'success')
         return redirect(url_for('view_revenues'))
@@ -1281,27 +4963,41 @@ def add_revenue():
 def view_revenues():
     """
     Function Name:  view_revenues
-    Description:    Displays a paginated list of user's revenue entries
-    Args:           None (pagination parameters received via request args)
+    Description:    Displays a cursor-paginated list of user's revenue entries
+    Args:           None (cursor and search parameters received via request args)
     Returns:        flask.Response: Rendered template with revenue data
     Raises:         None
     """
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
+    search_term = request.args.get('search', '')
     per_page = 10
     
-    revenues = Revenue.query.filter_by(userID=current_user.userID)\
-        .order_by(Revenue.revDate.desc())\
-        .paginate(page=page, per_page=per_page)
+    query = Revenue.query.filter_by(userID=current_user.userID)
+    if search_term:
+        query = get_search_backend().filter_query(query, 'revenues', current_user.userID, search_term)
+    revenues, next_cursor, prev_cursor = keyset_paginate(
+        query,
+        [Revenue.revDate, Revenue.revID],
+        cursor,
+        per_page
+    )
     
-    total_revenue = db.session.query(func.sum(Revenue.revAmount))\
+    # Lifetime total from the monthly rollups rather than every revenue row
+    total_revenue = db.session.query(func.sum(UserMonthlyTotal.revenueTotal))\
         .filter_by(userID=current_user.userID)\
         .scalar() or 0
     
+    total_pages = None
+    if app.config['SHOW_PAGE_COUNTS']:
+        total_pages = (cached_count(('revenues', current_user.userID, search_term), query) + per_page - 1) // per_page
+    
     return render_template('view_revenues.html',
-                         revenues=revenues.items,
+                         revenues=revenues,
                          total_revenue=total_revenue,
-                         pages=revenues.pages,
-                         current_page=page)
+                         pages=total_pages,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
+                         search_term=search_term)
 
 
 @app.route('/revenues/<string:revenue_id>/edit', methods=['GET', 'POST'])
@@ -1324,10 +5020,14 @@ def edit_revenue(revenue_id):
     
     form = RevenueForm(obj=revenue)
     if form.validate_on_submit():
+        # Take the old values out of the rollups before they change
+        apply_revenue_rollup(revenue, -1)
+
         revenue.revAmount = form.amount.data
         revenue.revDescription = form.description.data
         revenue.revDate = form.date.data
         revenue.revType = form.category.data
+        apply_revenue_rollup(revenue)
         
         db.session.commit()
         flash('Revenue updated successfully!', 'success')
@@ -1354,6 +5054,7 @@ def delete_revenue(revenue_id):
     if revenue.userID != current_user.userID:
         abort(403)
     
+    apply_revenue_rollup(revenue, -1)
     db.session.delete(revenue)
     db.session.commit()
     
@@ -1373,5 +5074,479 @@ def serve_js(filename):
     return app.send_static_file(f'js/{filename}')
 
 
+# Internal Routes
+def internal_access_required(view):
+    """
+    Function Name:  internal_access_required
+    Description:    Restricts a view to requests bearing BT_INTERNAL_TOKEN as a bearer token,
+                    or from localhost when BT_INTERNAL_ALLOW_LOCALHOST is set and no proxy is
+                    configured, so operational stats are not public
+    Args:           view (callable): The view function to protect
+    Returns:        callable: The wrapped view, which returns 404 to anyone else
+    Raises:         werkzeug.exceptions.NotFound: If the request is not allowed
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        token = app.config['INTERNAL_TOKEN']
+        if token and secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return view(*args, **kwargs)
+        if (app.config['INTERNAL_ALLOW_LOCALHOST'] and not app.config['PROXY_COUNT']
+                and request.remote_addr in ('127.0.0.1', '::1')):
+            return view(*args, **kwargs)
+        abort(404)
+    return wrapped
+
+
+@app.route('/internal/cache')
+@internal_access_required
+def internal_cache_stats():
+    """
+    Function Name:  internal_cache_stats
+    Description:    Reports the hit and miss counters of this process's in-memory caches
+    Args:           None
+    Returns:        flask.Response: JSON response with the stats of each cache
+    Raises:         werkzeug.exceptions.NotFound: If the request is not allowed
+    """
+    return jsonify({
+        'pid': os.getpid(),
+        'categories': category_cache.stats(),
+        'users': user_cache.stats()
+    })
+
+
+@app.route('/internal/db-pool')
+@internal_access_required
+def internal_db_pool_stats():
+    """
+    Function Name:  internal_db_pool_stats
+    Description:    Reports this process's database connection pool settings, usage and
+                    checkout latency histogram, and those of the read replica's pool
+                    separately when one is configured
+    Args:           None
+    Returns:        flask.Response: JSON response with the pool statistics
+    Raises:         werkzeug.exceptions.NotFound: If the request is not allowed
+    """
+    stats = {
+        'pid': os.getpid(),
+        'settings': {
+            'poolSize': app.config['DB_POOL_SIZE'],
+            'maxOverflow': app.config['DB_MAX_OVERFLOW'],
+            'timeoutSeconds': app.config['DB_POOL_TIMEOUT'],
+            'recycleSeconds': app.config['DB_POOL_RECYCLE'],
+            'prePing': app.config['DB_POOL_PRE_PING']
+        },
+        **engine_pool_stats(db.engine)
+    }
+    if 'replica' in db.engines:
+        stats['replica'] = engine_pool_stats(db.engines['replica'])
+    return jsonify(stats)
+
+
+def engine_pool_stats(engine):
+    """
+    Function Name:  engine_pool_stats
+    Description:    Reports an engine's pool state and the counters of its pool's monitor
+    Args:           engine (sqlalchemy.engine.Engine): The engine
+    Returns:        dict: The pool statistics (empty counters for an uninstrumented pool)
+    Raises:         None
+    """
+    monitor = getattr(engine.pool, 'monitor', None) or PoolMonitor()
+    return monitor.stats(engine.pool)
+
+
+@app.route('/metrics')
+@internal_access_required
+def metrics():
+    """
+    Function Name:  metrics
+    Description:    Serves this process's per-endpoint request latency, SQL statement count,
+                    SQL time and template render time, and its cache counters, in the
+                    Prometheus text format
+    Args:           None
+    Returns:        flask.Response: Prometheus exposition text
+    Raises:         werkzeug.exceptions.NotFound: If the request is not allowed
+    """
+    return Response(request_metrics.prometheus() + cache_metrics(),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def cache_metrics():
+    """
+    Function Name:  cache_metrics
+    Description:    Renders the hit, miss and invalidation counters and the size of this
+                    process's category and user caches in the Prometheus text format
+    Args:           None
+    Returns:        str: The exposition text
+    Raises:         None
+    """
+    caches = {'categories': category_cache.stats(), 'users': user_cache.stats()}
+    lines = []
+    for name, key, kind, description in (
+        ('budgettracker_cache_hits_total', 'hits', 'counter', 'Reads served from an in-process cache.'),
+        ('budgettracker_cache_misses_total', 'misses', 'counter', 'Reads an in-process cache sent to the database.'),
+        ('budgettracker_cache_invalidations_total', 'invalidations', 'counter', 'Entries dropped because they changed.'),
+        ('budgettracker_cache_size', 'size', 'gauge', 'Entries held by an in-process cache.'),
+    ):
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for cache, stats in caches.items():
+            if key in stats:
+                lines.append(f'{name}{{cache="{cache}"}} {stats[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+# CLI Commands
+rollups_cli = AppGroup('rollups', help='Maintain the dashboard rollup tables.')
+
+
+@rollups_cli.command('rebuild')
+def rebuild_rollups():
+    """
+    Function Name:  rebuild_rollups
+    Description:    Recomputes the monthly rollup tables and the category usage counters
+                    from the raw transaction and revenue data. Run after upgrading or if
+                    the rollups drift.
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    year = func.extract('year', Transaction.tranDate).label('year')
+    month = func.extract('month', Transaction.tranDate).label('month')
+    expense_rows = db.session.query(
+        Transaction.userID,
+        year,
+        month,
+        Transaction.catID,
+        func.sum(Transaction.tranAmount),
+        func.count(Transaction.tranID)
+    ).group_by(Transaction.userID, year, month, Transaction.catID).all()
+
+    year = func.extract('year', Revenue.revDate).label('year')
+    month = func.extract('month', Revenue.revDate).label('month')
+    revenue_rows = db.session.query(
+        Revenue.userID,
+        year,
+        month,
+        Revenue.revType,
+        func.sum(Revenue.revAmount),
+        func.count(Revenue.revID)
+    ).group_by(Revenue.userID, year, month, Revenue.revType).all()
+
+    # Start from a revision no earlier build can have used so cached exports are invalidated
+    rebuild_revision = int(time.time())
+    monthly_totals = {}
+    category_totals = []
+    for entry_type, rows in (('expense', expense_rows), ('revenue', revenue_rows)):
+        for user_id, row_year, row_month, category_key, total, count in rows:
+            month_start = datetime(int(row_year), int(row_month), 1).date()
+            totals = monthly_totals.get((user_id, month_start))
+            if totals is None:
+                totals = UserMonthlyTotal(
+                    userID=user_id,
+                    monthStart=month_start,
+                    expenseTotal=0,
+                    expenseCount=0,
+                    revenueTotal=0,
+                    revenueCount=0,
+                    revision=rebuild_revision
+                )
+                monthly_totals[(user_id, month_start)] = totals
+
+            if entry_type == 'expense':
+                totals.expenseTotal += total
+                totals.expenseCount += count
+            else:
+                totals.revenueTotal += total
+                totals.revenueCount += count
+
+            category_totals.append(UserMonthlyCategoryTotal(
+                userID=user_id,
+                monthStart=month_start,
+                entryType=entry_type,
+                categoryKey=category_key,
+                total=total,
+                entryCount=count
+            ))
+
+    category_stats = [
+        CategoryStat(userID=user_id, catID=cat_id, tranCount=count, tranTotal=total, lastUsed=last_used)
+        for user_id, cat_id, count, total, last_used in db.session.query(
+            Transaction.userID,
+            Transaction.catID,
+            func.count(Transaction.tranID),
+            func.sum(Transaction.tranAmount),
+            func.max(Transaction.tranDate)
+        ).group_by(Transaction.userID, Transaction.catID)
+    ]
+
+    try:
+        UserMonthlyCategoryTotal.query.delete()
+        UserMonthlyTotal.query.delete()
+        CategoryStat.query.delete()
+        db.session.add_all(monthly_totals.values())
+        db.session.add_all(category_totals)
+        db.session.add_all(category_stats)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    click.echo(f'Rebuilt {len(monthly_totals)} monthly and {len(category_totals)} category rollup rows '
+               f'and {len(category_stats)} category usage rows.')
+
+
+@rollups_cli.command('verify')
+def verify_rollups():
+    """
+    Function Name:  verify_rollups
+    Description:    Checks the monthly category rollups and the category usage counters
+                    against the raw transaction and revenue data. Amounts are summed as
+                    integer cents, so any difference is real drift rather than rounding.
+    Args:           None
+    Returns:        None
+    Raises:         click.ClickException: If any rollup differs from the raw data
+    """
+    expected = {}
+    for entry_type, model, date_column, key_column, amount_column, id_column in (
+        ('expense', Transaction, Transaction.tranDate, Transaction.catID, Transaction.tranAmount, Transaction.tranID),
+        ('revenue', Revenue, Revenue.revDate, Revenue.revType, Revenue.revAmount, Revenue.revID),
+    ):
+        year = func.extract('year', date_column).label('year')
+        month = func.extract('month', date_column).label('month')
+        rows = db.session.query(
+            model.userID, year, month, key_column, func.sum(amount_column), func.count(id_column)
+        ).group_by(model.userID, year, month, key_column)
+        for user_id, row_year, row_month, key, total, count in rows:
+            expected[(user_id, datetime(int(row_year), int(row_month), 1).date(), entry_type, key)] = (total, count)
+
+    actual = {
+        (row.userID, row.monthStart, row.entryType, row.categoryKey): (row.total, row.entryCount)
+        for row in UserMonthlyCategoryTotal.query.filter(UserMonthlyCategoryTotal.entryCount != 0)
+    }
+    mismatches = [
+        f'{key}: rollup {actual.get(key)}, data {expected.get(key)}'
+        for key in sorted(set(expected) | set(actual), key=str)
+        if actual.get(key) != expected.get(key)
+    ]
+
+    stats = {
+        (stat.userID, stat.catID): (stat.tranCount, stat.tranTotal)
+        for stat in CategoryStat.query.filter(CategoryStat.tranCount != 0)
+    }
+    usage = {
+        (user_id, cat_id): (count, total)
+        for user_id, cat_id, count, total in db.session.query(
+            Transaction.userID, Transaction.catID, func.count(Transaction.tranID), func.sum(Transaction.tranAmount)
+        ).group_by(Transaction.userID, Transaction.catID)
+    }
+    mismatches += [
+        f'category {key}: counters {stats.get(key)}, data {usage.get(key)}'
+        for key in sorted(set(stats) | set(usage))
+        if stats.get(key) != usage.get(key)
+    ]
+
+    for mismatch in mismatches:
+        click.echo(mismatch, err=True)
+    if mismatches:
+        raise click.ClickException(f'{len(mismatches)} rollups differ from the data; run `flask rollups rebuild`.')
+    click.echo(f'{len(expected)} monthly rollups and {len(usage)} category counters match the data to the cent.')
+
+
+app.cli.add_command(rollups_cli)
+
+
+search_cli = AppGroup('search', help='Maintain the description search indexes.')
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """
+    Function Name:  rebuild_search
+    Description:    Recreates and repopulates the SQLite FTS5 search tables. MySQL FULLTEXT
+                    indexes are maintained by the server and need no rebuild.
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    if db.engine.dialect.name != 'sqlite':
+        click.echo(f'Nothing to rebuild: {db.engine.dialect.name} maintains its own FULLTEXT indexes.')
+        return
+
+    with db.engine.begin() as connection:
+        SQLiteFTS5SearchBackend.install(connection, rebuild=True)
+    click.echo('Rebuilt the FTS5 search tables.')
+
+
+app.cli.add_command(search_cli)
+
+
+exports_cli = AppGroup('exports', help='Run and clean up background report exports.')
+
+
+@exports_cli.command('run')
+def run_exports():
+    """
+    Function Name:  run_exports
+    Description:    Runs any queued export jobs in the foreground, e.g. jobs left queued
+                    when the web process restarted
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    click.echo(f'Ran {process_export_jobs()} export jobs.')
+
+
+@exports_cli.command('cleanup')
+def cleanup_exports():
+    """
+    Function Name:  cleanup_exports
+    Description:    Removes expired export jobs and their files
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    click.echo(f'Removed {cleanup_export_jobs()} expired export jobs.')
+
+
+app.cli.add_command(exports_cli)
+
+
+mail_cli = AppGroup('mail', help='Send queued email.')
+
+
+@mail_cli.command('send')
+def send_mail():
+    """
+    Function Name:  send_mail
+    Description:    Sends every email in the outbox that is due, in the foreground, e.g.
+                    emails left queued when the web process restarted, and purges old
+                    sent and failed emails
+    Args:           None
+    Returns:        None
+    Raises:         None
+    """
+    sent = 0
+    while True:
+        claimed = send_outbox_batch()
+        if not claimed:
+            break
+        sent += claimed
+    purge_outbox()
+    waiting = OutboxEmail.query.filter(OutboxEmail.status == 'queued').count()
+    failed = OutboxEmail.query.filter(OutboxEmail.status == 'failed').count()
+    click.echo(f'Processed {sent} emails; {waiting} waiting to be retried, {failed} failed.')
+
+
+app.cli.add_command(mail_cli)
+
+
+perf_cli = AppGroup('perf', help='Inspect slow queries recorded by the profiler.')
+
+
+@perf_cli.command('slow-queries')
+@click.option('--limit', type=int, default=20, help='Number of statements to show.')
+@click.option('--sort', type=click.Choice(['total', 'max', 'calls']), default='total', help='Ranking order.')
+@click.option('--plans/--no-plans', default=True, help='Print the captured plan of each statement.')
+@click.option('--clear', is_flag=True, help='Delete every recorded statement instead.')
+def slow_queries(limit, sort, plans, clear):
+    """
+    Function Name:  slow_queries
+    Description:    Prints the slow statements recorded by the profiler, ranked by total
+                    time, worst single execution or number of slow executions, with the
+                    captured EXPLAIN plan of each
+    Args:           limit (int): Number of statements to show
+                    sort (str): 'total', 'max' or 'calls'
+                    plans (bool): Whether to print the plans
+                    clear (bool): Delete the recorded statements instead of printing them
+    Returns:        None
+    Raises:         None
+    """
+    if clear:
+        deleted = SlowQuery.query.delete()
+        db.session.commit()
+        click.echo(f'Deleted {deleted} recorded statements.')
+        return
+
+    order = {'total': SlowQuery.totalMs, 'max': SlowQuery.maxMs, 'calls': SlowQuery.callCount}[sort]
+    entries = SlowQuery.query.order_by(order.desc()).limit(limit).all()
+    if not entries:
+        click.echo('No slow queries recorded. Set BT_SLOW_QUERY_MS to enable the profiler.')
+        return
+
+    for rank, entry in enumerate(entries, start=1):
+        click.echo(
+            f'#{rank}  {entry.fingerprint[:12]}  total {entry.totalMs:.0f} ms  '
+            f'calls {entry.callCount}  avg {entry.totalMs / entry.callCount:.1f} ms  '
+            f'max {entry.maxMs:.1f} ms  last {entry.lastSeenAt:%Y-%m-%d %H:%M}'
+            + (f'  ({entry.lastEndpoint})' if entry.lastEndpoint else '')
+        )
+        click.echo(f'    {entry.statement}')
+        if plans and entry.queryPlan:
+            plan = json.loads(entry.queryPlan)
+            click.echo(f'    Plan ({entry.dialect}, {entry.planCapturedAt:%Y-%m-%d %H:%M}):')
+            if 'error' in plan:
+                click.echo(f"    EXPLAIN failed: {plan['error']}")
+            else:
+                for line in tabulate(plan['rows'], headers=plan['columns']).splitlines():
+                    click.echo(f'    {line}')
+        click.echo()
+
+
+app.cli.add_command(perf_cli)
+
+
+@app.cli.command('import-transactions')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user', 'user_id', required=True, help='User ID that will own the transactions.')
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ofx']), help='File format (default: from the extension).')
+@click.option('--profile', default=None, help=f"CSV column-mapping profile: {', '.join(IMPORT_PROFILES)} (default: generic).")
+@click.option('--mapping', default=None, help='JSON object overriding keys of the profile.')
+@click.option('--category', default=None, help='Category ID for rows no category maps to.')
+@click.option('--batch-size', type=int, default=None, help='Rows inserted per batch.')
+def import_transactions_command(path, user_id, file_format, profile, mapping, category, batch_size):
+    """
+    Function Name:  import_transactions_command
+    Description:    Imports a bank CSV or OFX file as a user's transactions, reporting
+                    progress after each batch
+    Args:           path (str): The file to import
+                    user_id (str): The owner of the imported transactions
+                    file_format (str): 'csv' or 'ofx', chosen from the extension if not given
+                    profile (str): Name of the CSV column-mapping profile
+                    mapping (str): JSON overrides for the profile
+                    category (str): Default category ID
+                    batch_size (int): Rows inserted per batch
+    Returns:        None
+    Raises:         click.ClickException: If the user, profile or category is invalid
+    """
+    if db.session.get(User, user_id) is None:
+        raise click.ClickException(f'User {user_id} does not exist.')
+
+    started = time.monotonic()
+
+    def report(summary):
+        click.echo(f"{summary['imported']} imported, {summary['skipped']} skipped "
+                   f"({time.monotonic() - started:.1f}s)")
+
+    try:
+        import_profile = load_import_profile(profile, mapping)
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            summary = import_transactions(
+                user_id,
+                read_import_rows(stream, file_format or import_format_for(path), import_profile),
+                import_profile,
+                default_category=category,
+                batch_size=batch_size,
+                progress=report
+            )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    for error in summary['errors']:
+        click.echo(f"Line {error['line']}: {error['message']}", err=True)
+    if summary['failed']:
+        raise click.ClickException(summary['failed'])
+    click.echo(f"Imported {summary['imported']} of {summary['read']} rows in {time.monotonic() - started:.1f}s.")
+
+
 if __name__ == '__main__':
     app.run(debug=False) 
\ No newline at end of file
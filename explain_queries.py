@@ -0,0 +1,116 @@
+"""
+================================================================================
+File Name: explain_queries.py
+Description: Prints the database query plans for the main read paths of Budget
+             Tracker (dashboard, view_transactions, reports, time_report and
+             export_report) so index usage can be checked on MySQL and SQLite.
+Author: David Rogers
+Date Created: 17/10/2026
+Python Version: 3.13.2
+Dependencies:   Budget Tracker app, SQLAlchemy, Tabulate
+Usage:
+        - python explain_queries.py --user <user_id>
+        - Uses the same BT_DATABASE_URL environment variable as the app
+================================================================================
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.sql import func
+from tabulate import tabulate
+
+from app import (app, db, Category, Revenue, Transaction, choose_trend_bucket, explain, export_query,
+                 trend_bucket_index)
+
+
+def build_queries(user_id):
+    """
+    Function Name:  build_queries
+    Description:    Builds the statements issued by the main read routes for a user. Must be
+                    called inside an app context, as the export query uses the app's session.
+    Args:           user_id (str): The user whose queries should be explained
+    Returns:        list: (name, statement) tuples
+    Raises:         None
+    """
+    today = datetime.now().date()
+    year_start = today.replace(month=1, day=1)
+    year_end = today.replace(month=12, day=31)
+    range_start = today - timedelta(days=30)
+    trend_bucket = trend_bucket_index(
+        Transaction.tranDate, range_start, choose_trend_bucket(range_start, today)
+    ).label('bucket')
+
+    return [
+        ('dashboard: recent transactions',
+         select(Transaction).where(
+             Transaction.userID == user_id
+         ).order_by(Transaction.tranDate.desc()).limit(5)),
+        ('dashboard: recent revenues',
+         select(Revenue).where(
+             Revenue.userID == user_id
+         ).order_by(Revenue.revDate.desc()).limit(5)),
+        ('view_transactions: page',
+         select(Transaction).where(
+             Transaction.userID == user_id,
+             Transaction.tranDate >= year_start,
+             Transaction.tranDate <= year_end
+         ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc(),
+                    Transaction.tranID.desc()).limit(11)),
+        ('view_transactions: category page',
+         select(Transaction).where(
+             Transaction.userID == user_id,
+             Transaction.catID == '0000',
+             Transaction.tranDate >= year_start,
+             Transaction.tranDate <= year_end
+         ).order_by(Transaction.tranDate.desc(), Transaction.tranTime.desc(),
+                    Transaction.tranID.desc()).limit(11)),
+        ('reports: expense categories',
+         select(Category.catName, func.sum(Transaction.tranAmount))
+         .join(Transaction, Category.catID == Transaction.catID)
+         .where(
+             Transaction.userID == user_id,
+             Transaction.tranDate >= range_start,
+             Transaction.tranDate <= today
+         ).group_by(Category.catName)),
+        ('reports: revenue types',
+         select(Revenue.revType, func.sum(Revenue.revAmount)).where(
+             Revenue.userID == user_id,
+             Revenue.revDate >= range_start,
+             Revenue.revDate <= today
+         ).group_by(Revenue.revType)),
+        ('reports: expense trend',
+         select(trend_bucket, func.sum(Transaction.tranAmount)).where(
+             Transaction.userID == user_id,
+             Transaction.tranDate >= range_start,
+             Transaction.tranDate <= today
+         ).group_by(trend_bucket)),
+        ('time_report: hourly histogram',
+         select(Transaction.tranMinute // 60, func.sum(Transaction.tranAmount)).where(
+             Transaction.userID == user_id,
+             Transaction.tranMinute.between(8 * 60, 18 * 60 - 1)
+         ).group_by(Transaction.tranMinute // 60)),
+        # Built by the app itself so the plan always matches the export that runs
+        ('export_report: all transactions',
+         export_query(user_id).statement),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print query plans for the Budget Tracker read paths.')
+    parser.add_argument('--user', required=True, help='User ID to build the queries for')
+    args = parser.parse_args()
+
+    with app.app_context():
+        with db.engine.connect() as connection:
+            print(f'Database dialect: {connection.dialect.name}\n')
+            for name, statement in build_queries(args.user):
+                headers, rows = explain(connection, statement)
+                print(name)
+                print(tabulate(rows, headers=headers))
+                print()
+
+
+if __name__ == '__main__':
+    main()
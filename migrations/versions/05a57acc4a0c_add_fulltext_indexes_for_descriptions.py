@@ -0,0 +1,42 @@
+"""Add FULLTEXT indexes for descriptions
+
+Revision ID: 05a57acc4a0c
+Revises: ca98e24fa0ab
+Create Date: 2026-10-17 13:40:07.662918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '05a57acc4a0c'
+down_revision = 'ca98e24fa0ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite has no FULLTEXT indexes; the app creates its FTS5 tables on first use
+    # (or via `flask search rebuild`).
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    op.create_index('ft_transactions_tranDescription', 'transactions', ['tranDescription'],
+                    unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_revenues_revDescription', 'revenues', ['revDescription'],
+                    unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        # The sync triggers write to the FTS tables, so they must go first or every later
+        # insert into transactions or revenues fails
+        for fts in ('transactions_fts', 'revenues_fts'):
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {fts}')
+        return
+
+    op.drop_index('ft_revenues_revDescription', table_name='revenues')
+    op.drop_index('ft_transactions_tranDescription', table_name='transactions')
@@ -0,0 +1,107 @@
+"""Store money as integer cents
+
+Revision ID: b07e305e6828
+Revises: 4f64fed9233b
+Create Date: 2026-10-17 19:02:13.448150
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b07e305e6828'
+down_revision = '4f64fed9233b'
+branch_labels = None
+depends_on = None
+
+# Number of rows updated per statement batch during the backfill
+BACKFILL_CHUNK_SIZE = 5000
+
+# Money columns of each table, with the leading primary key column the backfill is
+# chunked on (None for the small rollup tables, which are updated in one statement)
+MONEY_COLUMNS = [
+    ('users', 'userID', ['userBudget', 'monthlyIncome']),
+    ('transactions', 'tranID', ['tranAmount']),
+    ('revenues', 'revID', ['revAmount']),
+    ('user_monthly_totals', None, ['expenseTotal', 'revenueTotal']),
+    ('user_monthly_category_totals', None, ['total']),
+    ('category_stats', 'userID', ['tranTotal']),
+]
+
+
+def copy_columns(table_name, key, values):
+    # Copies column values in chunks of the primary key, so no single statement
+    # locks the whole table.
+    connection = op.get_bind()
+    columns = [sa.column(name) for name in values]
+    if key:
+        columns.append(sa.column(key, sa.String(20)))
+    table = sa.table(table_name, *columns)
+
+    if key is None:
+        connection.execute(table.update().values(**values))
+        return
+
+    last_key = ''
+    while True:
+        keys = connection.execute(
+            sa.select(table.c[key])
+            .where(table.c[key] > last_key)
+            .order_by(table.c[key])
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).scalars().all()
+        if not keys:
+            break
+        connection.execute(
+            table.update()
+            .where(table.c[key].between(keys[0], keys[-1]))
+            .values(**values)
+        )
+        last_key = keys[-1]
+
+
+def to_cents(column):
+    # Rounds a float amount to whole cents, with halves rounded away from zero like
+    # to_money() in the app. ROUND on a DOUBLE differs between databases (MySQL rounds
+    # halves to even, SQLite away from zero), and binary floats store values such as
+    # 2.675 as 2.67499..., so the amount in cents is first rounded to 6 places to shed
+    # float error, then cast to an exact DECIMAL before the final ROUND. MySQL and
+    # SQLite then both round 267.5 to 268 and -12.5 to -13.
+    return sa.func.round(sa.cast(sa.func.round(column * 100, 6), sa.Numeric(20, 6)))
+
+
+def upgrade():
+    for table_name, key, names in MONEY_COLUMNS:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for name in names:
+                batch_op.add_column(sa.Column(f'{name}Cents', sa.BigInteger(), nullable=True))
+
+        copy_columns(table_name, key, {f'{name}Cents': to_cents(sa.column(name)) for name in names})
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for name in names:
+                batch_op.drop_column(name)
+                batch_op.alter_column(f'{name}Cents', new_column_name=name,
+                                      existing_type=sa.BigInteger(), nullable=False)
+
+    # The rollup totals were summed as floats; `flask rollups verify` reports any
+    # that differ from the data and `flask rollups rebuild` recomputes them exactly.
+
+
+def downgrade():
+    for table_name, key, names in reversed(MONEY_COLUMNS):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for name in names:
+                batch_op.add_column(sa.Column(f'{name}Float', sa.Float(), nullable=True))
+
+        copy_columns(table_name, key, {
+            f'{name}Float': sa.column(name) / 100.0
+            for name in names
+        })
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for name in names:
+                batch_op.drop_column(name)
+                batch_op.alter_column(f'{name}Float', new_column_name=name,
+                                      existing_type=sa.Float(), nullable=False)
@@ -0,0 +1,104 @@
+"""Add owner userID to transactions
+
+Revision ID: ca98e24fa0ab
+Revises: fef0722f2dc2
+Create Date: 2026-10-17 11:26:52.841093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ca98e24fa0ab'
+down_revision = 'fef0722f2dc2'
+branch_labels = None
+depends_on = None
+
+# Number of transactions updated per statement batch during the backfill
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('userID', sa.String(length=20), nullable=True))
+
+    # Backfill the owner from userTransactions in chunks, walking the
+    # association table in primary key order so each chunk is a range scan.
+    connection = op.get_bind()
+    user_transactions = sa.table('userTransactions',
+                                 sa.column('userID', sa.String(20)),
+                                 sa.column('tranID', sa.String(20)))
+    transactions = sa.table('transactions',
+                            sa.column('userID', sa.String(20)),
+                            sa.column('tranID', sa.String(20)))
+    update = transactions.update()\
+        .where(transactions.c.tranID == sa.bindparam('b_tranID'))\
+        .values(userID=sa.bindparam('b_userID'))
+
+    last_key = ('', '')
+    while True:
+        rows = connection.execute(
+            sa.select(user_transactions.c.userID, user_transactions.c.tranID)
+            .where(sa.or_(
+                user_transactions.c.userID > last_key[0],
+                sa.and_(user_transactions.c.userID == last_key[0],
+                        user_transactions.c.tranID > last_key[1])
+            ))
+            .order_by(user_transactions.c.userID, user_transactions.c.tranID)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(update, [{'b_userID': row.userID, 'b_tranID': row.tranID} for row in rows])
+        last_key = (rows[-1].userID, rows[-1].tranID)
+
+    orphans = connection.execute(
+        sa.select(sa.func.count()).select_from(transactions).where(transactions.c.userID.is_(None))
+    ).scalar()
+    if orphans:
+        raise RuntimeError(f'{orphans} transactions have no userTransactions row; '
+                           'assign them an owner before upgrading.')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('userID', existing_type=sa.String(length=20), nullable=False)
+        batch_op.create_foreign_key('fk_transactions_userID_users', 'users', ['userID'], ['userID'])
+        batch_op.create_index('ix_transactions_userID_tranDate', ['userID', 'tranDate', 'tranTime'], unique=False)
+
+
+def downgrade():
+    # Transactions written since the upgrade only record their owner on transactions;
+    # give each of them its userTransactions row before that column is dropped.
+    connection = op.get_bind()
+    user_transactions = sa.table('userTransactions',
+                                 sa.column('userID', sa.String(20)),
+                                 sa.column('tranID', sa.String(20)))
+    transactions = sa.table('transactions',
+                            sa.column('userID', sa.String(20)),
+                            sa.column('tranID', sa.String(20)))
+
+    last_key = ''
+    while True:
+        keys = connection.execute(
+            sa.select(transactions.c.tranID)
+            .where(transactions.c.tranID > last_key)
+            .order_by(transactions.c.tranID)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).scalars().all()
+        if not keys:
+            break
+        connection.execute(user_transactions.insert().from_select(
+            ['userID', 'tranID'],
+            sa.select(transactions.c.userID, transactions.c.tranID)
+            .where(transactions.c.tranID.between(keys[0], keys[-1]))
+            .where(~sa.exists().where(
+                user_transactions.c.userID == transactions.c.userID,
+                user_transactions.c.tranID == transactions.c.tranID
+            ))
+        ))
+        last_key = keys[-1]
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_userID_tranDate')
+        batch_op.drop_constraint('fk_transactions_userID_users', type_='foreignkey')
+        batch_op.drop_column('userID')
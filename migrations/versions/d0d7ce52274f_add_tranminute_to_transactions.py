@@ -0,0 +1,99 @@
+"""Add tranMinute to transactions
+
+Revision ID: d0d7ce52274f
+Revises: 645aa0b8e0f9
+Create Date: 2026-10-17 17:04:52.617930
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0d7ce52274f'
+down_revision = '645aa0b8e0f9'
+branch_labels = None
+depends_on = None
+
+# Number of transactions updated per statement batch during the backfill
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tranMinute', sa.SmallInteger(), nullable=True))
+
+    connection = op.get_bind()
+    transactions = sa.table('transactions',
+                            sa.column('tranID', sa.String(20)),
+                            sa.column('tranTime', sa.String(5)),
+                            sa.column('tranMinute', sa.SmallInteger()))
+
+    # Imports could store unpadded times such as '9:5', which sort after '10:00' as
+    # strings and which the HH:MM substrings below cannot read; pad them first.
+    # Times that do not parse are left for the validation below to report.
+    padded = []
+    for row in connection.execute(
+        sa.select(transactions.c.tranID, transactions.c.tranTime)
+        .where(sa.func.length(transactions.c.tranTime) < 5)
+    ):
+        try:
+            padded.append({'b_tranID': row.tranID,
+                           'b_tranTime': datetime.strptime(row.tranTime, '%H:%M').strftime('%H:%M')})
+        except ValueError:
+            pass
+    if padded:
+        connection.execute(
+            transactions.update()
+            .where(transactions.c.tranID == sa.bindparam('b_tranID'))
+            .values(tranTime=sa.bindparam('b_tranTime')),
+            padded
+        )
+
+    # Backfill minutes since midnight from the HH:MM tranTime strings in
+    # chunks of the primary key, so no single statement locks the whole table.
+    minute = sa.cast(sa.func.substr(transactions.c.tranTime, 1, 2), sa.Integer) * 60 \
+        + sa.cast(sa.func.substr(transactions.c.tranTime, 4, 2), sa.Integer)
+
+    last_id = ''
+    while True:
+        ids = connection.execute(
+            sa.select(transactions.c.tranID)
+            .where(transactions.c.tranID > last_id)
+            .order_by(transactions.c.tranID)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        connection.execute(
+            transactions.update()
+            .where(transactions.c.tranID.between(ids[0], ids[-1]))
+            .values(tranMinute=minute)
+        )
+        last_id = ids[-1]
+
+    invalid = connection.execute(
+        sa.select(sa.func.count()).select_from(transactions).where(sa.or_(
+            transactions.c.tranMinute.is_(None),
+            transactions.c.tranMinute < 0,
+            transactions.c.tranMinute > 1439,
+            sa.func.length(transactions.c.tranTime) != 5
+        ))
+    ).scalar()
+    if invalid:
+        raise RuntimeError(f'{invalid} transactions have a tranTime that is not a valid HH:MM time; '
+                           'correct them before upgrading.')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('tranMinute', existing_type=sa.SmallInteger(), nullable=False)
+        batch_op.create_check_constraint('ck_transactions_tranMinute', 'tranMinute BETWEEN 0 AND 1439')
+        batch_op.create_index('ix_transactions_userID_tranMinute_tranDate', ['userID', 'tranMinute', 'tranDate'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_userID_tranMinute_tranDate')
+        batch_op.drop_constraint('ck_transactions_tranMinute', type_='check')
+        batch_op.drop_column('tranMinute')
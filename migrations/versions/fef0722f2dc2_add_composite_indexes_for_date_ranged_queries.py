@@ -0,0 +1,36 @@
+"""Add composite indexes for date ranged queries
+
+Revision ID: fef0722f2dc2
+Revises: 9b3f7110700e
+Create Date: 2026-10-17 10:03:18.204766
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fef0722f2dc2'
+down_revision = '9b3f7110700e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # userTransactions needs no new index: its (userID, tranID) primary key
+    # already serves the per-user lookups.
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_tranDate_tranTime', ['tranDate', 'tranTime'], unique=False)
+        batch_op.create_index('ix_transactions_catID_tranDate', ['catID', 'tranDate'], unique=False)
+
+    with op.batch_alter_table('revenues', schema=None) as batch_op:
+        batch_op.create_index('ix_revenues_userID_revDate', ['userID', 'revDate'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('revenues', schema=None) as batch_op:
+        batch_op.drop_index('ix_revenues_userID_revDate')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_catID_tranDate')
+        batch_op.drop_index('ix_transactions_tranDate_tranTime')
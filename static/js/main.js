@@ -308,9 +308,12 @@ document.addEventListener('DOMContentLoaded', function() {
                     const newRow = document.createElement('tr');
                     newRow.dataset.id = categoryId;
                     newRow.innerHTML = `
-                        <td style="width: 20% !important; text-align: left;">${categoryId}</td>
-                        <td style="width: 50% !important; text-align: left;">${categoryName}</td>
-                        <td style="width: 30% !important; text-align: center;">
+                        <td style="width: 12% !important; text-align: left;">${categoryId}</td>
+                        <td style="width: 30% !important; text-align: left;">${categoryName}</td>
+                        <td style="width: 13% !important; text-align: right;">0</td>
+                        <td style="width: 15% !important; text-align: right;">$0.00</td>
+                        <td style="width: 15% !important; text-align: center;">Never</td>
+                        <td style="width: 15% !important; text-align: center;">
                             <button type="button" class="btn btn-sm btn-outline-primary edit-category" 
                                     data-id="${categoryId}" 
                                     data-name="${categoryName}">
@@ -435,12 +438,79 @@ function validateBudgetForm() {
 
 /**
  * Function Name: exportReport
- * Description: Initiates the export of a report in the specified format.
- * @param {string} reportType - The type of report to export (category, date, time).
- * @param {string} format - The format to export the report in (csv, pdf).
+ * Description: Queues the export of a report in the specified format and downloads the
+ *              file once the background export has finished.
+ * @param {string} reportType - The type of report to export (current).
+ * @param {string} format - The format to export the report in (csv, excel, pdf).
+ * @param {Object} filters - Optional date_from, date_to and category filters.
  * @returns {void}
- * @example exportReport('category', 'csv');
+ * @example exportReport('current', 'csv');
  */
-function exportReport(reportType, format) {
-    window.location.href = `/reports/export/${reportType}/${format}`;
-} 
\ No newline at end of file
+function exportReport(reportType, format, filters = {}) {
+    fetch(`${config.serverURL}reports/export`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ report_type: reportType, format: format, ...filters })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            notifyExport('Preparing your export...', 'success');
+            pollExportJob(data.statusUrl);
+        } else {
+            notifyExport('Error exporting report: ' + data.message, 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        notifyExport('Error exporting report. Please try again.', 'error');
+    });
+}
+
+/**
+ * Function Name: pollExportJob
+ * Description: Polls a queued export until it finishes, then starts the download.
+ * @param {string} statusUrl - The status URL returned when the export was queued.
+ * @param {number} delay - Milliseconds to wait before the next poll.
+ * @returns {void}
+ * @example pollExportJob('/reports/export/0f3c...', 1000);
+ */
+function pollExportJob(statusUrl, delay = 1000) {
+    fetch(statusUrl)
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'done') {
+            window.location.href = data.downloadUrl;
+        } else if (data.status === 'failed' || !data.success) {
+            notifyExport('Error exporting report: ' + data.message, 'error');
+        } else {
+            // Back off gradually so long exports are not polled every second
+            setTimeout(() => pollExportJob(statusUrl, Math.min(delay * 1.5, 5000)), delay);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        notifyExport('Error checking export progress. Please try again.', 'error');
+    });
+}
+
+/**
+ * Function Name: notifyExport
+ * Description: Shows an export message with the page's toast, falling back to an alert.
+ * @param {string} message - The message to display.
+ * @param {string} type - The type of notification to display (success, error).
+ * @returns {void}
+ * @example notifyExport('Preparing your export...');
+ */
+function notifyExport(message, type = 'success') {
+    if (window.showNotification) {
+        window.showNotification(message, type);
+    } else if (type === 'error') {
+        alert(message);
+    }
+}
+
+// Module functions are not global, so expose the export entry point to inline handlers
+window.exportReport = exportReport;
@@ -0,0 +1,48 @@
+"""
+================================================================================
+File Name: conftest.py
+Description: Pytest setup for the Budget Tracker tests. The app reads its settings
+             from the environment when it is imported, so they are set here first:
+             a throwaway SQLite database and a free local port for the SMTP
+             stand-in started by the mail tests.
+Author: David Rogers
+Date Created: 17/10/2026
+Python Version: 3.13.2
+Dependencies:   pytest, aiosmtpd
+Usage:
+        - python -m pytest
+================================================================================
+"""
+
+import os
+import socket
+import sys
+import tempfile
+
+
+def free_port():
+    """
+    Function Name:  free_port
+    Description:    Finds a local TCP port nothing is listening on
+    Args:           None
+    Returns:        int: The port number
+    Raises:         None
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+TEST_DIR = tempfile.mkdtemp(prefix='budget-tracker-tests-')
+SMTP_PORT = free_port()
+
+os.environ['BT_SECRET_KEY'] = 'test'
+os.environ['BT_DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+os.environ['BT_MAIL_SERVER'] = '127.0.0.1'
+os.environ['BT_MAIL_PORT'] = str(SMTP_PORT)
+os.environ['BT_EMAIL_USER'] = 'budget-tracker@example.com'
+os.environ['BT_EMAIL_PASSWORD'] = ''
+os.environ['BT_MAIL_RETRY_SECONDS'] = '30'
+os.environ['BT_MAIL_MAX_ATTEMPTS'] = '3'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
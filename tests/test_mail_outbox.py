@@ -0,0 +1,152 @@
+"""
+================================================================================
+File Name: test_mail_outbox.py
+Description: Tests for the mail outbox: emails queued with queue_email are sent
+             by send_outbox_batch to a local aiosmtpd server, refused emails are
+             retried with exponential backoff until MAIL_MAX_ATTEMPTS, and old sent
+             and failed emails are purged.
+Author: David Rogers
+Date Created: 17/10/2026
+Python Version: 3.13.2
+Dependencies:   pytest, aiosmtpd, Budget Tracker app
+Usage:
+        - python -m pytest tests/test_mail_outbox.py
+================================================================================
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+from conftest import SMTP_PORT
+from app import app, db, OutboxEmail, purge_outbox, queue_email, send_outbox_batch
+
+
+class RecordingHandler:
+    """
+    RecordingHandler - An aiosmtpd handler that keeps every delivered message and refuses
+    recipients at the refused.example.com domain.
+
+    Attributes:
+        messages (list): (envelope recipients, message content) of each delivery.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.endswith('@refused.example.com'):
+            return '550 Mailbox unavailable'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content.decode('utf-8', 'replace')))
+        return '250 Message accepted for delivery'
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=SMTP_PORT)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def outbox():
+    with app.app_context():
+        db.create_all()
+        OutboxEmail.query.delete()
+        db.session.commit()
+        yield
+        db.session.rollback()
+
+
+def test_queued_email_is_delivered(smtp_server, outbox):
+    queue_email('Password Reset Request', ['user@example.com'], 'Reset link: https://example.com/reset/abc')
+    db.session.commit()
+
+    assert send_outbox_batch() == 1
+
+    assert len(smtp_server.messages) == 1
+    recipients, content = smtp_server.messages[0]
+    assert recipients == ['user@example.com']
+    assert 'Subject: Password Reset Request' in content
+    assert 'https://example.com/reset/abc' in content
+    email = OutboxEmail.query.one()
+    assert email.status == 'sent'
+    assert email.attempts == 1
+    assert email.sentAt is not None
+    assert send_outbox_batch() == 0
+
+
+def test_batch_shares_one_connection(smtp_server, outbox):
+    for number in range(3):
+        queue_email(f'Message {number}', [f'user{number}@example.com'], 'Body')
+    db.session.commit()
+
+    assert send_outbox_batch() == 3
+    assert len(smtp_server.messages) == 3
+    assert OutboxEmail.query.filter_by(status='sent').count() == 3
+
+
+def test_refused_email_backs_off_then_fails(smtp_server, outbox):
+    queue_email('Password Reset Request', ['user@refused.example.com'], 'Body')
+    db.session.commit()
+    retry = app.config['MAIL_RETRY_SECONDS']
+
+    for attempt in range(1, app.config['MAIL_MAX_ATTEMPTS']):
+        before = datetime.now()
+        assert send_outbox_batch() == 1
+        email = OutboxEmail.query.one()
+        assert email.status == 'queued'
+        assert email.attempts == attempt
+        assert '550' in email.lastError
+        # The delay doubles after each failed attempt
+        delay = retry * 2 ** (attempt - 1)
+        assert before + timedelta(seconds=delay - 1) <= email.nextAttemptAt <= datetime.now() + timedelta(seconds=delay)
+
+        # Not due yet, so nothing is claimed until the retry time passes
+        assert send_outbox_batch() == 0
+        email.nextAttemptAt = datetime.now() - timedelta(seconds=1)
+        db.session.commit()
+
+    assert send_outbox_batch() == 1
+    email = OutboxEmail.query.one()
+    assert email.status == 'failed'
+    assert email.attempts == app.config['MAIL_MAX_ATTEMPTS']
+    assert smtp_server.messages == []
+    assert send_outbox_batch() == 0
+
+
+def test_unreachable_server_retries_whole_batch(outbox):
+    # No smtp_server fixture: the connection to the port is refused
+    queue_email('First', ['one@example.com'], 'Body')
+    queue_email('Second', ['two@example.com'], 'Body')
+    db.session.commit()
+
+    assert send_outbox_batch() == 2
+    emails = OutboxEmail.query.all()
+    assert {email.status for email in emails} == {'queued'}
+    assert {email.attempts for email in emails} == {1}
+    assert all(email.nextAttemptAt > datetime.now() for email in emails)
+
+
+def test_old_sent_and_failed_emails_are_purged(outbox):
+    old = datetime.now() - timedelta(days=app.config['MAIL_RETENTION_DAYS'] + 1)
+    sent = queue_email('Sent', ['a@example.com'], 'Body')
+    sent.status, sent.sentAt = 'sent', old
+    failed = queue_email('Failed', ['b@example.com'], 'Body')
+    failed.status, failed.createdAt = 'failed', old
+    recent = queue_email('Recent failure', ['c@example.com'], 'Body')
+    recent.status = 'failed'
+    queued = queue_email('Queued', ['d@example.com'], 'Body')
+    queued.createdAt = old
+    db.session.commit()
+
+    assert purge_outbox() == 2
+    assert sorted(email.subject for email in OutboxEmail.query) == ['Queued', 'Recent failure']